@@ -0,0 +1,205 @@
+"""
+Bell sound synthesis for Balance Beam Adventure.
+
+Kept free of Kivy so bells can be synthesized on a worker thread, in
+benchmarks and in offline tools.
+
+Every ring of the victory bell is the same waveform, so one ring is computed
+once and overlap-added at each ring offset into the output buffer.
+"""
+
+import hashlib
+import io
+import math
+import os
+import sys
+import tempfile
+import wave
+from array import array
+
+try:
+    import numpy
+except ImportError:  # Optional; the array-module code path is used instead
+    numpy = None
+
+SAMPLE_RATE = 44100
+
+# Duration increases by 50% per level
+# Level 1: 3 rings, Level 2: 4-5 rings, Level 3: 6-7 rings, etc.
+BASE_RINGS = 3
+RING_SPACING = 0.25  # Seconds between rings
+DECAY_TAIL = 0.7     # Extra time after the last ring for decay
+
+# Bell frequencies (creates metallic ringing sound) and their mix
+PARTIALS = (
+    (1200, 0.4),   # High bell tone
+    (1500, 0.25),  # Higher harmonic
+    (800, 0.2),    # Lower resonance
+    (2000, 0.15),  # Shimmer
+)
+DECAY_RATE = 4       # Exponential decay for each ring
+TREMOLO_HZ = 12      # Tremolo effect (ringing vibration)
+TREMOLO_DEPTH = 0.3
+GAIN = 0.5           # Headroom before clipping to int16
+
+_ring_cache = None  # Longest single-ring waveform computed so far
+
+
+def ring_count(level):
+    return int(BASE_RINGS * 1.5 ** (level - 1))
+
+
+def bell_num_samples(level):
+    ring_times = [i * RING_SPACING for i in range(ring_count(level))]
+    total_duration = ring_times[-1] + DECAY_TAIL
+    return int(SAMPLE_RATE * total_duration)
+
+
+def _ring_waveform(num_samples):
+    """One bell ring (all partials, decay and tremolo), at least num_samples long"""
+    global _ring_cache
+    if _ring_cache is not None and len(_ring_cache) >= num_samples:
+        return _ring_cache
+
+    if numpy is not None:
+        t = numpy.arange(num_samples) / SAMPLE_RATE
+        ring = numpy.zeros(num_samples)
+        for freq, amp in PARTIALS:
+            ring += numpy.sin(2 * math.pi * freq * t) * amp
+        ring *= numpy.exp(-t * DECAY_RATE)
+        ring *= 1 + TREMOLO_DEPTH * numpy.sin(2 * math.pi * TREMOLO_HZ * t)
+    else:
+        sin = math.sin
+        exp = math.exp
+        two_pi = 2 * math.pi
+        ring = array('d', bytes(8 * num_samples))
+        for i in range(num_samples):
+            t = i / SAMPLE_RATE
+            value = 0
+            for freq, amp in PARTIALS:
+                value += sin(two_pi * freq * t) * amp
+            ring[i] = value * exp(-t * DECAY_RATE) * (1 + TREMOLO_DEPTH * sin(two_pi * TREMOLO_HZ * t))
+
+    _ring_cache = ring
+    return ring
+
+
+def bell_samples(level):
+    """Mono 16-bit little-endian PCM for the given level's bell"""
+    num_samples = bell_num_samples(level)
+    num_rings = ring_count(level)
+    spacing = round(RING_SPACING * SAMPLE_RATE)  # Ring offsets in samples
+    ring = _ring_waveform(num_samples)
+
+    if numpy is not None:
+        mix = numpy.zeros(num_samples)
+        for k in range(num_rings):
+            offset = k * spacing
+            mix[offset:] += ring[:num_samples - offset]
+        mix = numpy.clip(mix * GAIN, -1, 1) * 32767
+        return mix.astype('<i2').tobytes()
+
+    # Rings are evenly spaced, so the overlap-add is a running sum over
+    # every spacing-th sample, minus the part from rings that don't exist
+    running = array('d', bytes(8 * num_samples))
+    for i in range(num_samples):
+        running[i] = ring[i] + running[i - spacing] if i >= spacing else ring[i]
+    window = num_rings * spacing
+    pcm = array('h', bytes(2 * num_samples))
+    for i in range(num_samples):
+        value = running[i] - running[i - window] if i >= window else running[i]
+        value = max(-1, min(1, value * GAIN))
+        pcm[i] = int(value * 32767)
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def wav_bytes(pcm):
+    """Wrap mono 16-bit PCM in a WAV container"""
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(pcm)
+    return wav_buffer.getvalue()
+
+
+def bell_wav(level):
+    return wav_bytes(bell_samples(level))
+
+
+# ============== DISK CACHE ==============
+# Bump when synthesis changes in a way the parameters below don't capture
+CACHE_VERSION = 1
+
+
+def synthesis_key(level):
+    """Hash of everything the level's bell depends on"""
+    params = (CACHE_VERSION, level, SAMPLE_RATE, BASE_RINGS, RING_SPACING, DECAY_TAIL,
+              PARTIALS, DECAY_RATE, TREMOLO_HZ, TREMOLO_DEPTH, GAIN)
+    return hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:16]
+
+
+class BellCache:
+    """Synthesized bells stored as WAV files, named by their synthesis key.
+
+    A valid cached file skips synthesis entirely. Files are written to a
+    temporary name and renamed into place, so a crash never leaves a
+    truncated bell behind under a real name.
+    """
+    PREFIX = 'bell-'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, level):
+        return os.path.join(self.directory, f'{self.PREFIX}v{CACHE_VERSION}-{synthesis_key(level)}.wav')
+
+    def is_valid(self, path, level):
+        try:
+            with wave.open(path, 'rb') as wav_file:
+                return (wav_file.getnchannels() == 1 and
+                        wav_file.getsampwidth() == 2 and
+                        wav_file.getframerate() == SAMPLE_RATE and
+                        wav_file.getnframes() == bell_num_samples(level) and
+                        os.path.getsize(path) >= 44 + 2 * bell_num_samples(level))
+        except (OSError, EOFError, wave.Error):
+            return False
+
+    def bell_path(self, level):
+        """Path of a valid WAV for the level, synthesizing it only on a miss"""
+        path = self.path_for(level)
+        if self.is_valid(path, level):
+            return path
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=self.PREFIX, suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(bell_wav(level))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def evict(self, levels):
+        """Delete cached bells and leftover temp files not used by these levels"""
+        keep = {os.path.basename(self.path_for(level)) for level in levels}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(self.PREFIX) and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
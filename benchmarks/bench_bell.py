@@ -0,0 +1,117 @@
+"""
+Benchmark bell synthesis per level against the original per-sample loop.
+
+    python benchmarks/bench_bell.py [--levels 1 2 3] [--skip-legacy]
+
+Reports the time to synthesize each level's bell with the legacy loop, the
+NumPy path and the array-module fallback, plus the speedup and the largest
+sample difference from the legacy output.
+"""
+
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio  # noqa: E402
+
+
+def legacy_bell_samples(level):
+    """The original BellSound synthesis loop, kept verbatim for comparison"""
+    sample_rate = 44100
+    base_rings = 3
+    duration_multiplier = 1.5 ** (level - 1)
+    num_rings = int(base_rings * duration_multiplier)
+    ring_spacing = 0.25
+    ring_times = [i * ring_spacing for i in range(num_rings)]
+    total_duration = ring_times[-1] + 0.7
+
+    all_samples = []
+    num_samples = int(sample_rate * total_duration)
+    for i in range(num_samples):
+        t = i / sample_rate
+        sample_value = 0
+        for ring_start in ring_times:
+            if t >= ring_start:
+                ring_t = t - ring_start
+                f1 = 1200
+                f2 = 1500
+                f3 = 800
+                f4 = 2000
+                decay = math.exp(-ring_t * 4)
+                tremolo = 1 + 0.3 * math.sin(2 * math.pi * 12 * ring_t)
+                ring_sample = (
+                    math.sin(2 * math.pi * f1 * ring_t) * 0.4 +
+                    math.sin(2 * math.pi * f2 * ring_t) * 0.25 +
+                    math.sin(2 * math.pi * f3 * ring_t) * 0.2 +
+                    math.sin(2 * math.pi * f4 * ring_t) * 0.15
+                ) * decay * tremolo
+                sample_value += ring_sample
+        sample_value = max(-1, min(1, sample_value * 0.5))
+        all_samples.append(int(sample_value * 32767))
+    return b''.join(struct.pack('<h', sample) for sample in all_samples)
+
+
+def time_synthesis(level, use_numpy):
+    """Cold synthesis time, including computing the single-ring waveform"""
+    saved = audio.numpy
+    if not use_numpy:
+        audio.numpy = None
+    audio._ring_cache = None
+    try:
+        start = time.perf_counter()
+        pcm = audio.bell_samples(level)
+        return time.perf_counter() - start, pcm
+    finally:
+        audio.numpy = saved
+        audio._ring_cache = None
+
+
+def max_difference(a, b):
+    left = array('h', a)
+    right = array('h', b)
+    if sys.byteorder == 'big':
+        left.byteswap()
+        right.byteswap()
+    return max(abs(x - y) for x, y in zip(left, right))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 3, 4, 5])
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help="don't run the (slow) original loop")
+    args = parser.parse_args(argv)
+
+    print(f"{'level':>5} {'rings':>5} {'legacy s':>9} {'numpy s':>9} {'array s':>9} "
+          f"{'x numpy':>8} {'x array':>8} {'max diff':>8}")
+    for level in args.levels:
+        legacy_time = None
+        legacy_pcm = None
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy_pcm = legacy_bell_samples(level)
+            legacy_time = time.perf_counter() - start
+
+        numpy_time, numpy_pcm = time_synthesis(level, use_numpy=True) if audio.numpy else (None, None)
+        array_time, array_pcm = time_synthesis(level, use_numpy=False)
+
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else '-'
+
+        diff = None
+        if legacy_pcm is not None:
+            diff = max(max_difference(legacy_pcm, pcm) for pcm in (numpy_pcm, array_pcm) if pcm)
+        print(f"{level:>5} {audio.ring_count(level):>5} {fmt(legacy_time, '9.3f'):>9} "
+              f"{fmt(numpy_time, '9.4f'):>9} {fmt(array_time, '9.3f'):>9} "
+              f"{fmt(legacy_time and numpy_time and legacy_time / numpy_time, '8.0f'):>8} "
+              f"{fmt(legacy_time and legacy_time / array_time, '8.1f'):>8} {fmt(diff, 'd'):>8}")
+
+
+if __name__ == '__main__':
+    main()
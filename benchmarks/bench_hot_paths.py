@@ -0,0 +1,343 @@
+"""
+Micro-benchmarks for the per-frame hot paths of the game.
+
+    python benchmarks/bench_hot_paths.py [--scales 1 2 3] [--repeat 30]
+                                         [--output results.json]
+                                         [--baseline benchmarks/baseline.json]
+                                         [--save-baseline] [--threshold 0.2]
+
+Times the Player pose draws, obstacle updates (closed-form position plus
+widget sync), confetti with 70/500/2000 particles, draw_background, a whole
+Simulation tick, baking the sprite atlas and the poses and obstacles drawn
+from it, the batched obstacle mesh with 10/100/500 live obstacles and with
+obstacles spawning and despawning between syncs, bell synthesis per level
+and GameManager.save_data. The scaled benchmarks are repeated for each
+GameSettings.SCALE in --scales.
+
+Results are printed and written as JSON (mean, stddev, min and percentiles
+in microseconds per call). With a baseline file, each benchmark is compared
+against it and the exit status is 1 if any got slower by more than
+--threshold. --save-baseline writes this run as the new baseline.
+
+Kivy needs a GL window; on a headless Linux box run under a virtual display:
+
+    xvfb-run -a python benchmarks/bench_hot_paths.py
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio  # noqa: E402
+import main  # noqa: E402  (creates the Window)
+import simulation  # noqa: E402
+from simulation import GameSettings, LEVEL_CONFIGS, TICK  # noqa: E402
+from storage import SaveStore  # noqa: E402
+
+main.import_deferred()  # NumPy for confetti, as in the running game
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+CONFETTI_COUNTS = (70, 500, 2000)
+OBSTACLE_COUNTS = (10, 100, 500)
+
+
+def measure(func, repeat, number, setup=None):
+    """Run func number times per sample, repeat samples; microseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter_ns() - start) / number / 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'mean_us': statistics.fmean(samples),
+        'stddev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min_us': min(samples),
+        'p50_us': percentiles[49],
+        'p90_us': percentiles[89],
+        'p99_us': percentiles[98],
+        'samples': len(samples),
+    }
+
+
+# ============== BENCHMARKS ==============
+# Each returns (name, func, setup, number) tuples for the current SCALE
+
+def player_benchmarks():
+    player = main.Player(pos=(100, GameSettings.BEAM_Y_POSITION))
+    s = GameSettings.SCALE
+    cx = player.center_x
+
+    def pose(draw):
+        def run():
+            player.leg_angle += 0.2
+            player.flip_angle = (player.flip_angle + 12) % 360
+            player.cartwheel_angle = (player.cartwheel_angle + 12) % 360
+            draw(s, cx)
+        return run
+
+    for name in ('draw_side_view', 'draw_front_view', 'draw_flipping', 'draw_cartwheel'):
+        draw = getattr(player, name)
+        draw(s, cx)  # Build the pose once, as the game does
+        yield f'player.{name}', pose(draw), None, 200
+
+
+def obstacle_benchmarks():
+    beam_top = GameSettings.BEAM_Y_POSITION + GameSettings.BEAM_HEIGHT
+    ball_state = simulation.BallState(main.Window.width + 10, beam_top, GameSettings.BALL_FAST_SPEED)
+    ball = main.BowlingBall(pos=ball_state.position_at(0))
+    bee_state = simulation.BeeState(main.Window.width + 10, beam_top + 100)
+    bee = main.Bee(pos=bee_state.position_at(0))
+    clock = [0.0]
+
+    def ball_update():
+        clock[0] += TICK
+        ball.sync(ball_state, clock[0])
+
+    def bee_update():
+        clock[0] += TICK
+        bee.sync(bee_state, clock[0])
+
+    yield 'ball.update', ball_update, None, 500
+    yield 'bee.update', bee_update, None, 500
+
+
+def confetti_benchmarks():
+    backends = [('confetti', main.ConfettiSystem())]
+    shader_confetti = main.ShaderConfettiSystem()
+    if shader_confetti.shader_ok:
+        backends.append(('confetti_gpu', shader_confetti))
+
+    for label, confetti in backends:
+        for count in CONFETTI_COUNTS:
+            def setup(confetti=confetti, count=count):
+                random.seed(count)
+                confetti.start(num_confetti=count, num_medals=0)
+                main.Clock.unschedule(confetti.update)
+
+            yield f'{label}.update[{count}]', lambda confetti=confetti: confetti.update(TICK), setup, 30
+
+
+def background_benchmarks():
+    widget = main.GameWidget()
+    widget.beam_left = 20
+    widget.beam_right = main.Window.width - 20
+    widget.beam_width = main.Window.width - 40
+    widget.beam_top = GameSettings.BEAM_Y_POSITION + GameSettings.BEAM_HEIGHT
+
+    def redraw():
+        widget.background_key = None
+        widget.draw_background()
+
+    yield 'draw_background', widget.draw_background, None, 500
+    yield 'draw_background.redraw', redraw, None, 50
+
+
+def simulation_benchmarks():
+    width, height = main.Window.width, 700 * GameSettings.SCALE
+    rng = random.Random(1)
+    current = []
+
+    def new_attempt():
+        current[:] = [simulation.Simulation(LEVEL_CONFIGS[-1], width, height, rng=rng)]
+
+    def tick():
+        sim = current[0]
+        if sim.outcome:
+            new_attempt()
+            sim = current[0]
+        if simulation.reflex_policy(sim):
+            sim.jump()
+        sim.step(TICK)
+
+    yield 'simulation.step', tick, new_attempt, 600
+
+
+def unscaled_benchmarks(save_dir):
+    for level in range(1, GameSettings.TOTAL_LEVELS + 1):
+        def setup():
+            audio._ring_cache = None  # Include the one-off ring, as on first play
+
+        yield f'bell.synthesis[level={level}]', lambda level=level: audio.bell_samples(level), setup, 1
+
+    manager = main.GameManager()
+    manager.store = SaveStore(os.path.join(save_dir, 'balance_beam_save.json'))
+
+    def save():
+        manager.high_score += 1  # A new high score, so every save has something to write
+        manager.save_data()
+        manager.flush()
+
+    def write():
+        save()
+        manager.store.wait()
+
+    # What the UI thread pays, then the whole write including the fsync
+    yield 'game_manager.save_data', save, manager.store.wait, 20
+    yield 'game_manager.save_data.write', write, None, 5
+
+
+def atlas_benchmarks():
+    atlas = main.SpriteAtlas()
+    yield 'sprite_atlas.bake', atlas.bake, None, 1
+
+    # The same draws as above, now single quads from the atlas
+    atlas.bake()
+    for benchmarks in (player_benchmarks, obstacle_benchmarks):
+        for name, func, setup, number in benchmarks():
+            yield f'{name}.atlas', func, setup, number
+
+    # Every live obstacle in one mesh, spawned half a second apart
+    beam_top = GameSettings.BEAM_Y_POSITION + GameSettings.BEAM_HEIGHT
+    for count in OBSTACLE_COUNTS:
+        batch = main.ObstacleBatch()
+        for i in range(count):
+            if i % 2:
+                batch.add(simulation.BeeState(main.Window.width + 10, beam_top + 100, i * 0.5))
+            else:
+                batch.add(simulation.BallState(main.Window.width + 10, beam_top,
+                                               GameSettings.BALL_FAST_SPEED, i * 0.5))
+        clock = [0.0]
+
+        def batch_update(batch=batch, clock=clock):
+            clock[0] += TICK
+            batch.sync(clock[0])
+
+        yield f'obstacle_batch.update[{count}]', batch_update, None, 100
+
+    # Spawns and despawns between syncs, as in play, growing past the
+    # batch's first vertex array up to a steady 100 live obstacles
+    churn = main.ObstacleBatch()
+    live = []
+    churn_clock = [0.0]
+
+    def batch_churn():
+        churn_clock[0] += TICK
+        t = churn_clock[0]
+        live.append(simulation.BallState(main.Window.width + 10, beam_top, GameSettings.BALL_FAST_SPEED, t))
+        churn.add(live[-1])
+        churn.sync(t)
+        live.append(simulation.BeeState(main.Window.width + 10, beam_top + 100, t))
+        churn.add(live[-1])
+        for _ in range(2 if len(live) > OBSTACLE_COUNTS[1] else 1):
+            churn.remove(live.pop(0))
+        churn.sync(t)
+
+    yield f'obstacle_batch.churn[{OBSTACLE_COUNTS[1]}]', batch_churn, None, 100
+    atlas.unload()
+
+
+SCALED = (player_benchmarks, obstacle_benchmarks, confetti_benchmarks,
+          background_benchmarks, simulation_benchmarks, atlas_benchmarks)
+
+
+# ============== RUNNER ==============
+def run(scales, repeat, only=None):
+    results = {}
+
+    def record(name, func, setup, number):
+        if only and only not in name:
+            return
+        results[name] = measure(func, repeat, number, setup)
+        print(f"{name:<40} {results[name]['mean_us']:>12.2f} us  "
+              f"(p90 {results[name]['p90_us']:.2f}, sd {results[name]['stddev_us']:.2f})")
+
+    for scale in scales:
+        GameSettings.configure(700 * scale)
+        for benchmarks in SCALED:
+            for name, func, setup, number in benchmarks():
+                record(f'{name}[scale={scale:g}]', func, setup, number)
+
+    GameSettings.configure(main.Window.height)
+    with tempfile.TemporaryDirectory() as save_dir:
+        for name, func, setup, number in unscaled_benchmarks(save_dir):
+            record(name, func, setup, number)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each benchmark against the baseline; returns the regressed names"""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'now':>12} {'ratio':>7}")
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<40} {'-':>12} {stats['mean_us']:>12.2f}     new")
+            continue
+        ratio = stats['mean_us'] / old['mean_us'] if old['mean_us'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f"{name:<40} {old['mean_us']:>12.2f} {stats['mean_us']:>12.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 2, 3],
+                        help='GameSettings.SCALE values to repeat scaled benchmarks at')
+    parser.add_argument('--repeat', type=int, default=30, help='samples per benchmark (default 30)')
+    parser.add_argument('--only', help='run only benchmarks whose name contains this')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='baseline JSON to compare against (default benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown that counts as a regression (default 0.2)')
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.repeat, args.only)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'numpy': audio.numpy is not None,
+            'window': list(main.Window.size),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -15,11 +15,18 @@ source.dir = .
 # (list) Source files to include (let empty to include all the files)
 source.include_exts = py,png,jpg,kv,atlas,json
 
-# (str) Application versioning
-version = 1.0.0
+# (list) List of directory to exclude (let empty to not exclude anything)
+source.exclude_dirs = benchmarks
+
+# (str) Application versioning (method 1)
+# version = 1.0.0
+
+# (str) Application versioning (method 2)
+version.regex = __version__ = ['"](.*)['"]
+version.filename = %(source.dir)s/main.py
 
 # (list) Application requirements
-requirements = python3,kivy
+requirements = python3,kivy,sqlite3
 
 # (str) Supported orientation (one of landscape, sensorLandscape, portrait or all)
 orientation = portrait
@@ -3,9 +3,74 @@ Balance Beam Adventure - A Kivy Game for Kids
 Player walks on a balance beam, jumps over bowling balls, and avoids bees!
 """
 
+__version__ = '1.0.0'
+
+import sys
+
+# The headless simulator doesn't need a window; dispatch before Kivy loads
+if __name__ == '__main__' and '--simulate' in sys.argv:
+    import simulation
+    sys.exit(simulation.main(sys.argv[1:]))
+
+from profiler import StartupTrace
+
+# --trace-startup prints how long each phase took to reach the first frame
+STARTUP = None
+if __name__ == '__main__' and '--trace-startup' in sys.argv:
+    sys.argv.remove('--trace-startup')
+    STARTUP = StartupTrace()
+
+
+def _pop_option(name):
+    """Take '--name value' out of sys.argv so Kivy's own parser doesn't see it"""
+    if name not in sys.argv:
+        return None
+    i = sys.argv.index(name)
+    value = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+    del sys.argv[i:i + 2]
+    return value
+
+
+# --seed N fixes the session's RNG; --replay PATH plays back a recorded attempt;
+# --profile PATH turns the frame profiler on and dumps it to PATH on exit
+SEED_OPTION = _pop_option('--seed') if __name__ == '__main__' else None
+REPLAY_OPTION = _pop_option('--replay') if __name__ == '__main__' else None
+PROFILE_OPTION = _pop_option('--profile') if __name__ == '__main__' else None
+
 import kivy
 kivy.require('2.0.0')
 
+from kivy.config import Config
+from kivy.utils import platform
+
+if STARTUP:
+    STARTUP.mark('kivy')
+
+
+def display_refresh_rate():
+    """The display's refresh rate in Hz, or None where it can't be queried"""
+    if platform == 'android':
+        try:
+            from jnius import autoclass
+            activity = autoclass('org.kivy.android.PythonActivity').mActivity
+            return activity.getWindowManager().getDefaultDisplay().getRefreshRate()
+        except Exception:
+            return None
+    return None
+
+
+# Draw at the display's refresh rate (e.g. 90 or 120 Hz phones); the
+# simulation runs at a fixed tick regardless. Must happen before the Clock
+# is created.
+_refresh_rate = display_refresh_rate()
+if _refresh_rate and _refresh_rate > 0:
+    Config.set('graphics', 'maxfps', str(round(_refresh_rate)))
+
+# Fullscreen on desktop (Windows/Mac/Linux), set before the window exists so
+# it opens fullscreen instead of being switched after creation
+if sys.platform in ['win32', 'darwin', 'linux']:
+    Config.set('graphics', 'fullscreen', 'auto')  # True fullscreen
+
 from kivy.app import App
 from kivy.uix.widget import Widget
 from kivy.uix.screenmanager import ScreenManager, Screen, FadeTransition
@@ -14,20 +79,54 @@ from kivy.uix.button import Button
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, Ellipse, Rectangle, Line, Triangle, Quad
-from kivy.clock import Clock
+from kivy.graphics import (Canvas, Fbo, InstructionGroup, Mesh, PushMatrix, PopMatrix,
+                           RenderContext, Rotate, Translate)
+from kivy.graphics.texture import Texture
+from kivy.clock import Clock, mainthread
 from kivy.core.window import Window
-from kivy.properties import NumericProperty, BooleanProperty, ListProperty
-from kivy.storage.jsonstore import JsonStore
+if STARTUP:
+    STARTUP.mark('window')
+from kivy.properties import NumericProperty, ListProperty
 from kivy.animation import Animation
-from kivy.core.audio import SoundLoader
 import random
 import math
-
-# Fullscreen on desktop (Windows/Mac/Linux)
-import sys
-if sys.platform in ['win32', 'darwin', 'linux']:
-    Window.fullscreen = 'auto'  # True fullscreen
-    # Alternative: Window.maximize() for windowed fullscreen
+import bisect
+import os
+import queue
+import threading
+import time
+from array import array
+
+from profiler import (PHASES, SPAWN, PLAYER, OBSTACLES, BACKGROUND, HUD, FRAME_BUDGET_NS,
+                      FrameProfiler)
+from simulation import (GameSettings, TICK, BeeState, FixedStepper, Recording, ReplayInput,
+                        Simulation, level_config)
+
+# Imported by import_deferred() once the menu is on screen
+numpy = None  # Optional; the array-module code paths are used without it
+audio = None
+sprites = None
+SaveStore = None
+HistoryStore = None
+SoundLoader = None
+
+
+def import_deferred():
+    """Import the modules the menu doesn't need (NumPy, bell synthesis, sprite
+    atlas, save data and play history, audio)"""
+    global numpy, audio, sprites, SaveStore, HistoryStore, SoundLoader
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    import audio
+    import sprites
+    from storage import HistoryStore, SaveStore
+    from kivy.core.audio import SoundLoader
+
+
+if STARTUP:
+    STARTUP.mark('modules')
 
 # ============== CONSTANTS ==============
 class Colors:
@@ -48,39 +147,13 @@ class Colors:
     GRAY = (0.5, 0.5, 0.5, 1)
     SUN_YELLOW = (1, 1, 0.4, 1)
 
-class GameSettings:
-    # Scale factor based on screen size (base design is 700px height)
-    SCALE = max(1.0, Window.height / 700)
-
-    PLAYER_RADIUS = int(30 * SCALE)
-    PLAYER_WALK_SPEED = int(100 * SCALE)
-    PLAYER_JUMP_FORCE = int(550 * SCALE)
-    GRAVITY = int(-1000 * SCALE)
-
-    BALL_RADIUS = int(25 * SCALE)
-    BALL_SLOW_SPEED = int(140 * SCALE)
-    BALL_MEDIUM_SPEED = int(200 * SCALE)
-    BALL_FAST_SPEED = int(280 * SCALE)
-
-    BEE_WIDTH = int(40 * SCALE)
-    BEE_HEIGHT = int(26 * SCALE)
-    BEE_SPEED = int(180 * SCALE)
-
-    BEAM_HEIGHT = int(30 * SCALE)
-    BEAM_Y_POSITION = int(Window.height * 0.2)  # 20% from bottom
-
-    INITIAL_LIVES = 3
-    POINTS_PER_LEVEL = 100
-    TOTAL_LEVELS = 5
-
-# Level configurations
-LEVEL_CONFIGS = [
-    {"level": 1, "ball_speed": GameSettings.BALL_SLOW_SPEED, "ball_count": 1, "bee_count": 1, "ball_interval": 4.0, "bee_interval": 6.0},
-    {"level": 2, "ball_speed": GameSettings.BALL_SLOW_SPEED, "ball_count": 2, "bee_count": 2, "ball_interval": 3.5, "bee_interval": 5.0},
-    {"level": 3, "ball_speed": GameSettings.BALL_MEDIUM_SPEED, "ball_count": 2, "bee_count": 2, "ball_interval": 3.0, "bee_interval": 4.5},
-    {"level": 4, "ball_speed": GameSettings.BALL_MEDIUM_SPEED, "ball_count": 3, "bee_count": 3, "ball_interval": 2.5, "bee_interval": 4.0},
-    {"level": 5, "ball_speed": GameSettings.BALL_FAST_SPEED, "ball_count": 3, "bee_count": 4, "ball_interval": 2.0, "bee_interval": 3.0},
-]
+# A recording replays at the window height it was made at
+REPLAY = Recording.load(REPLAY_OPTION) if REPLAY_OPTION else None
+
+# Sizes, speeds and LEVEL_CONFIGS follow the window (see simulation.py)
+GameSettings.configure(REPLAY.height if REPLAY else Window.height)
+if STARTUP:
+    STARTUP.mark('settings')
 
 # ============== GAME MANAGER ==============
 class GameManager:
@@ -97,7 +170,8 @@ class GameManager:
             return
         self._initialized = True
 
-        self.store = JsonStore('balance_beam_save.json')
+        self.store = SaveStore('balance_beam_save.json')
+        self.history = HistoryStore('balance_beam_history.db')  # Opened on first use
         self.lives = GameSettings.INITIAL_LIVES
         self.score = 0
         self.current_level = 1
@@ -113,10 +187,25 @@ class GameManager:
             self.highest_unlocked_level = 1
 
     def save_data(self):
+        # Only marks the save dirty; flush() writes it in the background
         self.store.put('game_data',
                        high_score=self.high_score,
                        unlocked_level=self.highest_unlocked_level)
 
+    def record_attempt(self, level, sim, seed=None, started_at=None):
+        """Add a finished or abandoned attempt to the play history"""
+        self.history.record(level, sim.time, sim.hits, sim.jumps, sim.super_jumps,
+                            sim.outcome or 'quit', seed, started_at)
+
+    def flush(self):
+        """Write the save data and the batched attempts in the background"""
+        self.store.flush()
+        self.history.flush()
+
+    def close(self):
+        self.store.close()
+        self.history.close()
+
     def reset_lives(self):
         self.lives = GameSettings.INITIAL_LIVES
 
@@ -135,6 +224,7 @@ class GameManager:
         if self.current_level >= self.highest_unlocked_level and self.current_level < GameSettings.TOTAL_LEVELS:
             self.highest_unlocked_level = self.current_level + 1
             self.save_data()
+        self.flush()
 
     def advance_level(self):
         if self.current_level < GameSettings.TOTAL_LEVELS:
@@ -147,8 +237,150 @@ class GameManager:
         self.score = 0
         self.current_level = 1
 
+    def start_endless(self):
+        self.reset_lives()
+        self.score = 0
+        self.current_level = GameSettings.ENDLESS_LEVEL
+
+    @property
+    def is_endless(self):
+        return self.current_level == GameSettings.ENDLESS_LEVEL
+
     def get_level_config(self):
-        return LEVEL_CONFIGS[self.current_level - 1]
+        return level_config(self.current_level)
+
+    @classmethod
+    def is_loaded(cls):
+        """Whether the save data has been read yet"""
+        return cls._instance is not None
+
+
+# ============== FRAME PACING ==============
+class FramePacer:
+    """Drops the Clock to a low frame rate while nothing on screen moves.
+
+    Anything that animates holds the pacer while it runs: the game loop, the
+    level transition, confetti and screen fades. With no holds the event
+    loop only wakes IDLE_FPS times a second to poll input, and Kivy redraws
+    nothing unless a canvas changed. A touch or key press restores the full
+    rate for the very next frame and keeps it for WAKE_TIME, so button
+    feedback stays smooth.
+    """
+    _instance = None
+    IDLE_FPS = 10
+    WAKE_TIME = 1.0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self.holds = set()
+        self.awake = False
+        self.running = False
+        self.full_fps = self.clock_max_fps()  # Config's maxfps; None if it can't be paced
+        self._sleep_trigger = Clock.create_trigger(self._sleep, self.WAKE_TIME)
+
+    def start(self):
+        """Begin pacing; until then holds are tracked but the Clock is left alone"""
+        if self.full_fps is None:
+            print("Frame pacing unavailable: this Kivy's Clock has no _max_fps")
+            return
+        self.running = True
+        Window.bind(on_touch_down=self.wake, on_touch_move=self.wake, on_key_down=self.wake)
+        self._apply()
+
+    def hold(self, owner):
+        self.holds.add(owner)
+        self._apply()
+
+    def release(self, owner):
+        self.holds.discard(owner)
+        self._apply()
+
+    def hold_while(self, owner, active):
+        """Property callback: hold for as long as owner's flag is True"""
+        if active:
+            self.hold(owner)
+        else:
+            self.release(owner)
+
+    def wake(self, *args):
+        self.awake = True
+        self._sleep_trigger.cancel()
+        self._sleep_trigger()
+        self._apply()
+        return False
+
+    def _sleep(self, dt):
+        self.awake = False
+        self._apply()
+
+    @property
+    def idle(self):
+        return not self.holds and not self.awake
+
+    def _apply(self):
+        if not self.running or self.full_fps is None:
+            return
+        if self.idle and (not self.full_fps or self.full_fps > self.IDLE_FPS):
+            self.clock_max_fps(self.IDLE_FPS)
+        else:
+            self.clock_max_fps(self.full_fps)
+
+    @staticmethod
+    def clock_max_fps(fps=None):
+        """The Clock's frame cap (0 for none), set to fps if given; None if
+        this Kivy doesn't expose it, in which case pacing stays off.
+
+        Kivy has no public way to change the cap at runtime: ClockBase reads
+        Config's maxfps once into _max_fps and checks that before every
+        frame. Checked against Kivy 2.3.1.
+        """
+        current = getattr(Clock, '_max_fps', None)
+        if isinstance(current, bool) or not isinstance(current, (int, float)):
+            return None
+        if fps is not None:
+            Clock._max_fps = float(fps)
+            return float(fps)
+        return current
+
+
+# ============== OBJECT POOLS ==============
+class ObjectPool:
+    """Recycles game objects so spawning doesn't construct new Widgets.
+
+    Objects are built by factory() on a miss and must provide reset(...),
+    which acquire() calls with its arguments before handing the object out.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            self.hits += 1
+        else:
+            obj = self.factory()
+            self.misses += 1
+        obj.reset(*args, **kwargs)
+        return obj
+
+    def release(self, obj):
+        self.free.append(obj)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'free': len(self.free)}
 
 
 # ============== COLORS FOR GYMNAST ==============
@@ -162,14 +394,29 @@ class GymnastColors:
 
 # ============== GAME OBJECTS ==============
 class Player(Widget):
-    velocity_y = NumericProperty(0)
-    is_jumping = BooleanProperty(False)
-    is_on_ground = BooleanProperty(True)
-
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        s = GameSettings.SCALE
-        self.size = (int(50 * s), int(80 * s))  # Taller for gymnast
+        self.size = (GameSettings.PLAYER_WIDTH, GameSettings.PLAYER_HEIGHT)
+
+        # Each pose is built once into its own group; per tick only the
+        # origin and the animated Rotate/Translate values are touched.
+        self._poses = {}
+        self._current_pose = None
+        self._sprite = None  # The pose as one atlas quad, once the atlas is ready
+        with self.canvas:
+            PushMatrix()
+            self._origin = Translate(0, 0)
+            self._pose_slot = InstructionGroup()
+            PopMatrix()
+
+        self.reset()
+
+    def reset(self, pos=(0, 0)):
+        """Return to the walking state at pos so a pooled Player can be reused"""
+        Animation.cancel_all(self)
+        self.opacity = 1
+        self.pos = pos
+
         self.leg_angle = 0
         self.leg_direction = 1
         self.arm_angle = 0
@@ -183,12 +430,17 @@ class Player(Widget):
         self.flip_height = 0
         self.flip_phase = 0  # 0=jump up, 1=flip, 2=land
         self.flip_callback = None  # Called when flip completes
+        self.flip_down = False
+        self.flip_target_y = None
 
         # Floor exercise state
         self.is_floor_exercise = False
         self.floor_y = 0  # Y position of floor
         self.cartwheel_angle = 0
         self.floor_target_x = 0  # Where to stop
+        self.flip_count = 0
+        self.is_pausing = False
+        self.pause_timer = 0
 
         # Flip up to beam state
         self.is_flipping_up = False
@@ -198,7 +450,6 @@ class Player(Widget):
         self.draw_player()
 
     def draw_player(self):
-        self.canvas.clear()
         s = GameSettings.SCALE
         cx = self.center_x
 
@@ -214,189 +465,238 @@ class Player(Widget):
         else:
             self.draw_side_view(s, cx)
 
+    def _show_pose(self, name, build, s, cx):
+        """Move the gymnast to (cx, y) and swap in the named pose, building it once"""
+        pose = self._poses.get(name)
+        if pose is None:
+            pose = build(s)
+            self._poses[name] = pose
+        if self._current_pose is not pose:
+            self._pose_slot.clear()
+            self._pose_slot.add(pose['group'])
+            self._current_pose = pose
+        self._origin.xy = (cx, self.y)
+        return pose
+
+    def _show_sprite(self, name, cx, phase=0, lift=0, spin=0, pivot=0):
+        """Draw the frame of a pose nearest to phase from the sprite atlas,
+        turned by spin around pivot (height above the feet) and raised to
+        lift; False while the atlas isn't ready"""
+        atlas = SpriteAtlas()
+        if not atlas.ready:
+            return False
+        if self._sprite is None:
+            self._sprite = Canvas()
+            with self._sprite:
+                Color(1, 1, 1, 1)
+                self._sprite_lift = Translate(0, 0)
+                self._sprite_spin = Rotate(angle=0, axis=(0, 0, 1))
+                self._sprite_rect = Rectangle()
+        if self._current_pose is not self._sprite:
+            self._pose_slot.clear()
+            self._pose_slot.add(self._sprite)
+            self._current_pose = self._sprite
+
+        region, sprite = atlas.frame(name, phase)
+        if self._sprite_rect.texture is not region:
+            self._sprite_rect.texture = region
+            self._sprite_rect.pos = (sprite.left, sprite.bottom - pivot)
+            self._sprite_rect.size = (sprite.width, sprite.height)
+        self._sprite_lift.y = lift
+        self._sprite_spin.angle = spin
+        self._origin.xy = (cx, self.y)
+        return True
+
     def draw_flipping(self, s, cx):
         """Draw gymnast doing a flip (rotating)"""
-        from kivy.graphics import PushMatrix, PopMatrix, Rotate, Translate
-
-        with self.canvas:
-            PushMatrix()
-
+        if self._show_sprite('flipping', cx, self.flip_angle * 0.5, lift=40 * s + self.flip_height,
+                             spin=self.flip_angle, pivot=40 * s):
+            return
+        pose = self._show_pose('flipping', self._build_flipping, s, cx)
+        pose['lift'].y = 40 * s + self.flip_height
+        pose['spin'].angle = self.flip_angle
+        pose['ponytail'].angle = self.flip_angle * 0.5
+
+    def _build_flipping(self, s):
+        group = Canvas()
+        with group:
             # Move to center of character, rotate, move back
-            char_center_y = self.y + 40 * s
-            Translate(cx, char_center_y + self.flip_height, 0)
-            Rotate(angle=self.flip_angle, axis=(0, 0, 1))
-            Translate(-cx, -char_center_y, 0)
-
-            # Draw tucked body during flip
-            body_y = self.y
+            lift = Translate(0, 40 * s, 0)
+            spin = Rotate(angle=0, axis=(0, 0, 1))
+            Translate(0, -40 * s, 0)
 
             # Tucked legs
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - 10*s, body_y + 5*s), size=(8*s, 15*s))
-            Ellipse(pos=(cx + 2*s, body_y + 5*s), size=(8*s, 15*s))
+            Ellipse(pos=(-10*s, 5*s), size=(8*s, 15*s))
+            Ellipse(pos=(2*s, 5*s), size=(8*s, 15*s))
 
             # Body (tucked)
             Color(*GymnastColors.LEOTARD)
-            Ellipse(pos=(cx - 12*s, body_y + 18*s), size=(24*s, 28*s))
+            Ellipse(pos=(-12*s, 18*s), size=(24*s, 28*s))
 
             # Arms wrapped
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - 15*s, body_y + 25*s), size=(6*s, 18*s))
-            Ellipse(pos=(cx + 9*s, body_y + 25*s), size=(6*s, 18*s))
+            Ellipse(pos=(-15*s, 25*s), size=(6*s, 18*s))
+            Ellipse(pos=(9*s, 25*s), size=(6*s, 18*s))
 
             # Head
-            head_y = body_y + 42 * s
+            head_y = 42 * s
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - 12*s, head_y), size=(24*s, 22*s))
+            Ellipse(pos=(-12*s, head_y), size=(24*s, 22*s))
 
             # Ponytail flying
-            pony_angle = self.flip_angle * 0.5
             PushMatrix()
-            Rotate(angle=pony_angle, origin=(cx, head_y + 11*s))
-            Rectangle(pos=(cx - 4*s, head_y + 8*s), size=(8*s, 18*s))
+            ponytail = Rotate(angle=0, origin=(0, head_y + 11*s))
+            Rectangle(pos=(-4*s, head_y + 8*s), size=(8*s, 18*s))
             PopMatrix()
 
             # Face
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - 9*s, head_y + 2*s), size=(18*s, 16*s))
+            Ellipse(pos=(-9*s, head_y + 2*s), size=(18*s, 16*s))
 
             # Determined expression
             Color(*Colors.BLACK)
             # Focused eyes
-            Ellipse(pos=(cx - 6*s, head_y + 10*s), size=(4*s, 4*s))
-            Ellipse(pos=(cx + 2*s, head_y + 10*s), size=(4*s, 4*s))
+            Ellipse(pos=(-6*s, head_y + 10*s), size=(4*s, 4*s))
+            Ellipse(pos=(2*s, head_y + 10*s), size=(4*s, 4*s))
 
-            PopMatrix()
+        return {'group': group, 'lift': lift, 'spin': spin, 'ponytail': ponytail}
 
     def draw_cartwheel(self, s, cx):
         """Draw gymnast doing a cartwheel (floor exercise)"""
-        from kivy.graphics import PushMatrix, PopMatrix, Rotate, Translate
-
-        with self.canvas:
-            PushMatrix()
+        if self._show_sprite('cartwheel', cx, self.cartwheel_angle * 0.3, lift=40 * s,
+                             spin=self.cartwheel_angle, pivot=40 * s):
+            return
+        pose = self._show_pose('cartwheel', self._build_cartwheel, s, cx)
+        pose['spin'].angle = self.cartwheel_angle
+        pose['ponytail'].angle = self.cartwheel_angle * 0.3
 
+    def _build_cartwheel(self, s):
+        group = Canvas()
+        with group:
             # Rotate around center
-            char_center_y = self.y + 40 * s
-            Translate(cx, char_center_y, 0)
-            Rotate(angle=self.cartwheel_angle, axis=(0, 0, 1))
-            Translate(-cx, -char_center_y, 0)
-
-            # Extended body for cartwheel
-            body_y = self.y
+            Translate(0, 40 * s, 0)
+            spin = Rotate(angle=0, axis=(0, 0, 1))
+            Translate(0, -40 * s, 0)
 
             # Legs spread (one up, one down)
             Color(*GymnastColors.SKIN)
             # First leg
             PushMatrix()
-            Rotate(angle=30, origin=(cx, body_y + 20*s))
-            Rectangle(pos=(cx - 4*s, body_y + 20*s), size=(8*s, 28*s))
+            Rotate(angle=30, origin=(0, 20*s))
+            Rectangle(pos=(-4*s, 20*s), size=(8*s, 28*s))
             PopMatrix()
             # Second leg
             PushMatrix()
-            Rotate(angle=-30, origin=(cx, body_y + 20*s))
-            Rectangle(pos=(cx - 4*s, body_y - 10*s), size=(8*s, 28*s))
+            Rotate(angle=-30, origin=(0, 20*s))
+            Rectangle(pos=(-4*s, -10*s), size=(8*s, 28*s))
             PopMatrix()
 
             # Body (stretched)
             Color(*GymnastColors.LEOTARD)
-            Rectangle(pos=(cx - 10*s, body_y + 18*s), size=(20*s, 30*s))
+            Rectangle(pos=(-10*s, 18*s), size=(20*s, 30*s))
 
             # Arms spread wide
             Color(*GymnastColors.SKIN)
             # Left arm up
             PushMatrix()
-            Rotate(angle=45, origin=(cx - 8*s, body_y + 45*s))
-            Rectangle(pos=(cx - 12*s, body_y + 45*s), size=(6*s, 22*s))
+            Rotate(angle=45, origin=(-8*s, 45*s))
+            Rectangle(pos=(-12*s, 45*s), size=(6*s, 22*s))
             PopMatrix()
             # Right arm down
             PushMatrix()
-            Rotate(angle=-45, origin=(cx + 8*s, body_y + 45*s))
-            Rectangle(pos=(cx + 6*s, body_y + 25*s), size=(6*s, 22*s))
+            Rotate(angle=-45, origin=(8*s, 45*s))
+            Rectangle(pos=(6*s, 25*s), size=(6*s, 22*s))
             PopMatrix()
 
             # Head
-            head_y = body_y + 48 * s
+            head_y = 48 * s
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - 10*s, head_y), size=(20*s, 18*s))
+            Ellipse(pos=(-10*s, head_y), size=(20*s, 18*s))
 
             # Ponytail flying
             PushMatrix()
-            Rotate(angle=self.cartwheel_angle * 0.3, origin=(cx, head_y + 9*s))
-            Rectangle(pos=(cx - 3*s, head_y + 6*s), size=(6*s, 15*s))
+            ponytail = Rotate(angle=0, origin=(0, head_y + 9*s))
+            Rectangle(pos=(-3*s, head_y + 6*s), size=(6*s, 15*s))
             PopMatrix()
 
             # Face
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - 8*s, head_y + 2*s), size=(16*s, 14*s))
+            Ellipse(pos=(-8*s, head_y + 2*s), size=(16*s, 14*s))
 
             # Determined eyes
             Color(*Colors.BLACK)
-            Ellipse(pos=(cx - 5*s, head_y + 8*s), size=(3*s, 3*s))
-            Ellipse(pos=(cx + 2*s, head_y + 8*s), size=(3*s, 3*s))
+            Ellipse(pos=(-5*s, head_y + 8*s), size=(3*s, 3*s))
+            Ellipse(pos=(2*s, head_y + 8*s), size=(3*s, 3*s))
 
-            PopMatrix()
+        return {'group': group, 'spin': spin, 'ponytail': ponytail}
 
     def draw_floor_standing(self, s, cx):
         """Draw gymnast standing on floor during pause (facing player with arms raised)"""
-        with self.canvas:
-            body_y = self.y
+        if self._show_sprite('floor_standing', cx):
+            return
+        self._show_pose('floor_standing', self._build_floor_standing, s, cx)
 
+    def _build_floor_standing(self, s):
+        group = Canvas()
+        with group:
             # Legs together
             Color(*GymnastColors.SKIN)
-            Rectangle(pos=(cx - 10*s, body_y), size=(8*s, 24*s))
-            Rectangle(pos=(cx + 2*s, body_y), size=(8*s, 24*s))
+            Rectangle(pos=(-10*s, 0), size=(8*s, 24*s))
+            Rectangle(pos=(2*s, 0), size=(8*s, 24*s))
 
             # Body
             Color(*GymnastColors.LEOTARD)
-            Rectangle(pos=(cx - 11*s, body_y + 22*s), size=(22*s, 28*s))
+            Rectangle(pos=(-11*s, 22*s), size=(22*s, 28*s))
             # Rounded shoulders
-            Ellipse(pos=(cx - 14*s, body_y + 42*s), size=(10*s, 10*s))
-            Ellipse(pos=(cx + 4*s, body_y + 42*s), size=(10*s, 10*s))
+            Ellipse(pos=(-14*s, 42*s), size=(10*s, 10*s))
+            Ellipse(pos=(4*s, 42*s), size=(10*s, 10*s))
 
             # Arms raised in V shape (victory pose!)
             Color(*GymnastColors.SKIN)
-            from kivy.graphics import PushMatrix, PopMatrix, Rotate
             # Left arm
             PushMatrix()
-            Rotate(angle=30, origin=(cx - 12*s, body_y + 48*s))
-            Rectangle(pos=(cx - 15*s, body_y + 48*s), size=(6*s, 22*s))
+            Rotate(angle=30, origin=(-12*s, 48*s))
+            Rectangle(pos=(-15*s, 48*s), size=(6*s, 22*s))
             PopMatrix()
             # Right arm
             PushMatrix()
-            Rotate(angle=-30, origin=(cx + 12*s, body_y + 48*s))
-            Rectangle(pos=(cx + 9*s, body_y + 48*s), size=(6*s, 22*s))
+            Rotate(angle=-30, origin=(12*s, 48*s))
+            Rectangle(pos=(9*s, 48*s), size=(6*s, 22*s))
             PopMatrix()
 
             # Head
-            head_y = body_y + 50 * s
+            head_y = 50 * s
 
             # Hair behind
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - 12*s, head_y), size=(24*s, 22*s))
+            Ellipse(pos=(-12*s, head_y), size=(24*s, 22*s))
 
             # Ponytail
-            Rectangle(pos=(cx - 4*s, head_y + 16*s), size=(8*s, 14*s))
+            Rectangle(pos=(-4*s, head_y + 16*s), size=(8*s, 14*s))
 
             # Face
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - 10*s, head_y + 2*s), size=(20*s, 18*s))
+            Ellipse(pos=(-10*s, head_y + 2*s), size=(20*s, 18*s))
 
             # Hair bangs
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - 8*s, head_y + 14*s), size=(16*s, 8*s))
+            Ellipse(pos=(-8*s, head_y + 14*s), size=(16*s, 8*s))
 
             # Happy eyes (closed, smiling)
             Color(*Colors.BLACK)
-            Line(bezier=[cx - 7*s, head_y + 12*s, cx - 4*s, head_y + 14*s, cx - 1*s, head_y + 12*s], width=1.5*s)
-            Line(bezier=[cx + 1*s, head_y + 12*s, cx + 4*s, head_y + 14*s, cx + 7*s, head_y + 12*s], width=1.5*s)
+            Line(bezier=[-7*s, head_y + 12*s, -4*s, head_y + 14*s, -1*s, head_y + 12*s], width=1.5*s)
+            Line(bezier=[1*s, head_y + 12*s, 4*s, head_y + 14*s, 7*s, head_y + 12*s], width=1.5*s)
 
             # Big smile
-            Line(bezier=[cx - 6*s, head_y + 6*s, cx, head_y + 3*s, cx + 6*s, head_y + 6*s], width=1.5*s)
+            Line(bezier=[-6*s, head_y + 6*s, 0, head_y + 3*s, 6*s, head_y + 6*s], width=1.5*s)
 
             # Rosy cheeks
             Color(1.0, 0.5, 0.5, 0.6)
-            Ellipse(pos=(cx - 10*s, head_y + 5*s), size=(5*s, 4*s))
-            Ellipse(pos=(cx + 5*s, head_y + 5*s), size=(5*s, 4*s))
+            Ellipse(pos=(-10*s, head_y + 5*s), size=(5*s, 4*s))
+            Ellipse(pos=(5*s, head_y + 5*s), size=(5*s, 4*s))
+
+        return {'group': group}
 
     def start_flip(self, callback=None, flip_down=False, target_y=None):
         """Start the flip animation"""
@@ -550,30 +850,40 @@ class Player(Widget):
 
     def draw_side_view(self, s, cx):
         """Draw gymnast from side (facing right)"""
-        from kivy.graphics import PushMatrix, PopMatrix, Rotate
+        if self._show_sprite('side', cx, self.leg_angle):
+            return
+        pose = self._show_pose('side', self._build_side_view, s, cx)
 
         # Animation offsets for walking
         leg_swing = math.sin(self.leg_angle) * 20
         arm_swing = math.sin(self.leg_angle) * 15
 
-        with self.canvas:
+        pose['back_leg'].angle = -leg_swing
+        pose['back_arm'].angle = arm_swing + 20
+        pose['front_leg'].angle = leg_swing
+        pose['front_arm'].angle = -arm_swing - 20
+        pose['ponytail'].angle = math.sin(self.leg_angle * 1.5) * 8 - 45
+
+    def _build_side_view(self, s):
+        group = Canvas()
+        with group:
             # ===== BACK LEG (further from viewer) =====
             leg_width = 7 * s
             leg_height = 24 * s
 
             Color(*GymnastColors.SKIN[:3], 0.8)  # Slightly transparent for depth
             PushMatrix()
-            Rotate(angle=-leg_swing, origin=(cx - 2*s, self.y + 22*s))
-            Rectangle(pos=(cx - 5*s, self.y), size=(leg_width, leg_height))
+            back_leg = Rotate(angle=0, origin=(-2*s, 22*s))
+            Rectangle(pos=(-5*s, 0), size=(leg_width, leg_height))
             PopMatrix()
 
             # ===== BODY/LEOTARD (side view - narrower) =====
-            body_y = self.y + 20 * s
+            body_y = 20 * s
             body_height = 28 * s
             body_width = 16 * s
 
             Color(*GymnastColors.LEOTARD)
-            Rectangle(pos=(cx - body_width/2, body_y), size=(body_width, body_height))
+            Rectangle(pos=(-body_width/2, body_y), size=(body_width, body_height))
 
             # ===== BACK ARM =====
             arm_width = 5 * s
@@ -581,22 +891,22 @@ class Player(Widget):
 
             Color(*GymnastColors.SKIN[:3], 0.8)
             PushMatrix()
-            Rotate(angle=arm_swing + 20, origin=(cx - 4*s, body_y + body_height - 5*s))
-            Rectangle(pos=(cx - 6*s, body_y + body_height - arm_height - 5*s), size=(arm_width, arm_height))
+            back_arm = Rotate(angle=20, origin=(-4*s, body_y + body_height - 5*s))
+            Rectangle(pos=(-6*s, body_y + body_height - arm_height - 5*s), size=(arm_width, arm_height))
             PopMatrix()
 
             # ===== FRONT LEG =====
             Color(*GymnastColors.SKIN)
             PushMatrix()
-            Rotate(angle=leg_swing, origin=(cx + 2*s, self.y + 22*s))
-            Rectangle(pos=(cx - 2*s, self.y), size=(leg_width, leg_height))
+            front_leg = Rotate(angle=0, origin=(2*s, 22*s))
+            Rectangle(pos=(-2*s, 0), size=(leg_width, leg_height))
             PopMatrix()
 
             # ===== FRONT ARM =====
             Color(*GymnastColors.SKIN)
             PushMatrix()
-            Rotate(angle=-arm_swing - 20, origin=(cx + 4*s, body_y + body_height - 5*s))
-            Rectangle(pos=(cx + 1*s, body_y + body_height - arm_height - 5*s), size=(arm_width, arm_height))
+            front_arm = Rotate(angle=-20, origin=(4*s, body_y + body_height - 5*s))
+            Rectangle(pos=(1*s, body_y + body_height - arm_height - 5*s), size=(arm_width, arm_height))
             PopMatrix()
 
             # ===== HEAD (side profile) =====
@@ -605,70 +915,76 @@ class Player(Widget):
 
             # Hair back (behind head)
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - head_size/2 - 4*s, head_y), size=(head_size, head_size + 2*s))
+            Ellipse(pos=(-head_size/2 - 4*s, head_y), size=(head_size, head_size + 2*s))
 
             # Ponytail flowing behind
-            pony_swing = math.sin(self.leg_angle * 1.5) * 8
             PushMatrix()
-            Rotate(angle=pony_swing - 45, origin=(cx - head_size/2, head_y + head_size/2))
-            Rectangle(pos=(cx - head_size/2 - 18*s, head_y + head_size/2 - 4*s), size=(20*s, 8*s))
-            Ellipse(pos=(cx - head_size/2 - 22*s, head_y + head_size/2 - 6*s), size=(10*s, 10*s))
+            ponytail = Rotate(angle=-45, origin=(-head_size/2, head_y + head_size/2))
+            Rectangle(pos=(-head_size/2 - 18*s, head_y + head_size/2 - 4*s), size=(20*s, 8*s))
+            Ellipse(pos=(-head_size/2 - 22*s, head_y + head_size/2 - 6*s), size=(10*s, 10*s))
             PopMatrix()
 
             # Face (skin) - side profile oval
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - head_size/2 + 2*s, head_y), size=(head_size - 2*s, head_size))
+            Ellipse(pos=(-head_size/2 + 2*s, head_y), size=(head_size - 2*s, head_size))
 
             # Hair bangs on forehead
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx, head_y + head_size - 8*s), size=(8*s, 10*s))
+            Ellipse(pos=(0, head_y + head_size - 8*s), size=(8*s, 10*s))
 
             # Eye (side view - one eye visible)
             eye_y = head_y + head_size/2 + 2*s
             Color(*Colors.WHITE)
-            Ellipse(pos=(cx + 2*s, eye_y), size=(6*s, 5*s))
+            Ellipse(pos=(2*s, eye_y), size=(6*s, 5*s))
             # Pupil (looking forward/right)
             Color(*Colors.BLACK)
-            Ellipse(pos=(cx + 5*s, eye_y + 1*s), size=(3*s, 3*s))
+            Ellipse(pos=(5*s, eye_y + 1*s), size=(3*s, 3*s))
 
             # Nose (small bump)
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx + head_size/2 - 4*s, head_y + head_size/2 - 2*s), size=(5*s, 4*s))
+            Ellipse(pos=(head_size/2 - 4*s, head_y + head_size/2 - 2*s), size=(5*s, 4*s))
 
             # Smile (side view)
             Color(*Colors.BLACK)
             smile_y = head_y + 4*s
-            Line(points=[cx + 2*s, smile_y, cx + 8*s, smile_y + 2*s], width=1.2*s)
+            Line(points=[2*s, smile_y, 8*s, smile_y + 2*s], width=1.2*s)
 
             # Rosy cheek
             Color(1.0, 0.6, 0.6, 0.5)
-            Ellipse(pos=(cx + 1*s, smile_y - 1*s), size=(5*s, 4*s))
+            Ellipse(pos=(1*s, smile_y - 1*s), size=(5*s, 4*s))
+
+        return {'group': group, 'back_leg': back_leg, 'back_arm': back_arm,
+                'front_leg': front_leg, 'front_arm': front_arm, 'ponytail': ponytail}
 
     def draw_front_view(self, s, cx):
         """Draw gymnast facing the player (front view)"""
-        from kivy.graphics import PushMatrix, PopMatrix, Rotate
+        if self._show_sprite('front', cx):
+            return
+        self._show_pose('front', self._build_front_view, s, cx)
 
-        with self.canvas:
+    def _build_front_view(self, s):
+        group = Canvas()
+        with group:
             # ===== LEGS =====
             leg_width = 8 * s
             leg_height = 22 * s
 
             Color(*GymnastColors.SKIN)
             # Left leg
-            Rectangle(pos=(cx - 12*s, self.y), size=(leg_width, leg_height))
+            Rectangle(pos=(-12*s, 0), size=(leg_width, leg_height))
             # Right leg
-            Rectangle(pos=(cx + 4*s, self.y), size=(leg_width, leg_height))
+            Rectangle(pos=(4*s, 0), size=(leg_width, leg_height))
 
             # ===== BODY/LEOTARD =====
-            body_y = self.y + 20 * s
+            body_y = 20 * s
             body_height = 28 * s
             body_width = 22 * s
 
             Color(*GymnastColors.LEOTARD)
-            Rectangle(pos=(cx - body_width/2, body_y), size=(body_width, body_height))
+            Rectangle(pos=(-body_width/2, body_y), size=(body_width, body_height))
             # Rounded shoulders
-            Ellipse(pos=(cx - body_width/2 - 3*s, body_y + body_height - 8*s), size=(10*s, 10*s))
-            Ellipse(pos=(cx + body_width/2 - 7*s, body_y + body_height - 8*s), size=(10*s, 10*s))
+            Ellipse(pos=(-body_width/2 - 3*s, body_y + body_height - 8*s), size=(10*s, 10*s))
+            Ellipse(pos=(body_width/2 - 7*s, body_y + body_height - 8*s), size=(10*s, 10*s))
 
             # ===== ARMS (raised in celebration!) =====
             arm_width = 6 * s
@@ -678,14 +994,14 @@ class Player(Widget):
             Color(*GymnastColors.SKIN)
             # Left arm raised
             PushMatrix()
-            Rotate(angle=45, origin=(cx - 14*s, arm_y))
-            Rectangle(pos=(cx - 18*s, arm_y), size=(arm_width, arm_height))
+            Rotate(angle=45, origin=(-14*s, arm_y))
+            Rectangle(pos=(-18*s, arm_y), size=(arm_width, arm_height))
             PopMatrix()
 
             # Right arm raised
             PushMatrix()
-            Rotate(angle=-45, origin=(cx + 14*s, arm_y))
-            Rectangle(pos=(cx + 12*s, arm_y), size=(arm_width, arm_height))
+            Rotate(angle=-45, origin=(14*s, arm_y))
+            Rectangle(pos=(12*s, arm_y), size=(arm_width, arm_height))
             PopMatrix()
 
             # ===== HEAD =====
@@ -694,452 +1010,1218 @@ class Player(Widget):
 
             # Hair (behind head)
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - head_size/2 - 2*s, head_y + 2*s), size=(head_size + 4*s, head_size + 6*s))
+            Ellipse(pos=(-head_size/2 - 2*s, head_y + 2*s), size=(head_size + 4*s, head_size + 6*s))
 
             # Ponytail (behind, centered)
-            pony_x = cx - 4*s
+            pony_x = -4*s
             pony_y = head_y + head_size
             Ellipse(pos=(pony_x, pony_y - 2*s), size=(8*s, 6*s))
             Rectangle(pos=(pony_x, pony_y - 12*s), size=(8*s, 12*s))
 
             # Face (skin)
             Color(*GymnastColors.SKIN)
-            Ellipse(pos=(cx - head_size/2, head_y), size=(head_size, head_size))
+            Ellipse(pos=(-head_size/2, head_y), size=(head_size, head_size))
 
             # Hair bangs
             Color(*GymnastColors.HAIR)
-            Ellipse(pos=(cx - head_size/2 + 2*s, head_y + head_size - 6*s), size=(head_size - 4*s, 8*s))
+            Ellipse(pos=(-head_size/2 + 2*s, head_y + head_size - 6*s), size=(head_size - 4*s, 8*s))
 
             # Eyes (happy/closed - celebrating!)
             eye_y = head_y + head_size/2 + 2*s
             Color(*Colors.BLACK)
             # Happy closed eyes (curved lines)
-            Line(bezier=[cx - 9*s, eye_y, cx - 6*s, eye_y + 3*s, cx - 3*s, eye_y], width=1.5*s)
-            Line(bezier=[cx + 3*s, eye_y, cx + 6*s, eye_y + 3*s, cx + 9*s, eye_y], width=1.5*s)
+            Line(bezier=[-9*s, eye_y, -6*s, eye_y + 3*s, -3*s, eye_y], width=1.5*s)
+            Line(bezier=[3*s, eye_y, 6*s, eye_y + 3*s, 9*s, eye_y], width=1.5*s)
 
             # Big happy smile
             smile_y = head_y + 4*s
-            Line(bezier=[cx - 6*s, smile_y,
-                        cx, smile_y - 3*s,
-                        cx + 6*s, smile_y], width=1.5*s)
+            Line(bezier=[-6*s, smile_y,
+                        0, smile_y - 3*s,
+                        6*s, smile_y], width=1.5*s)
 
             # Rosy cheeks (bigger when happy!)
             Color(1.0, 0.5, 0.5, 0.6)
-            Ellipse(pos=(cx - 11*s, smile_y - 1*s), size=(5*s, 4*s))
-            Ellipse(pos=(cx + 6*s, smile_y - 1*s), size=(5*s, 4*s))
-
-    def update(self, dt, ground_y):
-        # Handle front-facing timer (after landing from jump)
-        if self.facing_front:
-            self.front_timer -= dt
-            if self.front_timer <= 0:
-                self.facing_front = False
-
-        # Walking animation (faster for gymnast)
-        if not self.is_jumping and not self.facing_front:
-            self.leg_angle += dt * 12
-            self.arm_angle = self.leg_angle
-
-        # Track if we were jumping
-        was_in_air = self.is_jumping
-
-        # Jumping physics
-        if self.is_jumping:
-            self.velocity_y += GameSettings.GRAVITY * dt
-            self.y += self.velocity_y * dt
-
-            landing_y = ground_y
-            if self.y <= landing_y and self.velocity_y < 0:
-                self.y = landing_y
-                self.velocity_y = 0
-                self.is_jumping = False
-                self.is_on_ground = True
-
-                # Just landed! Turn to face the player briefly
-                self.facing_front = True
-                self.front_timer = 0.4  # Face front for 0.4 seconds
-
+            Ellipse(pos=(-11*s, smile_y - 1*s), size=(5*s, 4*s))
+            Ellipse(pos=(6*s, smile_y - 1*s), size=(5*s, 4*s))
+
+        return {'group': group}
+
+    def sync(self, state, alpha=1.0):
+        """Mirror a simulation.PlayerState while walking and jumping on the beam,
+        alpha of the way from its previous tick"""
+        self.pos = state.lerp_pos(alpha)
+        self.leg_angle = state.leg_angle
+        self.arm_angle = state.arm_angle
+        self.facing_front = state.facing_front
         self.draw_player()
 
-    def jump(self, super_jump=False):
-        if self.is_on_ground and not self.is_jumping:
-            self.is_jumping = True
-            self.is_on_ground = False
-            # Super jump is 50% higher when obstacles are close together
-            if super_jump:
-                self.velocity_y = GameSettings.PLAYER_JUMP_FORCE * 1.5
-            else:
-                self.velocity_y = GameSettings.PLAYER_JUMP_FORCE
-
-    def get_collision_rect(self):
-        s = GameSettings.SCALE
-        # Collision area around the body
-        return (self.x + 10*s, self.y + 20*s, self.width - 20*s, 40*s)
-
 
 class BowlingBall(Widget):
-    speed = NumericProperty(GameSettings.BALL_SLOW_SPEED)
     rotation = NumericProperty(0)
 
-    def __init__(self, speed=GameSettings.BALL_SLOW_SPEED, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = speed
         self.size = (GameSettings.BALL_RADIUS * 2, GameSettings.BALL_RADIUS * 2)
-        self.draw_ball()
 
-    def draw_ball(self):
-        self.canvas.clear()
+        # Built once around the ball's center; draw_ball only moves and spins it
         with self.canvas:
             # Save the current matrix
-            from kivy.graphics import PushMatrix, PopMatrix, Rotate
             PushMatrix()
-            Rotate(angle=self.rotation, origin=(self.center_x, self.center_y))
+            self._origin = Translate(0, 0)
+            self._spin = Rotate(angle=0, axis=(0, 0, 1))
+            self._body = InstructionGroup()  # Vector shapes, or the atlas sprite once it's ready
+            PopMatrix()
 
+        half_w = self.width / 2
+        half_h = self.height / 2
+        self._shapes = Canvas()
+        with self._shapes:
             # Ball body
             Color(*Colors.BALL_BLUE)
-            Ellipse(pos=self.pos, size=self.size)
+            Ellipse(pos=(-half_w, -half_h), size=self.size)
 
             # Shine
             Color(1, 1, 1, 0.3)
-            Ellipse(pos=(self.x + 5, self.y + self.height - 15), size=(10, 10))
+            Ellipse(pos=(-half_w + 5, half_h - 15), size=(10, 10))
 
             # Finger holes
             Color(*Colors.WHITE)
             # Top hole
-            Ellipse(pos=(self.center_x - 4, self.center_y + 2), size=(8, 8))
+            Ellipse(pos=(-4, 2), size=(8, 8))
             # Bottom left hole
-            Ellipse(pos=(self.center_x - 10, self.center_y - 10), size=(8, 8))
+            Ellipse(pos=(-10, -10), size=(8, 8))
             # Bottom right hole
-            Ellipse(pos=(self.center_x + 2, self.center_y - 10), size=(8, 8))
+            Ellipse(pos=(2, -10), size=(8, 8))
 
-            PopMatrix()
+        self._sprite = None
+        self._body.add(self._shapes)
+        self.use_atlas()
+        self.draw_ball()
 
-    def update(self, dt):
-        self.x -= self.speed * dt
-        self.rotation -= self.speed * dt * 2
+    def use_atlas(self):
+        """Swap the vector shapes for the atlas sprite once it is ready"""
+        self._sprite = SpriteAtlas().swap_in(self._body, 'ball', self._sprite)
+
+    def reset(self, pos=(0, 0)):
+        """Prepare a pooled ball for another roll"""
+        self.use_atlas()
+        self.rotation = 0
+        self.pos = pos
         self.draw_ball()
 
-    def get_collision_circle(self):
-        return (self.center_x, self.center_y, GameSettings.BALL_RADIUS)
+    def draw_ball(self):
+        self._origin.xy = (self.center_x, self.center_y)
+        self._spin.angle = self.rotation
+
+    def sync(self, state, t):
+        """Mirror a simulation.BallState as it is at time t"""
+        self.pos = state.position_at(t)
+        self.rotation = state.rotation_at(t)
+        self.draw_ball()
 
 
 class Bee(Widget):
-    speed = NumericProperty(GameSettings.BEE_SPEED)
     wing_angle = NumericProperty(0)
-    bob_offset = NumericProperty(0)
-    bob_direction = NumericProperty(1)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.size = (GameSettings.BEE_WIDTH + 20, GameSettings.BEE_HEIGHT + 25)
-        self.draw_bee()
-
-    def draw_bee(self):
-        self.canvas.clear()
-        cx = self.center_x
-        cy = self.center_y
         s = GameSettings.SCALE  # Scale factor
 
+        # Built once around the bee's center; draw_bee only moves it and
+        # resizes the flapping wings (or picks the atlas frame)
         with self.canvas:
-            # Pink wings (the distinctive feature!)
-            wing_scale = 0.7 + abs(math.sin(self.wing_angle)) * 0.6
+            PushMatrix()
+            self._origin = Translate(0, 0)
+            self._body = InstructionGroup()  # Vector shapes, or the atlas sprite once it's ready
+            PopMatrix()
 
+        self._shapes = Canvas()
+        with self._shapes:
+            # Pink wings (the distinctive feature!)
             Color(*Colors.BEE_PINK[:3], 0.7)
             # Left wing
-            Ellipse(pos=(cx - 22*s, cy + 2*s), size=(18*s, 12*s * wing_scale))
+            self._left_wing = Ellipse(pos=(-22*s, 2*s), size=(18*s, 12*s))
             # Right wing
-            Ellipse(pos=(cx + 4*s, cy + 2*s), size=(18*s, 12*s * wing_scale))
+            self._right_wing = Ellipse(pos=(4*s, 2*s), size=(18*s, 12*s))
 
             # Wing outline
             Color(*Colors.BEE_PINK)
-            Line(ellipse=(cx - 22*s, cy + 2*s, 18*s, 12*s * wing_scale), width=1.5*s)
-            Line(ellipse=(cx + 4*s, cy + 2*s, 18*s, 12*s * wing_scale), width=1.5*s)
+            self._left_wing_outline = Line(ellipse=(-22*s, 2*s, 18*s, 12*s), width=1.5*s)
+            self._right_wing_outline = Line(ellipse=(4*s, 2*s, 18*s, 12*s), width=1.5*s)
 
             # Body (yellow oval)
             Color(*Colors.BEE_YELLOW)
-            Ellipse(pos=(cx - 15*s, cy - 10*s), size=(30*s, 20*s))
+            Ellipse(pos=(-15*s, -10*s), size=(30*s, 20*s))
 
             # Black stripes
             Color(*Colors.BLACK)
-            Rectangle(pos=(cx - 5*s, cy - 8*s), size=(4*s, 16*s))
-            Rectangle(pos=(cx + 3*s, cy - 8*s), size=(4*s, 16*s))
+            Rectangle(pos=(-5*s, -8*s), size=(4*s, 16*s))
+            Rectangle(pos=(3*s, -8*s), size=(4*s, 16*s))
 
             # Stinger
-            Triangle(points=[cx - 15*s, cy, cx - 23*s, cy, cx - 15*s, cy - 3*s])
+            Triangle(points=[-15*s, 0, -23*s, 0, -15*s, -3*s])
 
             # Eyes
-            Ellipse(pos=(cx + 8*s, cy - 2*s), size=(6*s, 6*s))
-            Ellipse(pos=(cx + 8*s, cy - 8*s), size=(6*s, 6*s))
+            Ellipse(pos=(8*s, -2*s), size=(6*s, 6*s))
+            Ellipse(pos=(8*s, -8*s), size=(6*s, 6*s))
 
             # Antennae
-            Line(points=[cx + 2*s, cy + 10*s, cx - 5*s, cy + 18*s], width=2*s)
-            Line(points=[cx + 6*s, cy + 10*s, cx + 13*s, cy + 18*s], width=2*s)
+            Line(points=[2*s, 10*s, -5*s, 18*s], width=2*s)
+            Line(points=[6*s, 10*s, 13*s, 18*s], width=2*s)
             # Antenna tips
-            Ellipse(pos=(cx - 7*s, cy + 16*s), size=(4*s, 4*s))
-            Ellipse(pos=(cx + 11*s, cy + 16*s), size=(4*s, 4*s))
-
-    def update(self, dt):
-        self.x -= self.speed * dt
+            Ellipse(pos=(-7*s, 16*s), size=(4*s, 4*s))
+            Ellipse(pos=(11*s, 16*s), size=(4*s, 4*s))
 
-        # Wing flapping
-        self.wing_angle += dt * 25
+        self._sprite = None
+        self._body.add(self._shapes)
+        self.use_atlas()
+        self.draw_bee()
 
-        # Bobbing motion
-        self.bob_offset += self.bob_direction * dt * 40
-        if abs(self.bob_offset) > 20:
-            self.bob_direction *= -1
-        self.y += self.bob_direction * dt * 40
+    def use_atlas(self):
+        """Swap the vector shapes for the atlas sprite once it is ready"""
+        self._sprite = SpriteAtlas().swap_in(self._body, 'bee', self._sprite)
 
+    def reset(self, pos=(0, 0)):
+        """Prepare a pooled bee for another flight"""
+        self.use_atlas()
+        self.wing_angle = 0
+        self.pos = pos
         self.draw_bee()
 
-    def get_collision_circle(self):
-        return (self.center_x, self.center_y, 15)
+    def draw_bee(self):
+        s = GameSettings.SCALE
+        self._origin.xy = (self.center_x, self.center_y)
+        if self._sprite is not None:
+            region = SpriteAtlas().frame('bee', self.wing_angle)[0]
+            if self._sprite.texture is not region:
+                self._sprite.texture = region
+            return
 
+        wing_scale = 0.7 + abs(math.sin(self.wing_angle)) * 0.6
+        wing_size = (18*s, 12*s * wing_scale)
+        self._left_wing.size = wing_size
+        self._right_wing.size = wing_size
+        self._left_wing_outline.ellipse = (-22*s, 2*s) + wing_size
+        self._right_wing_outline.ellipse = (4*s, 2*s) + wing_size
+
+    def sync(self, state, t):
+        """Mirror a simulation.BeeState as it is at time t"""
+        self.pos = state.position_at(t)
+        self.wing_angle = state.wing_angle_at(t)
+        self.draw_bee()
 
-# ============== CONFETTI & MEDALS ==============
-class ConfettiParticle(Widget):
-    """A single confetti particle that falls and spins"""
-    def __init__(self, x, y, is_medal=False, **kwargs):
-        super().__init__(**kwargs)
-        s = GameSettings.SCALE
-        self.is_medal = is_medal
 
-        if is_medal:
-            self.size = (30 * s, 35 * s)
-        else:
-            self.size = (random.uniform(8, 15) * s, random.uniform(8, 15) * s)
+# ============== CONFETTI & MEDALS ==============
+CONFETTI_COLORS = [
+    (1, 0.84, 0, 1),      # Gold
+    (1, 0.41, 0.71, 1),   # Pink
+    (0.53, 0.81, 0.92, 1), # Light blue
+    (0.56, 0.93, 0.56, 1), # Light green
+    (1, 0.5, 0, 1),       # Orange
+    (0.8, 0.52, 0.98, 1), # Purple
+]
+MEDAL_RIBBON = len(CONFETTI_COLORS)
+MEDAL_GOLD = MEDAL_RIBBON + 1
+MEDAL_SHINE = MEDAL_RIBBON + 2
+MEDAL_STAR = MEDAL_RIBBON + 3
+CONFETTI_PALETTE = CONFETTI_COLORS + [
+    (0.8, 0.1, 0.1, 1),   # Red ribbon
+    (1, 0.84, 0, 1),      # Medal gold
+    (1, 0.95, 0.6, 1),    # Medal shine
+    (1, 0.95, 0.4, 1),    # Medal star
+]
 
-        self.pos = (x, y)
-        self.velocity_x = random.uniform(-100, 100) * s
-        self.velocity_y = random.uniform(-200, 100) * s
-        self.gravity = -400 * s
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-300, 300)
-
-        # Random bright color for confetti
-        self.confetti_color = random.choice([
-            (1, 0.84, 0, 1),      # Gold
-            (1, 0.41, 0.71, 1),   # Pink
-            (0.53, 0.81, 0.92, 1), # Light blue
-            (0.56, 0.93, 0.56, 1), # Light green
-            (1, 0.5, 0, 1),       # Orange
-            (0.8, 0.52, 0.98, 1), # Purple
-        ])
-
-        self.draw_particle()
-
-    def draw_particle(self):
-        self.canvas.clear()
-        s = GameSettings.SCALE
+_confetti_palette = None
 
-        with self.canvas:
-            from kivy.graphics import PushMatrix, PopMatrix, Rotate
-            PushMatrix()
-            Rotate(angle=self.rotation, origin=(self.center_x, self.center_y))
-
-            if self.is_medal:
-                # Draw a medal
-                # Ribbon
-                Color(0.8, 0.1, 0.1, 1)  # Red ribbon
-                Rectangle(pos=(self.center_x - 4*s, self.center_y), size=(8*s, 15*s))
-
-                # Medal circle (gold)
-                Color(1, 0.84, 0, 1)
-                Ellipse(pos=(self.x, self.y), size=(self.width, self.width))
-
-                # Medal shine
-                Color(1, 0.95, 0.6, 1)
-                Ellipse(pos=(self.x + 3*s, self.y + self.width - 12*s), size=(8*s, 8*s))
-
-                # Star on medal
-                Color(1, 0.95, 0.4, 1)
-                star_cx = self.center_x
-                star_cy = self.y + self.width/2
-                star_size = 6 * s
-                # Simple star shape using triangles
-                Triangle(points=[
-                    star_cx, star_cy + star_size,
-                    star_cx - star_size * 0.6, star_cy - star_size * 0.4,
-                    star_cx + star_size * 0.6, star_cy - star_size * 0.4
-                ])
-                Triangle(points=[
-                    star_cx, star_cy - star_size,
-                    star_cx - star_size * 0.6, star_cy + star_size * 0.4,
-                    star_cx + star_size * 0.6, star_cy + star_size * 0.4
-                ])
-            else:
-                # Draw confetti piece
-                Color(*self.confetti_color)
-                if random.random() < 0.5:
-                    Ellipse(pos=self.pos, size=self.size)
-                else:
-                    Rectangle(pos=self.pos, size=self.size)
 
-            PopMatrix()
+def get_confetti_palette():
+    """One texel per palette color, so a single Mesh can draw every color"""
+    global _confetti_palette
+    if _confetti_palette is None:
+        texture = Texture.create(size=(len(CONFETTI_PALETTE), 1), colorfmt='rgba')
+        texture.mag_filter = 'nearest'
+        texture.min_filter = 'nearest'
 
-    def update(self, dt):
-        self.velocity_y += self.gravity * dt
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-        self.rotation += self.rotation_speed * dt
-        self.draw_particle()
+        def upload(texture):
+            pixels = bytes(int(c * 255) for color in CONFETTI_PALETTE for c in color)
+            texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
 
-        # Return True if particle is off screen
-        return self.y < -50
+        upload(texture)
+        texture.add_reload_observer(upload)
+        _confetti_palette = texture
+    return _confetti_palette
 
 
 class ConfettiSystem(Widget):
-    """Manages multiple confetti particles"""
+    """Falling confetti and medals, all drawn through one Mesh.
+
+    Particle state is kept in flat struct-of-arrays buffers and advanced in a
+    single pass per frame (vectorized when NumPy is available). Each particle
+    is a fixed triangle template around its center, colored by pointing its
+    texture coordinates at a texel of the palette texture. Once the sprite
+    atlas is ready the mesh draws from it instead: its palette texels color
+    the confetti and each medal is a single quad.
+    """
+    ELLIPSE_SEGMENTS = 10
+    MEDAL_SEGMENTS = 20
+    MEDAL_WIDTH = 30
+    MEDAL_HEIGHT = 35
+    MAX_VERTICES = 65536  # Mesh indices are unsigned shorts
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.particles = []
         self.is_active = False
+        self.count = 0
+        self.gravity = -400 * GameSettings.SCALE
+        self._reset_buffers()
+
+        self._build_canvas()
+        self._use_texture()
+
+    def _build_canvas(self):
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.mesh = Mesh(mode='triangles', texture=get_confetti_palette())
+
+    def _reset_buffers(self):
+        # Per particle (center position, motion, rotation in degrees)
+        self.pos_x = array('f')
+        self.pos_y = array('f')
+        self.vel_x = array('f')
+        self.vel_y = array('f')
+        self.rotation = array('f')
+        self.rotation_speed = array('f')
+        self.half_height = array('f')
+        # Per vertex (owning particle, offset from its center); the vertex
+        # buffer itself is interleaved x, y, u, v as the Mesh expects
+        self.vertex_owner = array('i')
+        self.vertex_dx = array('f')
+        self.vertex_dy = array('f')
+        self.vertices = array('f')
+        # Triangle indices and the particle each index belongs to
+        self.all_indices = array('H')
+        self.index_owner = array('i')
+        self.alive = bytearray()
+
+    def _use_texture(self):
+        """Point the mesh at the sprite atlas if it is ready, else the palette texture"""
+        atlas = SpriteAtlas()
+        if atlas.ready:
+            self.mesh.texture = atlas.texture
+            self.color_uvs = [atlas.texel_uv('palette', color) for color in range(len(CONFETTI_PALETTE))]
+            self.medal_sprite = atlas.frame('medal')
+        else:
+            self.mesh.texture = get_confetti_palette()
+            self.color_uvs = [((color + 0.5) / len(CONFETTI_PALETTE), 0.5)
+                              for color in range(len(CONFETTI_PALETTE))]
+            self.medal_sprite = None
+
+    def _add_vertex(self, owner, dx, dy, u, v):
+        self.vertex_owner.append(owner)
+        self.vertex_dx.append(dx)
+        self.vertex_dy.append(dy)
+        self.vertices.extend((0, 0, u, v))
+        return len(self.vertex_owner) - 1
+
+    def _add_triangles(self, owner, indices):
+        self.all_indices.extend(indices)
+        self.index_owner.extend([owner] * len(indices))
+
+    def _add_rect(self, owner, x, y, w, h, color):
+        u, v = self.color_uvs[color]
+        a = self._add_vertex(owner, x, y, u, v)
+        b = self._add_vertex(owner, x + w, y, u, v)
+        c = self._add_vertex(owner, x + w, y + h, u, v)
+        d = self._add_vertex(owner, x, y + h, u, v)
+        self._add_triangles(owner, (a, b, c, a, c, d))
+
+    def _add_ellipse(self, owner, cx, cy, rx, ry, color, segments):
+        u, v = self.color_uvs[color]
+        center = self._add_vertex(owner, cx, cy, u, v)
+        first = center + 1
+        for i in range(segments):
+            angle = 2 * math.pi * i / segments
+            self._add_vertex(owner, cx + rx * math.cos(angle), cy + ry * math.sin(angle), u, v)
+        for i in range(segments):
+            self._add_triangles(owner, (center, first + i, first + (i + 1) % segments))
+
+    def _add_star(self, owner, cx, cy, size, color):
+        u, v = self.color_uvs[color]
+        for sign in (1, -1):
+            a = self._add_vertex(owner, cx, cy + sign * size, u, v)
+            b = self._add_vertex(owner, cx - size * 0.6, cy - sign * size * 0.4, u, v)
+            c = self._add_vertex(owner, cx + size * 0.6, cy - sign * size * 0.4, u, v)
+            self._add_triangles(owner, (a, b, c))
+
+    def _add_sprite(self, owner, region, sprite):
+        """One quad around the particle center textured with an atlas frame"""
+        left, bottom = sprite.left, sprite.bottom
+        right, top = left + sprite.width, bottom + sprite.height
+        uv = region.tex_coords  # Bottom-left, bottom-right, top-right, top-left
+        a = self._add_vertex(owner, left, bottom, uv[0], uv[1])
+        b = self._add_vertex(owner, right, bottom, uv[2], uv[3])
+        c = self._add_vertex(owner, right, top, uv[4], uv[5])
+        d = self._add_vertex(owner, left, top, uv[6], uv[7])
+        self._add_triangles(owner, (a, b, c, a, c, d))
+
+    def _spawn(self, x, y, width, height, is_medal):
+        """Add a particle whose bounding box starts at (x, y)"""
+        s = GameSettings.SCALE
+        owner = len(self.pos_x)
+        self.pos_x.append(x + width / 2)
+        self.pos_y.append(y + height / 2)
+        self.half_height.append(height / 2)
+        self.vel_x.append(random.uniform(-100, 100) * s)
+        self.vel_y.append(random.uniform(-200, 100) * s)
+        self.rotation.append(random.uniform(0, 360))
+        self.rotation_speed.append(random.uniform(-300, 300))
+        self.alive.append(1)
+
+        if is_medal and self.medal_sprite is not None:
+            self._add_sprite(owner, *self.medal_sprite)
+        elif is_medal:
+            # Offsets are relative to the medal's center (width x height box)
+            disc_y = width / 2 - height / 2
+            # Ribbon
+            self._add_rect(owner, -4*s, 0, 8*s, 15*s, MEDAL_RIBBON)
+            # Medal circle (gold)
+            self._add_ellipse(owner, 0, disc_y, width / 2, width / 2, MEDAL_GOLD, self.MEDAL_SEGMENTS)
+            # Medal shine
+            self._add_ellipse(owner, -width / 2 + 7*s, disc_y + width / 2 - 8*s, 4*s, 4*s,
+                              MEDAL_SHINE, self.ELLIPSE_SEGMENTS)
+            # Star on medal
+            self._add_star(owner, 0, disc_y, 6 * s, MEDAL_STAR)
+        else:
+            # Color and shape are picked once so pieces don't flicker
+            color = random.randrange(len(CONFETTI_COLORS))
+            if random.random() < 0.5:
+                self._add_ellipse(owner, 0, 0, width / 2, height / 2, color, self.ELLIPSE_SEGMENTS)
+            else:
+                self._add_rect(owner, -width / 2, -height / 2, width, height, color)
 
     def start(self, num_confetti=50, num_medals=8):
+        self.stop()
         self.is_active = True
-        self.particles = []
+        s = GameSettings.SCALE
+        self.gravity = -400 * s
+        self._use_texture()
 
         # Create confetti particles
         for i in range(num_confetti):
             x = random.uniform(0, Window.width)
             y = Window.height + random.uniform(0, 100)
-            particle = ConfettiParticle(x, y, is_medal=False)
-            self.particles.append(particle)
-            self.add_widget(particle)
+            size = (random.uniform(8, 15) * s, random.uniform(8, 15) * s)
+            self._spawn(x, y, size[0], size[1], is_medal=False)
+            if len(self.vertex_owner) > self.MAX_VERTICES - 64:
+                break
 
         # Create medal particles
         for i in range(num_medals):
             x = random.uniform(Window.width * 0.2, Window.width * 0.8)
             y = Window.height + random.uniform(50, 200)
-            medal = ConfettiParticle(x, y, is_medal=True)
-            self.particles.append(medal)
-            self.add_widget(medal)
+            self._spawn(x, y, self.MEDAL_WIDTH * s, self.MEDAL_HEIGHT * s, is_medal=True)
+            if len(self.vertex_owner) > self.MAX_VERTICES - 64:
+                break
+
+        self.count = len(self.pos_x)
+        self.mesh.indices = self.all_indices
+        self._update_vertices()
 
+        FramePacer().hold(self)
         Clock.schedule_interval(self.update, 1/60)
 
     def update(self, dt):
         if not self.is_active:
             return False
 
-        for particle in self.particles[:]:
-            if particle.update(dt):
-                self.remove_widget(particle)
-                self.particles.remove(particle)
+        if numpy is not None:
+            died = self._step_numpy(dt)
+        else:
+            died = self._step_arrays(dt)
+
+        if died:
+            self._rebuild_indices()
+        self._update_vertices()
 
         # Stop when all particles are gone
-        if not self.particles:
+        if not self.count:
             self.is_active = False
+            FramePacer().release(self)
             return False
 
+    def _step_numpy(self, dt):
+        vel_y = numpy.frombuffer(self.vel_y, dtype=numpy.float32)
+        pos_x = numpy.frombuffer(self.pos_x, dtype=numpy.float32)
+        pos_y = numpy.frombuffer(self.pos_y, dtype=numpy.float32)
+        rotation = numpy.frombuffer(self.rotation, dtype=numpy.float32)
+        alive = numpy.frombuffer(self.alive, dtype=numpy.uint8)
+
+        vel_y += self.gravity * dt
+        pos_x += numpy.frombuffer(self.vel_x, dtype=numpy.float32) * dt
+        pos_y += vel_y * dt
+        rotation += numpy.frombuffer(self.rotation_speed, dtype=numpy.float32) * dt
+
+        # Particle is gone once its box is below the screen
+        gone = (pos_y - numpy.frombuffer(self.half_height, dtype=numpy.float32)) < -50
+        died = bool(numpy.any(gone & (alive == 1)))
+        if died:
+            alive[gone] = 0
+            self.count = int(numpy.count_nonzero(alive))
+        return died
+
+    def _step_arrays(self, dt):
+        gravity_dv = self.gravity * dt
+        pos_x, pos_y = self.pos_x, self.pos_y
+        vel_x, vel_y = self.vel_x, self.vel_y
+        rotation, rotation_speed = self.rotation, self.rotation_speed
+        half_height, alive = self.half_height, self.alive
+        died = False
+        for i in range(len(pos_x)):
+            vel_y[i] += gravity_dv
+            pos_x[i] += vel_x[i] * dt
+            pos_y[i] += vel_y[i] * dt
+            rotation[i] += rotation_speed[i] * dt
+            if alive[i] and pos_y[i] - half_height[i] < -50:
+                alive[i] = 0
+                self.count -= 1
+                died = True
+        return died
+
+    def _rebuild_indices(self):
+        if numpy is not None:
+            alive = numpy.frombuffer(self.alive, dtype=numpy.uint8)
+            owner = numpy.frombuffer(self.index_owner, dtype=numpy.int32)
+            indices = numpy.frombuffer(self.all_indices, dtype=numpy.uint16)
+            self.mesh.indices = indices[alive[owner] == 1]
+        else:
+            alive = self.alive
+            self.mesh.indices = array('H', [index for index, owner in zip(self.all_indices, self.index_owner)
+                                            if alive[owner]])
+
+    def _update_vertices(self):
+        """Rotate each particle's template around its center into the vertex buffer"""
+        if numpy is not None:
+            owner = numpy.frombuffer(self.vertex_owner, dtype=numpy.int32)
+            dx = numpy.frombuffer(self.vertex_dx, dtype=numpy.float32)
+            dy = numpy.frombuffer(self.vertex_dy, dtype=numpy.float32)
+            radians = numpy.radians(numpy.frombuffer(self.rotation, dtype=numpy.float32))
+            cos_r = numpy.cos(radians)[owner]
+            sin_r = numpy.sin(radians)[owner]
+            vertices = numpy.frombuffer(self.vertices, dtype=numpy.float32)
+            vertices[0::4] = numpy.frombuffer(self.pos_x, dtype=numpy.float32)[owner] + dx * cos_r - dy * sin_r
+            vertices[1::4] = numpy.frombuffer(self.pos_y, dtype=numpy.float32)[owner] + dx * sin_r + dy * cos_r
+        else:
+            cos_r = [math.cos(math.radians(r)) for r in self.rotation]
+            sin_r = [math.sin(math.radians(r)) for r in self.rotation]
+            pos_x, pos_y, vertices = self.pos_x, self.pos_y, self.vertices
+            for i, (owner, dx, dy) in enumerate(zip(self.vertex_owner, self.vertex_dx, self.vertex_dy)):
+                c = cos_r[owner]
+                s = sin_r[owner]
+                vertices[4 * i] = pos_x[owner] + dx * c - dy * s
+                vertices[4 * i + 1] = pos_y[owner] + dx * s + dy * c
+        self.mesh.vertices = self.vertices
+
+    def reset(self):
+        """Clear a pooled system before its next start()"""
+        self.stop()
+
     def stop(self):
         self.is_active = False
         Clock.unschedule(self.update)
-        for particle in self.particles:
-            self.remove_widget(particle)
-        self.particles = []
+        FramePacer().release(self)
+        self._reset_buffers()
+        self.count = 0
+        self.mesh.indices = []
+        self.mesh.vertices = []
+
+
+class ShaderConfettiSystem(ConfettiSystem):
+    """Confetti animated entirely on the GPU.
+
+    The motion is pure ballistics (constant gravity, x velocity and spin), so
+    each vertex carries its particle's initial state and the vertex shader
+    evaluates the closed form from a single elapsed-time uniform. The buffers
+    are uploaded once per start(); a frame only updates that uniform.
+    """
+    VERTEX_SHADER = """
+#ifdef GL_ES
+    precision highp float;
+#endif
+
+varying vec4 frag_color;
+varying vec2 tex_coord0;
+
+attribute vec2 vPosition;    /* offset from the particle center */
+attribute vec2 vTexCoords0;
+attribute vec2 vStart;       /* particle center at time 0 */
+attribute vec2 vVelocity;
+attribute vec2 vSpin;        /* start angle, angular speed (radians) */
+
+uniform mat4 modelview_mat;
+uniform mat4 projection_mat;
+uniform vec4 color;
+uniform float opacity;
+uniform float time;
+uniform float gravity;
+
+void main(void) {
+    float angle = vSpin.x + vSpin.y * time;
+    float c = cos(angle);
+    float s = sin(angle);
+    vec2 center = vStart + vVelocity * time + vec2(0.0, 0.5 * gravity * time * time);
+    vec2 pos = center + vec2(vPosition.x * c - vPosition.y * s,
+                             vPosition.x * s + vPosition.y * c);
+    frag_color = color * vec4(1.0, 1.0, 1.0, opacity);
+    tex_coord0 = vTexCoords0;
+    gl_Position = projection_mat * modelview_mat * vec4(pos, 0.0, 1.0);
+}
+"""
+    FRAGMENT_SHADER = """
+#ifdef GL_ES
+    precision highp float;
+#endif
 
+varying vec4 frag_color;
+varying vec2 tex_coord0;
 
-# ============== BELL SOUND ==============
-class BellSound:
-    """Ringing bell sound that increases duration per level"""
+uniform sampler2D texture0;
+
+void main(void) {
+    gl_FragColor = frag_color * texture2D(texture0, tex_coord0);
+}
+"""
+    VERTEX_FORMAT = [
+        (b'vPosition', 2, 'float'),
+        (b'vTexCoords0', 2, 'float'),
+        (b'vStart', 2, 'float'),
+        (b'vVelocity', 2, 'float'),
+        (b'vSpin', 2, 'float'),
+    ]
+
+    def _build_canvas(self):
+        self.elapsed = 0
+        self.death_times = []
+        self.render_context = RenderContext(use_parent_projection=True,
+                                            use_parent_modelview=True,
+                                            use_parent_frame_bufferid=True)
+        self.render_context.shader.fs = self.FRAGMENT_SHADER
+        self.render_context.shader.vs = self.VERTEX_SHADER
+        self.render_context['time'] = 0.0
+        self.render_context['gravity'] = float(self.gravity)
+        with self.render_context:
+            Color(1, 1, 1, 1)
+            self.mesh = Mesh(fmt=self.VERTEX_FORMAT, mode='triangles',
+                             texture=get_confetti_palette())
+        self.canvas.add(self.render_context)
+
+    @property
+    def shader_ok(self):
+        return bool(self.render_context.shader.success)
+
+    def _add_vertex(self, owner, dx, dy, u, v):
+        self.vertex_owner.append(owner)
+        self.vertices.extend((dx, dy, u, v,
+                              self.pos_x[owner], self.pos_y[owner],
+                              self.vel_x[owner], self.vel_y[owner],
+                              math.radians(self.rotation[owner]),
+                              math.radians(self.rotation_speed[owner])))
+        return len(self.vertex_owner) - 1
+
+    def start(self, num_confetti=50, num_medals=8):
+        super().start(num_confetti, num_medals)
+
+        # Solve y(t) - half_height = -50 for each particle; once the last one
+        # is below the screen the system is done
+        gravity = self.gravity
+        self.death_times = []
+        for y, vy, half_height in zip(self.pos_y, self.vel_y, self.half_height):
+            c = y - half_height + 50
+            self.death_times.append((-vy - math.sqrt(vy * vy - 2 * gravity * c)) / gravity)
+        self.death_times.sort()
+
+        self.elapsed = 0
+        self.render_context['time'] = 0.0
+        self.render_context['gravity'] = float(gravity)
+
+    def update(self, dt):
+        if not self.is_active:
+            return False
+
+        self.elapsed += dt
+        self.render_context['time'] = self.elapsed
+        self.count = len(self.death_times) - bisect.bisect_right(self.death_times, self.elapsed)
+
+        # Stop when all particles are gone
+        if not self.count:
+            self.is_active = False
+            FramePacer().release(self)
+            return False
+
+    def _update_vertices(self):
+        # Static for the whole celebration; uploaded once by start()
+        self.mesh.vertices = self.vertices
+
+
+CONFETTI_BACKEND = 'gpu'  # 'gpu' (ShaderConfettiSystem) or 'cpu' (ConfettiSystem)
+
+
+def create_confetti_system():
+    """Confetti using CONFETTI_BACKEND, falling back to the CPU engine if the shader fails"""
+    if CONFETTI_BACKEND == 'gpu':
+        confetti = ShaderConfettiSystem()
+        if confetti.shader_ok:
+            return confetti
+        print("Confetti shader unavailable, using CPU confetti")
+    return ConfettiSystem()
+
+
+# ============== SPRITE ATLAS ==============
+class SpriteAtlas:
+    """Gymnast poses, the ball, the bee and the medal pre-rendered into one
+    texture, so each draws as a single textured quad.
+
+    Frames are baked at quantized animation angles for the current SCALE by
+    drawing the vector shapes into an Fbo, a few per frame once the menu is
+    up (GL calls have to stay on the main thread). Converting the pixels and
+    caching them as a PNG per scale and app version happens on a worker
+    thread, which is also where later launches load them. Until the atlas is
+    ready, or if it can't be built, everything is vector drawn.
+    """
+    _instance = None
+    BAKE_BUDGET = 0.004  # Seconds of baking per frame
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
 
     def __init__(self):
-        self.sounds = {}  # Cache sounds per level
+        if self._initialized:
+            return
+        self._initialized = True
 
-    def _create_bell_sound_for_level(self, level):
-        """Create a ringing bell sound with duration based on level"""
-        import struct
-        import io
-        import wave
+        self.texture = None
+        self.regions = {}  # Sprite name -> TextureRegion per frame
+        self.layout = None
+        self.cache = None
+        self.path = None
+        self._fbo = None
+        self._frames = None  # Generator of frames left to bake
+
+    @property
+    def ready(self):
+        return self.texture is not None
+
+    def load(self, cache_dir):
+        """Load the cached atlas for this scale, or bake it; returns at once"""
+        self.layout = sprites.layout(GameSettings.SCALE, len(CONFETTI_PALETTE))
+        if self.layout is None:
+            print("Sprites don't fit in one texture at this scale; drawing them as shapes")
+            return
+        self.cache = sprites.AtlasCache(cache_dir)
+        self.path = self.cache.path_for(self.layout, __version__)
+        threading.Thread(target=lambda: self._on_pixels(self.cache.load(self.path, self.layout)),
+                         name='atlas-loader', daemon=True).start()
+
+    def bake(self):
+        """Bake the atlas for the current scale right away, without caching it"""
+        self.unload()
+        self.layout = sprites.layout(GameSettings.SCALE, len(CONFETTI_PALETTE))
+        if self.layout is None:
+            return False
+        self._start_bake()
+        for frame in self._frames:
+            self._draw_frame(*frame)
+        self._upload(sprites.unpremultiply(self._finish_bake()))
+        return True
+
+    def unload(self):
+        """Go back to vector drawing (for benchmarks at another scale)"""
+        self.texture = None
+        self.regions = {}
+
+    # ============== LOOKUP ==============
+    def frame(self, name, phase=0):
+        """(TextureRegion, sprites.Sprite) of the baked frame nearest to phase"""
+        regions = self.regions[name]
+        if len(regions) == 1:
+            return regions[0], self.layout.sprites[name]
+        frames, period, _ = sprites.SPRITES[name]
+        return regions[sprites.frame_index(phase, period, frames)], self.layout.sprites[name]
+
+    def texel_uv(self, name, index):
+        """Texture coordinates of the middle of a frame, for solid colors"""
+        uv = self.regions[name][index].tex_coords
+        return (uv[0] + uv[2]) / 2, (uv[1] + uv[5]) / 2
+
+    def swap_in(self, group, name, sprite_rect):
+        """Replace group's vector shapes with a quad of the sprite once the
+        atlas is ready; returns the quad's Rectangle (None until then)"""
+        if sprite_rect is not None or not self.ready:
+            return sprite_rect
+        region, sprite = self.frame(name)
+        group.clear()
+        group.add(Color(1, 1, 1, 1))
+        sprite_rect = Rectangle(texture=region, pos=(sprite.left, sprite.bottom),
+                                size=(sprite.width, sprite.height))
+        group.add(sprite_rect)
+        return sprite_rect
+
+    # ============== BAKING ==============
+    @mainthread
+    def _on_pixels(self, pixels):
+        if pixels is not None:
+            self._upload(pixels)
+            return
+        self._start_bake()
+        Clock.schedule_interval(self._bake_step, 0)
+
+    def _start_bake(self):
+        self._fbo = Fbo(size=(self.layout.width, self.layout.height), with_stencilbuffer=False)
+        with self._fbo:
+            PushMatrix()
+            self._cell = Translate(0, 0)
+            self._slot = InstructionGroup()
+            PopMatrix()
+        self._fbo.bind()
+        self._fbo.clear_buffer()
+        self._fbo.release()
+        self._frames = self._vector_frames()
+
+    def _bake_step(self, dt):
+        deadline = time.perf_counter() + self.BAKE_BUDGET
+        for frame in self._frames:
+            self._draw_frame(*frame)
+            if time.perf_counter() > deadline:
+                return
+        threading.Thread(target=self._store, args=(self._finish_bake(),),
+                         name='atlas-writer', daemon=True).start()
+        return False
 
+    def _draw_frame(self, name, index, canvas):
+        """Render canvas, drawn around its origin, into a frame's cell"""
+        sprite = self.layout.sprites[name]
+        x, y = sprite.frames[index]
+        self._cell.xy = (x - sprite.left, y - sprite.bottom)
+        self._slot.clear()
+        self._slot.add(canvas)
+        self._fbo.draw()
+
+    def _finish_bake(self):
+        pixels = self._fbo.pixels
+        self._slot.clear()
+        self._fbo = None
+        self._frames = None
+        return pixels
+
+    def _store(self, pixels):
+        pixels = sprites.unpremultiply(pixels)
+        self._on_pixels(pixels)
         try:
-            sample_rate = 44100
-
-            # Duration increases by 50% per level
-            # Level 1: 3 rings, Level 2: 4-5 rings, Level 3: 6-7 rings, etc.
-            base_rings = 3
-            duration_multiplier = 1.5 ** (level - 1)
-            num_rings = int(base_rings * duration_multiplier)
-            ring_spacing = 0.25
-
-            # Create ring times
-            ring_times = [i * ring_spacing for i in range(num_rings)]
-            total_duration = ring_times[-1] + 0.7  # Extra time for decay
-
-            all_samples = []
-            num_samples = int(sample_rate * total_duration)
-
-            for i in range(num_samples):
-                t = i / sample_rate
-                sample_value = 0
-
-                # Add each bell ring
-                for ring_start in ring_times:
-                    if t >= ring_start:
-                        ring_t = t - ring_start
-
-                        # Bell frequencies (creates metallic ringing sound)
-                        f1 = 1200  # High bell tone
-                        f2 = 1500  # Higher harmonic
-                        f3 = 800   # Lower resonance
-                        f4 = 2000  # Shimmer
-
-                        # Exponential decay for each ring
-                        decay = math.exp(-ring_t * 4)
-
-                        # Tremolo effect (ringing vibration)
-                        tremolo = 1 + 0.3 * math.sin(2 * math.pi * 12 * ring_t)
-
-                        # Combine frequencies for bell-like timbre
-                        ring_sample = (
-                            math.sin(2 * math.pi * f1 * ring_t) * 0.4 +
-                            math.sin(2 * math.pi * f2 * ring_t) * 0.25 +
-                            math.sin(2 * math.pi * f3 * ring_t) * 0.2 +
-                            math.sin(2 * math.pi * f4 * ring_t) * 0.15
-                        ) * decay * tremolo
-
-                        sample_value += ring_sample
-
-                # Normalize and convert to int16
-                sample_value = max(-1, min(1, sample_value * 0.5))
-                all_samples.append(int(sample_value * 32767))
-
-            # Create WAV file in memory
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(sample_rate)
-                for sample in all_samples:
-                    wav_file.writeframes(struct.pack('<h', sample))
-
-            # Save to temp file
+            self.cache.save(self.path, self.layout, pixels)
+            self.cache.evict(self.path)
+        except OSError as e:
+            print(f"Could not cache sprite atlas: {e}")
+
+    def _upload(self, pixels):
+        layout = self.layout
+        texture = Texture.create(size=(layout.width, layout.height), colorfmt='rgba')
+
+        def upload(texture):
+            texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+
+        upload(texture)
+        texture.add_reload_observer(upload)
+        self.regions = {name: [texture.get_region(x, y, sprite.width, sprite.height)
+                               for x, y in sprite.frames]
+                        for name, sprite in layout.sprites.items()}
+        self.texture = texture
+
+    def _vector_frames(self):
+        """(sprite name, frame, canvas drawing it around the origin) for every
+        frame, posed one at a time with the vector drawing code"""
+        s = GameSettings.SCALE
+
+        player = Player()
+        for i in range(sprites.WALK_FRAMES):
+            player.leg_angle = i * sprites.WALK_PERIOD / sprites.WALK_FRAMES
+            player.draw_side_view(s, 0)
+            yield 'side', i, player.canvas
+        player.draw_front_view(s, 0)
+        yield 'front', 0, player.canvas
+        player.draw_floor_standing(s, 0)
+        yield 'floor_standing', 0, player.canvas
+        # Unrotated, with the ponytail at each angle relative to the body
+        for name, build in (('flipping', player._build_flipping), ('cartwheel', player._build_cartwheel)):
+            pose = player._show_pose(name, build, s, 0)
+            for i in range(sprites.SPIN_FRAMES):
+                if 'lift' in pose:
+                    pose['lift'].y = 40 * s
+                pose['spin'].angle = 0
+                pose['ponytail'].angle = i * sprites.SPIN_PERIOD / sprites.SPIN_FRAMES
+                yield name, i, player.canvas
+
+        ball = BowlingBall()
+        ball.center = (0, 0)
+        ball.draw_ball()
+        yield 'ball', 0, ball.canvas
+
+        bee = Bee()
+        bee.center = (0, 0)
+        for i in range(sprites.WING_FRAMES):
+            bee.wing_angle = i * sprites.WING_PERIOD / sprites.WING_FRAMES
+            bee.draw_bee()
+            yield 'bee', i, bee.canvas
+
+        medal = ConfettiSystem()
+        width, height = ConfettiSystem.MEDAL_WIDTH * s, ConfettiSystem.MEDAL_HEIGHT * s
+        medal._spawn(-width / 2, -height / 2, width, height, is_medal=True)
+        medal.rotation[0] = 0
+        medal.mesh.indices = medal.all_indices
+        medal._update_vertices()
+        yield 'medal', 0, medal.canvas
+
+        for color, rgba in enumerate(CONFETTI_PALETTE):
+            texel = Canvas()
+            with texel:
+                Color(*rgba)
+                Rectangle(pos=(0, 0), size=(sprites.PALETTE_CELL, sprites.PALETTE_CELL))
+            yield 'palette', color, texel
+
+
+# ============== OBSTACLE BATCH ==============
+class ObstacleBatch(Widget):
+    """Every live ball and bee drawn through one Mesh textured with the
+    sprite atlas, so a frame is one draw call however many there are.
+
+    Obstacles aren't widgets here. Their closed-form motion parameters sit
+    in flat struct-of-arrays buffers, and each frame every position, spin
+    and wing frame is evaluated in a single pass (vectorized when NumPy is
+    available) straight into the interleaved x, y, u, v vertex buffer, four
+    vertices per obstacle. A removed obstacle's slot is filled with the
+    last one, so the buffers stay packed.
+
+    The Mesh keeps a pointer into the vertex array it is given, so that
+    array is never resized: it has room for a fixed number of obstacles,
+    the index list decides how many are drawn, and growing past it swaps
+    in a new, larger array.
+    """
+    MAX_OBSTACLES = 65536 // 4  # Mesh indices are unsigned shorts
+    CAPACITY = 16               # Obstacles the first vertex array holds
+    BALL, BEE = 0, 1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        atlas = SpriteAtlas()
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.mesh = Mesh(mode='triangles', texture=atlas.texture)
+
+        # Per kind: offset of the drawing origin (the center) from the
+        # simulation's bottom-left position, and the sprite's corners
+        # around it, bottom-left first and counterclockwise
+        self.half_size = ((GameSettings.BALL_RADIUS, GameSettings.BALL_RADIUS),
+                          ((GameSettings.BEE_WIDTH + 20) / 2, (GameSettings.BEE_HEIGHT + 25) / 2))
+        self.corners = []
+        for name in ('ball', 'bee'):
+            sprite = atlas.layout.sprites[name]
+            left, bottom = sprite.left, sprite.bottom
+            right, top = left + sprite.width, bottom + sprite.height
+            self.corners.append(((left, bottom), (right, bottom), (right, top), (left, top)))
+        # Texture coordinates: the ball, then each wing frame of the bee
+        self.uv_rows = [atlas.frame('ball')[0].tex_coords] + [
+            region.tex_coords for region in atlas.regions['bee']]
+        if numpy is not None:
+            self.np_half_size = numpy.array(self.half_size)
+            self.np_corners = numpy.array(self.corners)
+            self.np_uv_rows = numpy.array(self.uv_rows)
+
+        self.all_indices = array('H')
+        self.clear()
+
+    def clear(self):
+        self.items = []  # Simulation obstacle per slot
+        self.slots = {}  # Simulation obstacle -> slot
+        self.start_x = array('d')
+        self.start_y = array('d')
+        self.speed = array('d')
+        self.spawn_time = array('d')
+        self.kind = bytearray()
+        self.vertices = array('f', bytes(4 * 16 * self.CAPACITY))
+        self.indices_count = -1
+        self.mesh.indices = []
+        self.mesh.vertices = []
+
+    def add(self, obstacle):
+        if len(self.items) >= self.MAX_OBSTACLES:
+            return
+        self.slots[obstacle] = len(self.items)
+        self.items.append(obstacle)
+        self.start_x.append(obstacle.start_x)
+        self.start_y.append(obstacle.start_y)
+        self.speed.append(obstacle.speed)
+        self.spawn_time.append(obstacle.spawn_time)
+        self.kind.append(self.BEE if obstacle.kind == 'bee' else self.BALL)
+        if len(self.items) * 16 > len(self.vertices):
+            # A new array, never an in-place resize of the one the Mesh holds
+            self.vertices = self.vertices + array('f', bytes(4 * len(self.vertices)))
+
+    def remove(self, obstacle):
+        slot = self.slots.pop(obstacle, None)
+        if slot is None:
+            return
+        last = self.items.pop()
+        buffers = (self.start_x, self.start_y, self.speed, self.spawn_time, self.kind)
+        if last is not obstacle:
+            self.items[slot] = last
+            self.slots[last] = slot
+            for buffer in buffers:
+                buffer[slot] = buffer[-1]
+        for buffer in buffers:
+            buffer.pop()
+
+    def sync(self, t):
+        """Write every obstacle's quad as it is at time t"""
+        count = len(self.items)
+        if count != self.indices_count:
+            while len(self.all_indices) < 6 * count:
+                first = len(self.all_indices) // 6 * 4
+                self.all_indices.extend((first, first + 1, first + 2, first, first + 2, first + 3))
+            self.indices_count = count
+            if not count:
+                self.mesh.indices = []
+                self.mesh.vertices = []
+                return
+            self.mesh.indices = self.all_indices[:6 * count]
+        if not count:
+            return
+        if numpy is not None:
+            self._sync_numpy(t, count)
+        else:
+            self._sync_arrays(t)
+        self.mesh.vertices = self.vertices
+
+    def _sync_numpy(self, t, count):
+        kind = numpy.frombuffer(self.kind, dtype=numpy.uint8).astype(numpy.intp)
+        is_bee = kind == self.BEE
+        elapsed = t - numpy.frombuffer(self.spawn_time)
+        speed = numpy.frombuffer(self.speed)
+        half_size = self.np_half_size[kind]
+
+        # As Obstacle.x_at, BeeState.y_at, BallState.rotation_at and BeeState.wing_angle_at
+        center_x = numpy.frombuffer(self.start_x) - speed * elapsed + half_size[:, 0]
+        amplitude = BeeState.BOB_AMPLITUDE
+        bob = amplitude - numpy.abs((BeeState.BOB_SPEED * elapsed + amplitude) % (4 * amplitude)
+                                    - 2 * amplitude)
+        center_y = numpy.frombuffer(self.start_y) + half_size[:, 1] + numpy.where(is_bee, bob, 0)
+        radians = numpy.where(is_bee, 0, numpy.radians(-2 * speed * elapsed))
+        frames, period, _ = sprites.SPRITES['bee']
+        wing = numpy.rint(BeeState.WING_RATE * elapsed * frames / period).astype(numpy.intp) % frames
+        uv = self.np_uv_rows[numpy.where(is_bee, 1 + wing, 0)]
+
+        cos_r = numpy.cos(radians)[:, None]
+        sin_r = numpy.sin(radians)[:, None]
+        corners = self.np_corners[kind]
+        dx, dy = corners[:, :, 0], corners[:, :, 1]
+        vertices = numpy.frombuffer(self.vertices, dtype=numpy.float32, count=count * 16).reshape(count, 4, 4)
+        vertices[:, :, 0] = center_x[:, None] + dx * cos_r - dy * sin_r
+        vertices[:, :, 1] = center_y[:, None] + dx * sin_r + dy * cos_r
+        vertices[:, :, 2] = uv[:, 0::2]
+        vertices[:, :, 3] = uv[:, 1::2]
+
+    def _sync_arrays(self, t):
+        frames, period, _ = sprites.SPRITES['bee']
+        vertices = self.vertices
+        for slot, obstacle in enumerate(self.items):
+            kind = self.kind[slot]
+            half_w, half_h = self.half_size[kind]
+            x, y = obstacle.position_at(t)
+            center_x, center_y = x + half_w, y + half_h
+            if kind == self.BEE:
+                cos_r, sin_r = 1.0, 0.0
+                uv = self.uv_rows[1 + sprites.frame_index(obstacle.wing_angle_at(t), period, frames)]
+            else:
+                radians = math.radians(obstacle.rotation_at(t))
+                cos_r, sin_r = math.cos(radians), math.sin(radians)
+                uv = self.uv_rows[0]
+            base = slot * 16
+            for corner, (dx, dy) in enumerate(self.corners[kind]):
+                i = base + corner * 4
+                vertices[i] = center_x + dx * cos_r - dy * sin_r
+                vertices[i + 1] = center_y + dx * sin_r + dy * cos_r
+                vertices[i + 2] = uv[corner * 2]
+                vertices[i + 3] = uv[corner * 2 + 1]
+
+
+# ============== BELL SOUND ==============
+class BellSound:
+    """Ringing bell sound that increases duration per level.
+
+    Bells are synthesized on a worker thread and loaded back on the Kivy
+    main thread as they finish, so play() never waits for synthesis. The
+    WAV files persist in cache_dir, so later launches skip synthesis.
+    """
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
             import tempfile
-            import os
-            temp_dir = tempfile.gettempdir()
-            sound_path = os.path.join(temp_dir, f'bell_sound_level{level}.wav')
+            cache_dir = os.path.join(tempfile.gettempdir(), 'balance_beam_sounds')
+        self.cache = audio.BellCache(cache_dir)
+        self.sounds = {}  # Cache sounds per level
+        self.requested = set()  # Levels queued or being synthesized
+        self.play_when_ready = None  # Level to play as soon as it loads
+        self.jobs = queue.Queue()
+        self.worker = None
+
+    def warm_up(self, levels):
+        """Queue every level's bell for background synthesis"""
+        levels = list(levels)
+        for level in levels:
+            self._request(level)
+        # Then drop files left over from older synthesis parameters
+        self._run_in_worker(lambda: self.cache.evict(levels))
+
+    def _request(self, level):
+        if level in self.sounds or level in self.requested:
+            return
+        self.requested.add(level)
+        self._run_in_worker(lambda: self._on_bell_synthesized(level, self._bell_file(level)))
 
-            with open(sound_path, 'wb') as f:
-                f.write(wav_buffer.getvalue())
+    def _run_in_worker(self, job):
+        self.jobs.put(job)
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, name='bell-synth', daemon=True)
+            self.worker.start()
 
-            # Load with Kivy
-            sound = SoundLoader.load(sound_path)
-            if sound:
-                sound.volume = 0.8
-            return sound
+    def _work(self):
+        while True:
+            self.jobs.get()()
 
+    def _bell_file(self, level):
+        """Path of the level's bell WAV, synthesizing it on a cache miss"""
+        try:
+            return self.cache.bell_path(level)
         except Exception as e:
             print(f"Could not create bell sound: {e}")
             return None
 
+    @mainthread
+    def _on_bell_synthesized(self, level, sound_path):
+        # Load with Kivy
+        sound = SoundLoader.load(sound_path) if sound_path else None
+        if sound:
+            sound.volume = 0.8
+        self.sounds[level] = sound
+        self.requested.discard(level)
+
+        if self.play_when_ready == level:
+            self.play_when_ready = None
+            if sound:
+                sound.play()
+
     def play(self, level=1):
         if level not in self.sounds:
-            self.sounds[level] = self._create_bell_sound_for_level(level)
+            # Not synthesized yet: ring the longest bell that is ready, or
+            # ring this one as soon as the worker finishes it
+            self._request(level)
+            ready = [lv for lv, sound in self.sounds.items() if sound and lv < level]
+            if not ready:
+                self.play_when_ready = level
+                return
+            level = max(ready)
 
         if self.sounds[level]:
             self.sounds[level].play()
 
 
+# ============== PROFILER OVERLAY ==============
+# One color per profiler phase, in PHASES order
+PROFILER_COLORS = (
+    (0.9, 0.6, 0.1, 0.9),   # spawn
+    (0.2, 0.8, 0.2, 0.9),   # player
+    (0.3, 0.5, 1.0, 0.9),   # obstacles
+    (1.0, 0.3, 0.3, 0.9),   # collision
+    (0.7, 0.7, 0.7, 0.9),   # background
+    (0.8, 0.4, 0.9, 0.9),   # hud
+)
+
+
+class ProfilerOverlay(Widget):
+    """Live stacked graph of the most recent frames, one bar per frame.
+
+    Each phase is one Mesh of quads whose vertices are rewritten a few
+    times per second; the red line is the 60 Hz frame budget.
+    """
+    COLUMNS = 120
+    REFRESH_INTERVAL = 0.1
+
+    def __init__(self, profiler, **kwargs):
+        super().__init__(**kwargs)
+        self.profiler = profiler
+        s = GameSettings.SCALE
+        self.bar_width = 3 * s
+        self.budget_height = 80 * s
+        self.graph_x = 10 * s
+        self.graph_y = Window.height - self.budget_height * 1.5 - 10 * s
+
+        indices = []
+        for column in range(self.COLUMNS):
+            i = column * 4
+            indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+
+        with self.canvas:
+            Color(0, 0, 0, 0.5)
+            Rectangle(pos=(self.graph_x, self.graph_y),
+                      size=(self.bar_width * self.COLUMNS, self.budget_height * 1.5))
+            self.meshes = []
+            for color in PROFILER_COLORS:
+                Color(*color)
+                self.meshes.append(Mesh(mode='triangles', indices=indices))
+            Color(1, 0, 0, 0.8)
+            budget_y = self.graph_y + self.budget_height
+            Line(points=[self.graph_x, budget_y, self.graph_x + self.bar_width * self.COLUMNS, budget_y])
+
+        self.legend = Label(font_size=f'{int(11 * s)}sp', halign='left', valign='top',
+                            color=Colors.WHITE)
+        self.legend.size = (200 * s, self.budget_height * 1.5)
+        self.legend.text_size = self.legend.size
+        self.legend.pos = (self.graph_x + self.bar_width * self.COLUMNS + 10 * s, self.graph_y)
+        self.add_widget(self.legend)
+
+        Clock.schedule_interval(self.refresh, self.REFRESH_INTERVAL)
+
+    def refresh(self, dt):
+        rows = self.profiler.rows(self.COLUMNS)
+        scale = self.budget_height / FRAME_BUDGET_NS
+        bottoms = [self.graph_y] * len(rows)
+        for phase, mesh in enumerate(self.meshes):
+            vertices = []
+            for column, row in enumerate(rows):
+                x = self.graph_x + column * self.bar_width
+                y = bottoms[column]
+                top = min(y + row[phase] * scale, self.graph_y + self.budget_height * 1.5)
+                bottoms[column] = top
+                vertices.extend((x, y, 0, 0, x + self.bar_width, y, 0, 0,
+                                 x + self.bar_width, top, 0, 0, x, top, 0, 0))
+            # Columns not filled yet collapse to nothing
+            vertices.extend([0] * (16 * (self.COLUMNS - len(rows))))
+            mesh.vertices = vertices
+
+        summary = self.profiler.summary()
+        if summary:
+            lines = [f"{name}: {summary[name]['mean_ms']:.2f} ms" for name in PHASES]
+            lines.append(f"frame: {summary['total']['mean_ms']:.2f} ms "
+                         f"(max {summary['total']['max_ms']:.1f})")
+            self.legend.text = '\n'.join(lines)
+
+    def dismiss(self):
+        Clock.unschedule(self.refresh)
+        if self.parent:
+            self.parent.remove_widget(self)
+
+
 # ============== GAME SCREEN ==============
 class GameScreen(Screen):
     def __init__(self, **kwargs):
@@ -1155,120 +2237,225 @@ class GameScreen(Screen):
 
 
 class GameWidget(Widget):
+    KEEP_RECORDINGS = 20
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.game_manager = GameManager()
+        self.sim = None
         self.player = None
-        self.balls = []
-        self.bees = []
+        self.obstacles = {}  # Simulation obstacle -> the widget drawing it
+        self.obstacle_batch = None  # Draws every obstacle instead, once the sprite atlas is ready
+        self.stepper = FixedStepper()
+        # One seeded RNG per session; each attempt gets its own seed from it
+        session_seed = int(SEED_OPTION) if SEED_OPTION else random.SystemRandom().getrandbits(32)
+        self.rng = random.Random(session_seed)
+        self.recording = None
+        self.replay_input = None
+        self.pending_replay = None  # Recording to play on the next start_game
+        self.profiler = None
         self.is_active = False
         self.is_game_over = False
         self.is_level_complete = False
-        self.is_invincible = False
-
-        self.ball_timer = 0
-        self.bee_timer = 0
-        self.balls_spawned = 0
-        self.bees_spawned = 0
         self.confetti = None
 
+        # Recycled between spawns, retries and levels
+        self.player_pool = ObjectPool(Player)
+        self.ball_pool = ObjectPool(BowlingBall)
+        self.bee_pool = ObjectPool(Bee)
+        self.confetti_pool = ObjectPool(create_confetti_system)
+
         self.beam_width = 0
         self.beam_left = 0
         self.beam_right = 0
         self.beam_top = GameSettings.BEAM_Y_POSITION + GameSettings.BEAM_HEIGHT
+        self.background_key = None
 
-        # UI elements
+        # UI elements, built on first use and reused by every round after
         self.score_label = None
         self.lives_label = None
         self.level_label = None
-
-        # Bind touch
-        Window.bind(on_touch_down=self.on_touch)
+        self.level_complete_overlay = None
+        self.game_over_overlay = None
+        # They're placed for the window size, and moved again when it changes
+        Window.bind(size=self.layout_ui)
 
     def start_game(self):
         # Clean up confetti if exists
         if self.confetti:
             self.confetti.stop()
+            self.confetti.parent.remove_widget(self.confetti)
+            self.confetti_pool.release(self.confetti)
             self.confetti = None
 
+        # Hand last round's objects back to their pools
+        if self.player:
+            self.player_pool.release(self.player)
+            self.player = None
+        for obstacle in self.obstacles:
+            self.release_obstacle(obstacle)
+        self.obstacles = {}
+        if self.obstacle_batch is not None:
+            self.obstacle_batch.clear()
+
         self.clear_widgets()
         self.canvas.clear()
 
-        # Calculate beam dimensions
-        self.beam_width = Window.width - 40
-        self.beam_left = 20
-        self.beam_right = Window.width - 20
-
-        # Reset game state
-        level_config = self.game_manager.get_level_config()
-        self.balls_spawned = 0
-        self.bees_spawned = 0
-        self.ball_timer = level_config["ball_interval"] / 2
-        self.bee_timer = level_config["bee_interval"] / 2
+        # New attempt, recorded tap by tap unless it is itself a replay
+        self.finish_recording()
+        if self.pending_replay:
+            recording = self.pending_replay
+            self.pending_replay = None
+            self.game_manager.current_level = recording.level
+            self.game_manager.lives = recording.lives
+            self.replay_input = ReplayInput(recording)
+            self.recording = None
+        else:
+            recording = Recording(self.game_manager.current_level, self.rng.getrandbits(32),
+                                  Window.width, Window.height, self.game_manager.lives)
+            recording.started_at = time.time()
+            self.replay_input = None
+            self.recording = recording
+
+        # The beam dimensions come from the simulation
+        self.sim = recording.simulation()
+        self.sim.profiler = self.profiler
+        self.beam_width = self.sim.beam_width
+        self.beam_left = self.sim.beam_left
+        self.beam_right = self.sim.beam_right
+        self.beam_top = self.sim.beam_top
         self.is_active = True
         self.is_game_over = False
         self.is_level_complete = False
-        self.is_invincible = False
-
-        # Clear old objects
-        self.balls = []
-        self.bees = []
 
         # Create player
-        self.player = Player()
-        start_x = self.beam_left + 20
-        start_y = self.beam_top
-        self.player.pos = (start_x, start_y)
+        state = self.sim.player
+        self.player = self.player_pool.acquire(pos=(state.x, state.y))
         self.add_widget(self.player)
 
+        # One mesh for all obstacles once the atlas is baked, pooled widgets until then
+        if self.obstacle_batch is None and SpriteAtlas().ready:
+            self.obstacle_batch = ObstacleBatch()
+        if self.obstacle_batch is not None:
+            self.add_widget(self.obstacle_batch)
+
         # Create UI
         self.create_ui()
 
-        # Start game loop
-        Clock.schedule_interval(self.update, 1/60)
-
-    def stop_game(self):
+        # Start game loop: draw every frame, simulate in fixed ticks
+        self.stepper.reset()
         Clock.unschedule(self.update)
-        Clock.unschedule(self.update_flip_animation)
+        Clock.schedule_interval(self.update, 0)
+        Window.unbind(on_touch_down=self.on_touch)
+        Window.bind(on_touch_down=self.on_touch)
+        FramePacer().hold(self)
+
+    def end_round(self):
+        """Stop the game loop and stop listening for jumps"""
         self.is_active = False
+        Clock.unschedule(self.update)
+        Window.unbind(on_touch_down=self.on_touch)
+
+    def stop_game(self):
+        self.end_round()
+        Clock.unschedule(self.update_transition_animation)
+        if self.confetti:
+            self.confetti.stop()
+        FramePacer().release(self)
+        self.finish_recording()
+
+    def replay(self, recording):
+        """Play a Recording back on the next start_game instead of taking touches"""
+        self.pending_replay = recording
+
+    def finish_recording(self):
+        """Save the current attempt's recording to the app's replays folder and history"""
+        recording = self.recording
+        self.recording = None
+        if recording is None:
+            return
+        recording.finish(self.sim)
+        self.game_manager.record_attempt(recording.level, self.sim, recording.seed, recording.started_at)
+        app = App.get_running_app()
+        if app is None:
+            return
+        directory = os.path.join(app.user_data_dir, 'replays')
+        try:
+            os.makedirs(directory, exist_ok=True)
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-level{recording.level}-{recording.seed}.json"
+            recording.save(os.path.join(directory, name))
+
+            # Keep only the most recent attempts
+            names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+            for name in names[:-self.KEEP_RECORDINGS]:
+                os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+    def pool_stats(self):
+        """Hit/miss counters for every object pool, keyed by pool name"""
+        return {
+            'player': self.player_pool.stats(),
+            'ball': self.ball_pool.stats(),
+            'bee': self.bee_pool.stats(),
+            'confetti': self.confetti_pool.stats(),
+        }
 
     def create_ui(self):
+        if self.level_label is None:
+            self.build_hud()
+        if self.game_manager.is_endless:
+            self.level_label.text = "Endless"
+        else:
+            self.level_label.text = f"Level {self.game_manager.current_level}"
+        self.update_ui()
+        self.add_widget(self.level_label)
+        self.add_widget(self.score_label)
+        self.add_widget(self.lives_label)
+
+    def build_hud(self):
         s = GameSettings.SCALE
         font_large = f'{int(28 * s)}sp'
         font_medium = f'{int(22 * s)}sp'
 
         # Level label
         self.level_label = Label(
-            text=f"Level {self.game_manager.current_level}",
             font_size=font_large,
             bold=True,
             color=Colors.BLACK,
-            pos=(Window.width/2 - 75*s, Window.height - 70*s),
             size=(150*s, 50*s)
         )
-        self.add_widget(self.level_label)
 
         # Score label
         self.score_label = Label(
-            text=f"Score: {self.game_manager.score}",
             font_size=font_medium,
             color=Colors.BLACK,
-            pos=(20, Window.height - 70*s),
             size=(150*s, 50*s),
             halign='left'
         )
-        self.add_widget(self.score_label)
 
         # Lives label
         self.lives_label = Label(
-            text=f"Lives: {'❤️' * self.game_manager.lives}",
             font_size=font_medium,
             color=Colors.BLACK,
-            pos=(Window.width - 180*s, Window.height - 70*s),
             size=(170*s, 50*s),
             halign='right'
         )
-        self.add_widget(self.lives_label)
+        self.layout_hud()
+
+    def layout_ui(self, *args):
+        """Move the HUD and overlays to fit the window; bound to Window.size"""
+        self.layout_hud()
+        self.layout_level_complete_ui()
+        self.layout_game_over_ui()
+
+    def layout_hud(self):
+        if self.level_label is None:
+            return
+        s = GameSettings.SCALE
+        self.level_label.pos = (Window.width/2 - 75*s, Window.height - 70*s)
+        self.score_label.pos = (20, Window.height - 70*s)
+        self.lives_label.pos = (Window.width - 180*s, Window.height - 70*s)
 
     def update_ui(self):
         if self.score_label:
@@ -1277,6 +2464,14 @@ class GameWidget(Widget):
             self.lives_label.text = f"Lives: {'❤️' * self.game_manager.lives}{'🖤' * (GameSettings.INITIAL_LIVES - self.game_manager.lives)}"
 
     def draw_background(self):
+        # The scene never moves, so its instructions are kept in canvas.before
+        # and only re-emitted when the window size or scale changes
+        key = (Window.width, Window.height, GameSettings.SCALE,
+               self.beam_left, self.beam_right, self.beam_top)
+        if key == self.background_key:
+            return
+        self.background_key = key
+
         s = GameSettings.SCALE
         with self.canvas.before:
             self.canvas.before.clear()
@@ -1333,128 +2528,112 @@ class GameWidget(Widget):
         if not self.is_active or self.is_game_over or self.is_level_complete:
             return
 
-        self.draw_background()
-
-        level_config = self.game_manager.get_level_config()
-
-        # Update player
-        self.player.x += GameSettings.PLAYER_WALK_SPEED * dt
-        self.player.update(dt, self.beam_top)
-
-        # Check finish line
-        if self.player.x >= self.beam_right - 50:
-            self.level_complete()
-            return
-
-        # Spawn obstacles
-        self.ball_timer += dt
-        if self.ball_timer >= level_config["ball_interval"] and self.balls_spawned < level_config["ball_count"]:
-            self.spawn_ball(level_config["ball_speed"])
-            self.ball_timer = 0
-            self.balls_spawned += 1
-
-        self.bee_timer += dt
-        if self.bee_timer >= level_config["bee_interval"] and self.bees_spawned < level_config["bee_count"]:
-            self.spawn_bee()
-            self.bee_timer = 0
-            self.bees_spawned += 1
-
-        # Update balls
-        for ball in self.balls[:]:
-            ball.update(dt)
-            if ball.x < -50:
-                self.remove_widget(ball)
-                self.balls.remove(ball)
-            elif not self.is_invincible and self.check_collision_circle_rect(ball.get_collision_circle(), self.player.get_collision_rect()):
-                self.player_hit()
+        prof = self.profiler
+        if prof is None:
+            self.run_frame(dt, None)
+        else:
+            prof.begin_frame()
+            self.run_frame(dt, prof)
+            prof.end_frame()
 
-        # Update bees
-        for bee in self.bees[:]:
-            bee.update(dt)
-            if bee.x < -50:
-                self.remove_widget(bee)
-                self.bees.remove(bee)
-            elif not self.is_invincible and self.check_collision_circles(bee.get_collision_circle(),
-                    (self.player.center_x, self.player.center_y, GameSettings.PLAYER_RADIUS)):
+    def run_frame(self, dt, prof):
+        self.draw_background()
+        if prof is not None:
+            prof.lap(BACKGROUND)
+
+        for _ in range(self.stepper.advance(dt)):
+            if self.replay_input:
+                self.replay_input.feed(self.sim)
+            events = self.sim.step(TICK)
+            if events:
+                self.handle_events(events, prof)
+            if self.sim.outcome:
+                self.finish_recording()
+                self.game_manager.flush()  # Level boundary: save data and this level's attempts
+                return
+
+        # Draw between the last two ticks so motion stays smooth at any refresh rate
+        alpha = self.stepper.alpha
+        self.player.sync(self.sim.player, alpha)
+        if prof is not None:
+            prof.lap(PLAYER)
+        # Obstacles move in closed form, so they are drawn at the exact moment
+        render_time = self.sim.time - (1 - alpha) * TICK
+        if self.obstacle_batch is not None:
+            self.obstacle_batch.sync(render_time)
+        for obstacle, widget in self.obstacles.items():
+            widget.sync(obstacle, render_time)
+        if prof is not None:
+            prof.lap(OBSTACLES)
+
+    def handle_events(self, events, prof=None):
+        """Mirror one simulation tick's events into the widgets"""
+        for name, obj in events:
+            if name == 'spawn':
+                self.spawn_obstacle(obj)
+                phase = SPAWN
+            elif name == 'despawn':
+                self.despawn_obstacle(obj)
+                phase = SPAWN
+            elif name == 'hit':
                 self.player_hit()
-
-    def check_collision_circle_rect(self, circle, rect):
-        cx, cy, cr = circle
-        rx, ry, rw, rh = rect
-
-        closest_x = max(rx, min(cx, rx + rw))
-        closest_y = max(ry, min(cy, ry + rh))
-
-        distance = math.sqrt((cx - closest_x) ** 2 + (cy - closest_y) ** 2)
-        return distance < cr
-
-    def check_collision_circles(self, c1, c2):
-        x1, y1, r1 = c1
-        x2, y2, r2 = c2
-        distance = math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-        return distance < (r1 + r2)
-
-    def spawn_ball(self, speed):
-        ball = BowlingBall(speed=speed)
-        ball.pos = (Window.width + 10, self.beam_top)
-        self.add_widget(ball)
-        self.balls.append(ball)
-
-    def spawn_bee(self):
-        bee = Bee()
-        min_y = self.beam_top + 50
-        max_y = Window.height - 150
-        bee.pos = (Window.width + 10, random.uniform(min_y, max_y))
-        self.add_widget(bee)
-        self.bees.append(bee)
-
-    def player_hit(self):
-        if self.is_invincible:
+                phase = HUD
+            elif name == 'cleared':
+                self.game_manager.add_points(GameSettings.POINTS_PER_OBSTACLE)
+                self.update_ui()
+                phase = HUD
+            elif name == 'complete':
+                self.player.sync(self.sim.player)
+                self.level_complete()
+                phase = HUD
+            elif name == 'game_over':
+                self.game_over()
+                phase = HUD
+            if prof is not None:
+                prof.lap(phase)
+
+    def set_profiler(self, profiler):
+        """Charge this widget's frames to a profiler.FrameProfiler (None to stop)"""
+        self.profiler = profiler
+        if self.sim:
+            self.sim.profiler = profiler
+
+    def spawn_obstacle(self, obstacle):
+        if self.obstacle_batch is not None:
+            self.obstacle_batch.add(obstacle)
+            return
+        pool = self.ball_pool if obstacle.kind == 'ball' else self.bee_pool
+        widget = pool.acquire(pos=obstacle.position_at(self.sim.time))
+        self.add_widget(widget)
+        self.obstacles[obstacle] = widget
+
+    def despawn_obstacle(self, obstacle):
+        if obstacle not in self.obstacles:
+            self.obstacle_batch.remove(obstacle)
             return
+        self.remove_widget(self.obstacles[obstacle])
+        self.release_obstacle(obstacle)
+        del self.obstacles[obstacle]
 
-        self.is_invincible = True
-        Clock.schedule_once(lambda dt: setattr(self, 'is_invincible', False), 1.5)
+    def release_obstacle(self, obstacle):
+        pool = self.ball_pool if obstacle.kind == 'ball' else self.bee_pool
+        pool.release(self.obstacles[obstacle])
 
-        # Flash player
+    def player_hit(self):
+        # Flash player while the simulation keeps them invincible
+        flash_time = Simulation.INVINCIBLE_TIME
         anim = Animation(opacity=0.3, duration=0.1) + Animation(opacity=1, duration=0.1)
         anim.repeat = True
         anim.start(self.player)
-        Clock.schedule_once(lambda dt: Animation.cancel_all(self.player), 1.5)
-        Clock.schedule_once(lambda dt: setattr(self.player, 'opacity', 1), 1.5)
+        Clock.schedule_once(lambda dt: Animation.cancel_all(self.player), flash_time)
+        Clock.schedule_once(lambda dt: setattr(self.player, 'opacity', 1), flash_time)
 
-        still_alive = self.game_manager.lose_life()
+        self.game_manager.lose_life()
         self.update_ui()
 
-        if not still_alive:
-            self.game_over()
-        else:
-            self.reset_player_position()
-
-    def reset_player_position(self):
-        self.player.pos = (self.beam_left + 20, self.beam_top)
-        self.player.velocity_y = 0
-        self.player.is_jumping = False
-        self.player.is_on_ground = True
-
-        # Reset spawning
-        level_config = self.game_manager.get_level_config()
-        self.balls_spawned = 0
-        self.bees_spawned = 0
-        self.ball_timer = level_config["ball_interval"] / 2
-        self.bee_timer = level_config["bee_interval"] / 2
-
-        # Remove obstacles
-        for ball in self.balls[:]:
-            self.remove_widget(ball)
-        self.balls.clear()
-
-        for bee in self.bees[:]:
-            self.remove_widget(bee)
-        self.bees.clear()
-
     def level_complete(self):
         self.is_level_complete = True
-        self.is_active = False
+        self.end_round()
 
         # Calculate floor Y position (below the beam)
         s = GameSettings.SCALE
@@ -1463,20 +2642,32 @@ class GameWidget(Widget):
         # Start the flip DOWN to floor
         self.player.start_flip(callback=self.on_flip_down_complete, flip_down=True, target_y=self.floor_y)
 
-        # Schedule animation updates
-        Clock.schedule_interval(self.update_transition_animation, 1/60)
+        # Schedule animation updates, stepped at the same fixed tick as the game
+        self.stepper.reset()
+        Clock.schedule_interval(self.update_transition_animation, 0)
 
     def update_transition_animation(self, dt):
         """Update all transition animations"""
-        # Update whichever animation is active
-        if self.player.is_flipping or self.player.is_flipping_up:
-            self.player.update_flip(dt)
-        elif self.player.is_floor_exercise:
-            self.player.update_floor_exercise(dt)
+        prof = self.profiler
+        if prof is not None:
+            prof.begin_frame()
+
+        for _ in range(self.stepper.advance(dt)):
+            # Update whichever animation is active
+            if self.player.is_flipping or self.player.is_flipping_up:
+                self.player.update_flip(TICK)
+            elif self.player.is_floor_exercise:
+                self.player.update_floor_exercise(TICK)
 
         self.draw_background()
+        if prof is not None:
+            prof.lap(BACKGROUND)
         self.player.draw_player()
 
+        if prof is not None:
+            prof.lap(PLAYER)
+            prof.end_frame()
+
     def on_flip_down_complete(self):
         """Called when flip down to floor is complete"""
         # Start floor exercise (cartwheels) back to the beginning
@@ -1491,25 +2682,49 @@ class GameWidget(Widget):
 
     def on_flip_up_complete(self):
         """Called when flip up to beam is complete"""
-        # Stop the transition animation loop
+        # Stop the transition animation loop; only the confetti moves from here
         Clock.unschedule(self.update_transition_animation)
+        FramePacer().release(self)
 
         # Now complete the level
         self.game_manager.complete_level()
         self.update_ui()
 
         # Play bell sound (longer for higher levels)
-        bell = BellSound()
-        bell.play(level=self.game_manager.current_level)
+        app = App.get_running_app()
+        if app:
+            app.bells.play(level=self.game_manager.current_level)
 
         self.show_level_complete_ui()
 
     def game_over(self):
         self.is_game_over = True
-        self.is_active = False
+        self.end_round()
+        FramePacer().release(self)
         self.show_game_over_ui()
 
     def show_level_complete_ui(self):
+        if self.level_complete_overlay is None:
+            self.build_level_complete_ui()
+        overlay = self.level_complete_overlay
+
+        # Level complete text
+        if self.game_manager.current_level >= GameSettings.TOTAL_LEVELS:
+            self.level_title_label.text = "You Won!"
+            self.level_subtitle_label.text = "Congratulations! All levels complete!"
+            self.continue_btn.text = "Play Again"
+        else:
+            self.level_title_label.text = "Level Complete!"
+            self.level_subtitle_label.text = f"+{GameSettings.POINTS_PER_LEVEL} points!"
+            self.continue_btn.text = "Next Level"
+        self.add_widget(overlay)
+
+        # Start confetti with medals, above the dimming but below the text
+        self.confetti = self.confetti_pool.acquire()
+        overlay.add_widget(self.confetti, index=len(overlay.children))
+        self.confetti.start(num_confetti=60, num_medals=10)
+
+    def build_level_complete_ui(self):
         s = GameSettings.SCALE
         btn_width = 220 * s
         btn_height = 65 * s
@@ -1518,73 +2733,63 @@ class GameWidget(Widget):
         overlay = Widget()
         with overlay.canvas:
             Color(0, 0, 0, 0.5)
-            Rectangle(pos=(0, 0), size=Window.size)
-        self.add_widget(overlay)
-
-        # Start confetti with medals!
-        self.confetti = ConfettiSystem()
-        self.add_widget(self.confetti)
-        self.confetti.start(num_confetti=60, num_medals=10)
-
-        # Level complete text
-        current_level = self.game_manager.current_level
-        if current_level >= GameSettings.TOTAL_LEVELS:
-            title = "You Won!"
-            subtitle = "Congratulations! All levels complete!"
-        else:
-            title = "Level Complete!"
-            subtitle = f"+{GameSettings.POINTS_PER_LEVEL} points!"
+            self.level_complete_dim = Rectangle(pos=(0, 0))
 
-        title_label = Label(
-            text=title,
+        self.level_title_label = Label(
             font_size=f'{int(42 * s)}sp',
             bold=True,
-            color=Colors.WHITE,
-            center=(Window.width/2, Window.height/2 + 120*s)
+            color=Colors.WHITE
         )
-        self.add_widget(title_label)
+        overlay.add_widget(self.level_title_label)
 
-        subtitle_label = Label(
-            text=subtitle,
+        self.level_subtitle_label = Label(
             font_size=f'{int(28 * s)}sp',
-            color=Colors.BEE_YELLOW,
-            center=(Window.width/2, Window.height/2 + 60*s)
+            color=Colors.BEE_YELLOW
         )
-        self.add_widget(subtitle_label)
+        overlay.add_widget(self.level_subtitle_label)
 
-        # Buttons
-        if current_level < GameSettings.TOTAL_LEVELS:
-            next_btn = Button(
-                text="Next Level",
-                font_size=f'{int(26 * s)}sp',
-                size=(btn_width, btn_height),
-                pos=(Window.width/2 - btn_width/2, Window.height/2 - 30*s),
-                background_color=Colors.BUTTON_GREEN
-            )
-            next_btn.bind(on_press=self.next_level)
-            self.add_widget(next_btn)
-        else:
-            play_again_btn = Button(
-                text="Play Again",
-                font_size=f'{int(26 * s)}sp',
-                size=(btn_width, btn_height),
-                pos=(Window.width/2 - btn_width/2, Window.height/2 - 30*s),
-                background_color=Colors.BUTTON_GREEN
-            )
-            play_again_btn.bind(on_press=self.restart_game)
-            self.add_widget(play_again_btn)
+        # Buttons: Next Level, or Play Again after the last level
+        self.continue_btn = Button(
+            font_size=f'{int(26 * s)}sp',
+            size=(btn_width, btn_height),
+            background_color=Colors.BUTTON_GREEN
+        )
+        self.continue_btn.bind(on_press=self.continue_after_level)
+        overlay.add_widget(self.continue_btn)
 
-        menu_btn = Button(
+        self.level_menu_btn = Button(
             text="Main Menu",
             font_size=f'{int(26 * s)}sp',
             size=(btn_width, btn_height),
-            pos=(Window.width/2 - btn_width/2, Window.height/2 - 110*s),
             background_color=Colors.BUTTON_ORANGE
         )
-        menu_btn.bind(on_press=self.go_to_menu)
-        self.add_widget(menu_btn)
+        self.level_menu_btn.bind(on_press=self.go_to_menu)
+        overlay.add_widget(self.level_menu_btn)
+
+        self.level_complete_overlay = overlay
+        self.layout_level_complete_ui()
+
+    def layout_level_complete_ui(self):
+        if self.level_complete_overlay is None:
+            return
+        s = GameSettings.SCALE
+        center_x, center_y = Window.width/2, Window.height/2
+        self.level_complete_dim.size = Window.size
+        self.level_title_label.center = (center_x, center_y + 120*s)
+        self.level_subtitle_label.center = (center_x, center_y + 60*s)
+        self.continue_btn.pos = (center_x - self.continue_btn.width/2, center_y - 30*s)
+        self.level_menu_btn.pos = (center_x - self.level_menu_btn.width/2, center_y - 110*s)
 
     def show_game_over_ui(self):
+        if self.game_over_overlay is None:
+            self.build_game_over_ui()
+
+        messages = ["Nice try!", "Keep practicing!", "You can do it!", "Almost there!"]
+        self.final_score_label.text = f"Score: {self.game_manager.score}"
+        self.message_label.text = self.rng.choice(messages)
+        self.add_widget(self.game_over_overlay)
+
+    def build_game_over_ui(self):
         s = GameSettings.SCALE
         btn_width = 220 * s
         btn_height = 65 * s
@@ -1593,103 +2798,87 @@ class GameWidget(Widget):
         overlay = Widget()
         with overlay.canvas:
             Color(0, 0, 0, 0.6)
-            Rectangle(pos=(0, 0), size=Window.size)
-        self.add_widget(overlay)
+            self.game_over_dim = Rectangle(pos=(0, 0))
 
         # Game over text
-        title_label = Label(
+        self.game_over_title_label = Label(
             text="Game Over",
             font_size=f'{int(46 * s)}sp',
             bold=True,
-            color=Colors.BUTTON_RED,
-            center=(Window.width/2, Window.height/2 + 120*s)
+            color=Colors.BUTTON_RED
         )
-        self.add_widget(title_label)
+        overlay.add_widget(self.game_over_title_label)
 
-        score_label = Label(
-            text=f"Score: {self.game_manager.score}",
+        self.final_score_label = Label(
             font_size=f'{int(30 * s)}sp',
-            color=Colors.WHITE,
-            center=(Window.width/2, Window.height/2 + 50*s)
+            color=Colors.WHITE
         )
-        self.add_widget(score_label)
+        overlay.add_widget(self.final_score_label)
 
-        messages = ["Nice try!", "Keep practicing!", "You can do it!", "Almost there!"]
-        message_label = Label(
-            text=random.choice(messages),
+        self.message_label = Label(
             font_size=f'{int(24 * s)}sp',
-            color=Colors.WHITE,
-            center=(Window.width/2, Window.height/2)
+            color=Colors.WHITE
         )
-        self.add_widget(message_label)
+        overlay.add_widget(self.message_label)
 
         # Buttons
-        retry_btn = Button(
+        self.retry_btn = Button(
             text="Try Again",
             font_size=f'{int(26 * s)}sp',
             size=(btn_width, btn_height),
-            pos=(Window.width/2 - btn_width/2, Window.height/2 - 80*s),
             background_color=Colors.BUTTON_GREEN
         )
-        retry_btn.bind(on_press=self.retry_level)
-        self.add_widget(retry_btn)
+        self.retry_btn.bind(on_press=self.retry_level)
+        overlay.add_widget(self.retry_btn)
 
-        menu_btn = Button(
+        self.game_over_menu_btn = Button(
             text="Main Menu",
             font_size=f'{int(26 * s)}sp',
             size=(btn_width, btn_height),
-            pos=(Window.width/2 - btn_width/2, Window.height/2 - 160*s),
             background_color=Colors.BUTTON_ORANGE
         )
-        menu_btn.bind(on_press=self.go_to_menu)
-        self.add_widget(menu_btn)
+        self.game_over_menu_btn.bind(on_press=self.go_to_menu)
+        overlay.add_widget(self.game_over_menu_btn)
 
-    def check_obstacles_close(self):
-        """Check if both a ball and bee are close - requires super jump"""
-        if not self.player:
-            return False
+        self.game_over_overlay = overlay
+        self.layout_game_over_ui()
 
-        danger_range = 200  # pixels ahead of player
-        very_close_range = 100  # very close requires super jump
-
-        player_x = self.player.x
-        ball_close = False
-        bee_close = False
-        any_very_close = False
-
-        # Check balls
-        for ball in self.balls:
-            dist = ball.x - player_x
-            if 0 < dist < danger_range:
-                ball_close = True
-                if dist < very_close_range:
-                    any_very_close = True
-
-        # Check bees
-        for bee in self.bees:
-            dist = bee.x - player_x
-            if 0 < dist < danger_range:
-                bee_close = True
-                if dist < very_close_range:
-                    any_very_close = True
-
-        # Need super jump if both ball and bee close, or any obstacle very close
-        return (ball_close and bee_close) or any_very_close
+    def layout_game_over_ui(self):
+        if self.game_over_overlay is None:
+            return
+        s = GameSettings.SCALE
+        center_x, center_y = Window.width/2, Window.height/2
+        self.game_over_dim.size = Window.size
+        self.game_over_title_label.center = (center_x, center_y + 120*s)
+        self.final_score_label.center = (center_x, center_y + 50*s)
+        self.message_label.center = (center_x, center_y)
+        self.retry_btn.pos = (center_x - self.retry_btn.width/2, center_y - 80*s)
+        self.game_over_menu_btn.pos = (center_x - self.game_over_menu_btn.width/2, center_y - 160*s)
 
     def on_touch(self, window, touch):
         if self.is_active and not self.is_game_over and not self.is_level_complete:
-            if self.player:
-                # Check if we need a super jump (obstacles close together)
-                needs_super_jump = self.check_obstacles_close()
-                self.player.jump(super_jump=needs_super_jump)
+            if self.sim and not self.replay_input:
+                # The simulation decides whether obstacles call for a super jump
+                if self.recording:
+                    self.recording.tap(self.sim.ticks)
+                self.sim.jump()
         return False
 
+    def continue_after_level(self, instance):
+        if self.game_manager.current_level >= GameSettings.TOTAL_LEVELS:
+            self.restart_game(instance)
+        else:
+            self.next_level(instance)
+
     def next_level(self, instance):
         self.game_manager.advance_level()
         self.start_game()
 
     def retry_level(self, instance):
-        self.game_manager.reset_lives()
+        if self.game_manager.is_endless:
+            self.game_manager.start_endless()
+        else:
+            self.game_manager.reset_lives()
         self.start_game()
 
     def restart_game(self, instance):
@@ -1749,7 +2938,7 @@ class MenuScreen(Screen):
             font_size=f'{int(32 * s)}sp',
             size_hint=(None, None),
             size=(240*s, 75*s),
-            pos_hint={'center_x': 0.5, 'center_y': 0.5},
+            pos_hint={'center_x': 0.5, 'center_y': 0.52},
             background_color=Colors.BUTTON_GREEN
         )
         play_btn.bind(on_press=self.start_game)
@@ -1761,34 +2950,55 @@ class MenuScreen(Screen):
             font_size=f'{int(28 * s)}sp',
             size_hint=(None, None),
             size=(240*s, 65*s),
-            pos_hint={'center_x': 0.5, 'center_y': 0.38},
+            pos_hint={'center_x': 0.5, 'center_y': 0.41},
             background_color=Colors.BUTTON_ORANGE
         )
         levels_btn.bind(on_press=self.go_to_levels)
         layout.add_widget(levels_btn)
 
+        # Endless mode button
+        endless_btn = Button(
+            text="Endless",
+            font_size=f'{int(28 * s)}sp',
+            size_hint=(None, None),
+            size=(240*s, 65*s),
+            pos_hint={'center_x': 0.5, 'center_y': 0.31},
+            background_color=Colors.BEE_PINK
+        )
+        endless_btn.bind(on_press=self.start_endless)
+        layout.add_widget(endless_btn)
+
         # High score
-        gm = GameManager()
-        high_score_label = Label(
-            text=f"High Score: {gm.high_score}",
+        self.high_score_label = Label(
             font_size=f'{int(24 * s)}sp',
             color=(0.2, 0.2, 0.2, 1),
-            pos_hint={'center_x': 0.5, 'center_y': 0.28}
+            pos_hint={'center_x': 0.5, 'center_y': 0.22}
         )
-        layout.add_widget(high_score_label)
+        layout.add_widget(self.high_score_label)
+        self.refresh()
 
         self.add_widget(layout)
 
+    def refresh(self):
+        # Save data loads after the first frame; the app refreshes again then
+        if not GameManager.is_loaded():
+            return
+        # Only the text changes, so only this label is re-rendered
+        self.high_score_label.text = f"High Score: {GameManager().high_score}"
+
     def on_enter(self):
-        # Refresh high score display
-        self.clear_widgets()
-        self.build_ui()
+        self.refresh()
 
     def start_game(self, instance):
         GameManager().start_new_game()
         app = App.get_running_app()
         app.root.current = 'game'
 
+    def start_endless(self, instance):
+        GameManager().start_endless()
+        app = App.get_running_app()
+        app.root.current = 'game'
+
     def go_to_levels(self, instance):
         app = App.get_running_app()
         app.root.current = 'levels'
@@ -1796,12 +3006,33 @@ class MenuScreen(Screen):
 
 # ============== LEVEL SELECT SCREEN ==============
 class LevelSelectScreen(Screen):
+    DIFFICULTIES = {1: "Easy", 2: "Easy", 3: "Medium", 4: "Medium", 5: "Hard"}
+    DIFF_COLORS = {
+        "Easy": Colors.BUTTON_GREEN,
+        "Medium": Colors.BUTTON_ORANGE,
+        "Hard": Colors.BUTTON_RED
+    }
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.level_buttons = []  # (button, difficulty label) per level
+        self.build_ui()
 
     def on_enter(self):
-        self.clear_widgets()
-        self.build_ui()
+        self.refresh()
+
+    def refresh(self):
+        """Show each level as unlocked or locked"""
+        highest_unlocked = GameManager().highest_unlocked_level
+        for level, (btn, diff_label) in enumerate(self.level_buttons, start=1):
+            if level <= highest_unlocked:
+                btn.text = str(level)
+                btn.background_color = self.DIFF_COLORS[self.DIFFICULTIES[level]]
+                diff_label.opacity = 1
+            else:
+                btn.text = "🔒"
+                btn.background_color = Colors.GRAY
+                diff_label.opacity = 0
 
     def build_ui(self):
         s = GameSettings.SCALE
@@ -1824,20 +3055,12 @@ class LevelSelectScreen(Screen):
         )
         layout.add_widget(title)
 
-        # Level buttons
-        gm = GameManager()
+        # Level buttons; refresh() sets which ones are locked
         button_size = int(100 * s)
         spacing = int(30 * s)
         start_x = Window.width / 2 - button_size - spacing / 2
         start_y = Window.height * 0.65
 
-        difficulties = {1: "Easy", 2: "Easy", 3: "Medium", 4: "Medium", 5: "Hard"}
-        diff_colors = {
-            "Easy": Colors.BUTTON_GREEN,
-            "Medium": Colors.BUTTON_ORANGE,
-            "Hard": Colors.BUTTON_RED
-        }
-
         for level in range(1, GameSettings.TOTAL_LEVELS + 1):
             row = (level - 1) // 2
             col = (level - 1) % 2
@@ -1845,39 +3068,26 @@ class LevelSelectScreen(Screen):
             x = start_x + col * (button_size + spacing)
             y = start_y - row * (button_size + spacing)
 
-            is_unlocked = level <= gm.highest_unlocked_level
-            difficulty = difficulties[level]
-
-            if is_unlocked:
-                btn_color = diff_colors[difficulty]
-                btn_text = str(level)
-            else:
-                btn_color = Colors.GRAY
-                btn_text = "🔒"
-
             btn = Button(
-                text=btn_text,
                 font_size=f'{int(38 * s)}sp',
                 size_hint=(None, None),
                 size=(button_size, button_size),
-                pos=(x, y),
-                background_color=btn_color
+                pos=(x, y)
             )
-
-            if is_unlocked:
-                btn.bind(on_press=lambda inst, lv=level: self.select_level(lv))
-
-                # Difficulty label
-                diff_label = Label(
-                    text=difficulty,
-                    font_size=f'{int(14 * s)}sp',
-                    color=Colors.WHITE,
-                    pos=(x, y - 25*s),
-                    size=(button_size, 25*s)
-                )
-                layout.add_widget(diff_label)
-
+            btn.bind(on_press=lambda inst, lv=level: self.select_level(lv))
+
+            # Difficulty label
+            diff_label = Label(
+                text=self.DIFFICULTIES[level],
+                font_size=f'{int(14 * s)}sp',
+                color=Colors.WHITE,
+                pos=(x, y - 25*s),
+                size=(button_size, 25*s)
+            )
+            layout.add_widget(diff_label)
             layout.add_widget(btn)
+            self.level_buttons.append((btn, diff_label))
+        self.refresh()
 
         # Legend
         legend_y = 0.18
@@ -1916,6 +3126,8 @@ class LevelSelectScreen(Screen):
 
     def select_level(self, level):
         gm = GameManager()
+        if level > gm.highest_unlocked_level:
+            return
         gm.current_level = level
         gm.reset_lives()
         app = App.get_running_app()
@@ -1931,13 +3143,111 @@ class BalanceBeamApp(App):
     def build(self):
         self.title = "Balance Beam Adventure"
 
+        # Everything else is loaded by load_deferred after the first frame
+        self.loaded = False
+        self.bells = None
+        self.profiler = None
+        self.profiler_overlay = None
+
         sm = ScreenManager(transition=FadeTransition())
+        sm.transition.bind(is_active=FramePacer().hold_while)
         sm.add_widget(MenuScreen(name='menu'))
-        sm.add_widget(LevelSelectScreen(name='levels'))
-        sm.add_widget(GameScreen(name='game'))
 
         return sm
 
+    def on_start(self):
+        if STARTUP:
+            STARTUP.mark('build')
+        FramePacer().start()
+
+        # F3 toggles the frame profiler overlay, F4 dumps the profiler buffer
+        Window.bind(on_keyboard=self.on_keyboard)
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, window):
+        Window.unbind(on_flip=self.on_first_frame)
+        if STARTUP:
+            STARTUP.mark('first frame')
+        Clock.schedule_once(self.load_deferred)
+
+    def load_deferred(self, dt):
+        """Load what the menu doesn't need, once the menu is on screen"""
+        import_deferred()
+        if STARTUP:
+            STARTUP.mark('deferred imports')
+
+        GameManager()
+        self.root.get_screen('menu').refresh()
+        if STARTUP:
+            STARTUP.mark('save data')
+
+        self.root.add_widget(LevelSelectScreen(name='levels'))
+        self.root.add_widget(GameScreen(name='game'))
+        if STARTUP:
+            STARTUP.mark('screens')
+
+        # Shared by every screen; filled in the background
+        self.bells = BellSound(cache_dir=os.path.join(self.user_data_dir, 'sound_cache'))
+        self.bells.warm_up(range(1, GameSettings.TOTAL_LEVELS + 1))
+        if STARTUP:
+            STARTUP.mark('audio')
+
+        # Baked or loaded in the background; shapes are drawn until it's ready
+        SpriteAtlas().load(os.path.join(self.user_data_dir, 'sprite_cache'))
+        if STARTUP:
+            STARTUP.mark('sprite atlas')
+            print(STARTUP.report())
+        self.loaded = True
+
+        if REPLAY:
+            self.root.get_screen('game').game_widget.replay(REPLAY)
+            self.root.current = 'game'
+        if PROFILE_OPTION:
+            self.toggle_profiler()
+
+    def on_pause(self):
+        # The OS may kill a paused app without calling on_stop
+        if GameManager.is_loaded():
+            GameManager().flush()
+        return True
+
+    def on_stop(self):
+        if GameManager.is_loaded():
+            GameManager().close()
+        if PROFILE_OPTION and self.profiler:
+            self.dump_profile(PROFILE_OPTION)
+
+    def on_keyboard(self, window, key, scancode, codepoint, modifiers):
+        if not self.loaded:
+            return False
+        if key == 284:  # F3
+            self.toggle_profiler()
+            return True
+        if key == 285 and self.profiler:  # F4
+            self.dump_profile()
+            return True
+        return False
+
+    def toggle_profiler(self):
+        game_widget = self.root.get_screen('game').game_widget
+        if self.profiler_overlay:
+            self.profiler_overlay.dismiss()
+            self.profiler_overlay = None
+            game_widget.set_profiler(None)
+            return
+
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        game_widget.set_profiler(self.profiler)
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        Window.add_widget(self.profiler_overlay)
+
+    def dump_profile(self, path=None):
+        if path is None:
+            path = os.path.join(self.user_data_dir, time.strftime('profile-%Y%m%d-%H%M%S.csv'))
+        self.profiler.dump(path)
+        print(f"Frame profile written to {path}")
+
 
 if __name__ == '__main__':
     BalanceBeamApp().run()
@@ -0,0 +1,160 @@
+"""
+Per-phase frame profiler for Balance Beam Adventure.
+
+Kept free of Kivy so the simulation can be profiled headless too. Each
+frame is split into named phases; the time since the previous lap() is
+charged to the phase passed to lap(), and finished frames go into a
+fixed-size ring buffer of nanosecond counts.
+
+Code being profiled holds an optional reference and checks it for None,
+so a disabled profiler costs one attribute test per phase.
+
+StartupTrace does the same for launch: wall-clock phases from process
+start to the first frame and beyond.
+"""
+
+import csv
+import json
+import os
+from array import array
+from time import perf_counter_ns
+
+PHASES = ('spawn', 'player', 'obstacles', 'collision', 'background', 'hud')
+SPAWN, PLAYER, OBSTACLES, COLLISION, BACKGROUND, HUD = range(len(PHASES))
+
+FRAME_BUDGET_NS = 16_666_667  # One frame at 60 Hz
+
+
+class FrameProfiler:
+    """Ring buffer of per-phase frame times.
+
+    Each row holds one frame: a nanosecond count per phase followed by the
+    whole frame's duration, so time spent outside any phase is
+    total - sum(phases).
+    """
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.row_size = len(PHASES) + 1
+        self.samples = array('q', bytes(8 * capacity * self.row_size))
+        self.frames = 0  # Frames recorded so far, including overwritten ones
+        self.current = array('q', bytes(8 * len(PHASES)))
+        self._zeros = array('q', bytes(8 * len(PHASES)))
+        self._frame_start = 0
+        self._last = 0
+
+    def begin_frame(self):
+        self.current[:] = self._zeros
+        self._frame_start = self._last = perf_counter_ns()
+
+    def lap(self, phase):
+        """Charge the time since the last lap to phase"""
+        now = perf_counter_ns()
+        self.current[phase] += now - self._last
+        self._last = now
+
+    def skip(self):
+        """Restart the lap timer without charging any phase"""
+        self._last = perf_counter_ns()
+
+    def end_frame(self):
+        now = perf_counter_ns()
+        start = (self.frames % self.capacity) * self.row_size
+        end = start + len(PHASES)
+        self.samples[start:end] = self.current
+        self.samples[end] = now - self._frame_start
+        self.frames += 1
+
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    def rows(self, last=None):
+        """Recorded frames, oldest first, as tuples of nanoseconds"""
+        count = len(self) if last is None else min(last, len(self))
+        rows = []
+        for frame in range(self.frames - count, self.frames):
+            start = (frame % self.capacity) * self.row_size
+            rows.append(tuple(self.samples[start:start + self.row_size]))
+        return rows
+
+    def summary(self):
+        """Mean and worst milliseconds per phase (and 'total') over the buffer"""
+        rows = self.rows()
+        if not rows:
+            return {}
+        names = PHASES + ('total',)
+        return {name: {'mean_ms': sum(row[i] for row in rows) / len(rows) / 1e6,
+                       'max_ms': max(row[i] for row in rows) / 1e6}
+                for i, name in enumerate(names)}
+
+    def reset(self):
+        self.frames = 0
+
+    # ============== EXPORT ==============
+    def dump(self, path):
+        """Write the buffer to path as CSV, or as JSON when path ends in .json"""
+        if path.endswith('.json'):
+            self.dump_json(path)
+        else:
+            self.dump_csv(path)
+
+    def dump_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('frame',) + tuple(f'{name}_ns' for name in PHASES) + ('total_ns',))
+            first = self.frames - len(self)
+            for i, row in enumerate(self.rows()):
+                writer.writerow((first + i,) + row)
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                'phases': list(PHASES),
+                'unit': 'ns',
+                'first_frame': self.frames - len(self),
+                'frames': [list(row) for row in self.rows()],
+                'summary': self.summary(),
+            }, f, separators=(',', ':'))
+
+
+# ============== STARTUP TRACE ==============
+def process_age_ns():
+    """How long ago this process started, where /proc tells (Linux, Android); else 0"""
+    try:
+        with open('/proc/self/stat') as f:
+            stat = f.read()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        # starttime is field 22; the command name in field 2 may contain spaces
+        start_ticks = int(stat.rsplit(')', 1)[1].split()[19])
+        return max(0, int((uptime - start_ticks / os.sysconf('SC_CLK_TCK')) * 1e9))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+class StartupTrace:
+    """Named phases of app startup, each charged the time since the last mark.
+
+    The first phase, 'interpreter', covers process start up to the trace's
+    creation, so create it as early as possible.
+    """
+
+    def __init__(self):
+        now = perf_counter_ns()
+        self.origin = now - process_age_ns()
+        self.marks = [('interpreter', now - self.origin)]
+        self._last = now
+
+    def mark(self, phase):
+        now = perf_counter_ns()
+        self.marks.append((phase, now - self._last))
+        self._last = now
+
+    def report(self):
+        """One line per phase: its milliseconds and the running total"""
+        lines = [f"{'phase':<20} {'ms':>8} {'total':>8}"]
+        total = 0
+        for phase, ns in self.marks:
+            total += ns
+            lines.append(f"{phase:<20} {ns / 1e6:>8.1f} {total / 1e6:>8.1f}")
+        return '\n'.join(lines)
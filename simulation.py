@@ -0,0 +1,939 @@
+"""
+Headless game simulation for Balance Beam Adventure.
+
+Walking, jumping, obstacle spawning and collisions live here, free of Kivy,
+so a level can be stepped thousands of times per second without a Window.
+GameWidget in main.py is a renderer over this state.
+
+    python main.py --simulate --level 3 --seconds 600
+    python main.py --simulate --level 0 --seconds 3600    (endless mode)
+    python main.py --simulate --replay run.json
+    python main.py --simulate --level 5 --policy autopilot
+
+sweep.py runs the Autopilot over a grid of level parameters.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import random
+import time
+from array import array
+from collections import Counter
+
+from profiler import SPAWN, PLAYER, OBSTACLES, COLLISION
+
+
+# ============== CONSTANTS ==============
+class GameSettings:
+    """Sizes and speeds, all derived from the window height by configure()"""
+
+    INITIAL_LIVES = 3
+    POINTS_PER_LEVEL = 100
+    TOTAL_LEVELS = 5
+    ENDLESS_LEVEL = 0        # Level number of endless mode
+    POINTS_PER_OBSTACLE = 10  # Endless mode scores each obstacle cleared
+
+    @classmethod
+    def configure(cls, window_height):
+        # Scale factor based on screen size (base design is 700px height)
+        cls.SCALE = max(1.0, window_height / 700)
+        s = cls.SCALE
+
+        cls.PLAYER_RADIUS = int(30 * s)
+        cls.PLAYER_WIDTH = int(50 * s)
+        cls.PLAYER_HEIGHT = int(80 * s)  # Taller for gymnast
+        cls.PLAYER_WALK_SPEED = int(100 * s)
+        cls.PLAYER_JUMP_FORCE = int(550 * s)
+        cls.GRAVITY = int(-1000 * s)
+
+        cls.BALL_RADIUS = int(25 * s)
+        cls.BALL_SLOW_SPEED = int(140 * s)
+        cls.BALL_MEDIUM_SPEED = int(200 * s)
+        cls.BALL_FAST_SPEED = int(280 * s)
+
+        cls.BEE_WIDTH = int(40 * s)
+        cls.BEE_HEIGHT = int(26 * s)
+        cls.BEE_SPEED = int(180 * s)
+
+        cls.BEAM_HEIGHT = int(30 * s)
+        cls.BEAM_Y_POSITION = int(window_height * 0.2)  # 20% from bottom
+
+        LEVEL_CONFIGS[:] = [
+            {"level": 1, "ball_speed": cls.BALL_SLOW_SPEED, "ball_count": 1, "bee_count": 1, "ball_interval": 4.0, "bee_interval": 6.0},
+            {"level": 2, "ball_speed": cls.BALL_SLOW_SPEED, "ball_count": 2, "bee_count": 2, "ball_interval": 3.5, "bee_interval": 5.0},
+            {"level": 3, "ball_speed": cls.BALL_MEDIUM_SPEED, "ball_count": 2, "bee_count": 2, "ball_interval": 3.0, "bee_interval": 4.5},
+            {"level": 4, "ball_speed": cls.BALL_MEDIUM_SPEED, "ball_count": 3, "bee_count": 3, "ball_interval": 2.5, "bee_interval": 4.0},
+            {"level": 5, "ball_speed": cls.BALL_FAST_SPEED, "ball_count": 3, "bee_count": 4, "ball_interval": 2.0, "bee_interval": 3.0},
+        ]
+
+
+# Level configurations (filled in by GameSettings.configure)
+LEVEL_CONFIGS = []
+ENDLESS_CONFIG = {"level": GameSettings.ENDLESS_LEVEL, "endless": True}
+
+
+def level_config(level):
+    """The config for a level number, including GameSettings.ENDLESS_LEVEL"""
+    if level == GameSettings.ENDLESS_LEVEL:
+        return ENDLESS_CONFIG
+    return LEVEL_CONFIGS[level - 1]
+
+GameSettings.configure(700)
+
+# The simulation always advances in ticks of this length, whatever the frame rate
+TICK = 1 / 60
+# Most ticks run for one frame; after a longer stall the lost time is dropped
+MAX_SUBSTEPS = 5
+
+
+# ============== COLLISIONS ==============
+# All tests compare squared distances, so no square roots are taken
+
+def circle_rect_overlap(circle, rect):
+    cx, cy, cr = circle
+    rx, ry, rw, rh = rect
+
+    closest_x = max(rx, min(cx, rx + rw))
+    closest_y = max(ry, min(cy, ry + rh))
+
+    return (cx - closest_x) ** 2 + (cy - closest_y) ** 2 < cr * cr
+
+
+def circles_overlap(c1, c2):
+    x1, y1, r1 = c1
+    x2, y2, r2 = c2
+    return (x1 - x2) ** 2 + (y1 - y2) ** 2 < (r1 + r2) ** 2
+
+
+def _axis_gap(start, delta, low, high, t):
+    """Distance outside [low, high] along one axis, as a + b*t, on the side
+    the moving point is on at time t (0, 0 when inside)"""
+    position = start + delta * t
+    if position < low:
+        return low - start, -delta
+    if position > high:
+        return start - high, delta
+    return 0, 0
+
+
+def swept_circle_rect_overlap(circle_start, circle_end, rect_start, rect_end):
+    """Whether a moving circle touches a moving rectangle at any time during the tick.
+
+    Both move linearly from their start to their end state (the rectangle
+    only translates). In the rectangle's frame the circle's center moves
+    along a segment; the squared distance from that segment to the box is
+    piecewise quadratic and convex, so its minimum is at an end, a slab
+    crossing or the vertex of one of the pieces.
+    """
+    cx, cy, cr = circle_start
+    ex, ey, _ = circle_end
+    rx, ry, rw, rh = rect_start
+    rx1, ry1, _, _ = rect_end
+
+    # Circle center relative to the rectangle's corner, and its motion
+    px = cx - rx
+    py = cy - ry
+    dx = (ex - cx) - (rx1 - rx)
+    dy = (ey - cy) - (ry1 - ry)
+
+    # Times at which the center crosses a side of the box
+    times = [0.0, 1.0]
+    for start, delta, low, high in ((px, dx, 0, rw), (py, dy, 0, rh)):
+        if delta:
+            for bound in (low, high):
+                t = (bound - start) / delta
+                if 0 < t < 1:
+                    times.append(t)
+    times.sort()
+
+    r2 = cr * cr
+    for t0, t1 in zip(times, times[1:]):
+        middle = (t0 + t1) / 2
+        ax, bx = _axis_gap(px, dx, 0, rw, middle)
+        ay, by = _axis_gap(py, dy, 0, rh, middle)
+        # Minimize (ax + bx t)^2 + (ay + by t)^2 over [t0, t1]
+        slope = bx * bx + by * by
+        t = -(ax * bx + ay * by) / slope if slope else t0
+        t = max(t0, min(t1, t))
+        if (ax + bx * t) ** 2 + (ay + by * t) ** 2 < r2:
+            return True
+    return False
+
+
+def swept_circles_overlap(c1_start, c1_end, c2_start, c2_end):
+    """Whether two circles moving linearly during the tick touch at any time"""
+    x1, y1, r1 = c1_start
+    x2, y2, r2 = c2_start
+    # Offset between the centers and how it changes over the tick
+    px = x1 - x2
+    py = y1 - y2
+    dx = (c1_end[0] - x1) - (c2_end[0] - x2)
+    dy = (c1_end[1] - y1) - (c2_end[1] - y2)
+
+    # Closest approach, clamped to the tick
+    speed2 = dx * dx + dy * dy
+    t = max(0.0, min(1.0, -(px * dx + py * dy) / speed2)) if speed2 else 0.0
+    return (px + dx * t) ** 2 + (py + dy * t) ** 2 < (r1 + r2) ** 2
+
+
+# ============== FIXED TIMESTEP ==============
+class FixedStepper:
+    """Turns variable frame times into a whole number of fixed ticks.
+
+    advance(dt) returns how many ticks to run this frame; alpha is how far
+    the leftover time reaches into the next tick, for interpolating the
+    drawn positions between the last two ticks.
+    """
+
+    def __init__(self, tick=TICK, max_substeps=MAX_SUBSTEPS):
+        self.tick = tick
+        self.max_substeps = max_substeps
+        self.accumulator = 0
+        self.dropped = 0  # Ticks skipped after stalls
+
+    def advance(self, dt):
+        self.accumulator += dt
+        # The epsilon keeps frames of exactly one tick from alternating 0 and 2 ticks
+        ticks = int(self.accumulator / self.tick + 1e-6)
+        if ticks > self.max_substeps:
+            self.dropped += ticks - self.max_substeps
+            ticks = self.max_substeps
+            self.accumulator = self.tick * ticks
+        self.accumulator -= self.tick * ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.tick)
+
+    def reset(self):
+        self.accumulator = 0
+
+
+# ============== GAME OBJECTS ==============
+class Body:
+    """Position plus the position at the start of the current tick"""
+
+    def __init__(self, x, y):
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+
+    def snapshot(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def lerp_pos(self, alpha):
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+
+class PlayerState(Body):
+    """The gymnast on the beam: position, jump physics and walk cycle"""
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.width = GameSettings.PLAYER_WIDTH
+        self.height = GameSettings.PLAYER_HEIGHT
+        self.velocity_y = 0
+        self.is_jumping = False
+        self.is_on_ground = True
+        self.leg_angle = 0
+        self.arm_angle = 0
+        self.facing_front = False  # True when turning to face player
+        self.front_timer = 0  # How long to face front
+
+    @property
+    def center_x(self):
+        return self.x + self.width / 2
+
+    @property
+    def center_y(self):
+        return self.y + self.height / 2
+
+    def update(self, dt, ground_y):
+        # Handle front-facing timer (after landing from jump)
+        if self.facing_front:
+            self.front_timer -= dt
+            if self.front_timer <= 0:
+                self.facing_front = False
+
+        # Walking animation (faster for gymnast)
+        if not self.is_jumping and not self.facing_front:
+            self.leg_angle += dt * 12
+            self.arm_angle = self.leg_angle
+
+        # Jumping physics
+        if self.is_jumping:
+            self.velocity_y += GameSettings.GRAVITY * dt
+            self.y += self.velocity_y * dt
+
+            landing_y = ground_y
+            if self.y <= landing_y and self.velocity_y < 0:
+                self.y = landing_y
+                self.velocity_y = 0
+                self.is_jumping = False
+                self.is_on_ground = True
+
+                # Just landed! Turn to face the player briefly
+                self.facing_front = True
+                self.front_timer = 0.4  # Face front for 0.4 seconds
+
+    def jump(self, super_jump=False):
+        """Start a jump if standing; returns True when the jump happened"""
+        if self.is_on_ground and not self.is_jumping:
+            self.is_jumping = True
+            self.is_on_ground = False
+            # Super jump is 50% higher when obstacles are close together
+            if super_jump:
+                self.velocity_y = GameSettings.PLAYER_JUMP_FORCE * 1.5
+            else:
+                self.velocity_y = GameSettings.PLAYER_JUMP_FORCE
+            return True
+        return False
+
+    def get_collision_rect(self, x=None, y=None):
+        """Collision area around the body, at (x, y) if given"""
+        s = GameSettings.SCALE
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        return (x + 10*s, y + 20*s, self.width - 20*s, 40*s)
+
+    def get_collision_circle(self, x=None, y=None):
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        return (x + self.width / 2, y + self.height / 2, GameSettings.PLAYER_RADIUS)
+
+
+class Obstacle:
+    """Something flying or rolling left at a constant speed.
+
+    Motion is a closed-form function of the time since spawning, so the
+    position at any timestamp is exact and nothing is integrated per tick.
+    Subclasses give the extent of their collision shape along x, relative
+    to their left edge, for predicting when they reach the gymnast.
+    """
+
+    def __init__(self, x, y, speed, spawn_time):
+        self.start_x = x
+        self.start_y = y
+        self.speed = speed
+        self.spawn_time = spawn_time
+
+    def x_at(self, t):
+        return self.start_x - self.speed * (t - self.spawn_time)
+
+    def y_at(self, t):
+        return self.start_y
+
+    def position_at(self, t):
+        return (self.x_at(t), self.y_at(t))
+
+
+class BallState(Obstacle):
+    kind = 'ball'
+
+    def __init__(self, x, y, speed, spawn_time=0):
+        super().__init__(x, y, speed, spawn_time)
+        self.size = GameSettings.BALL_RADIUS * 2
+        self.x_extent = (0, self.size)
+
+    def rotation_at(self, t):
+        return -2 * self.speed * (t - self.spawn_time)
+
+    def get_collision_circle(self, t):
+        return (self.x_at(t) + self.size / 2, self.start_y + self.size / 2, GameSettings.BALL_RADIUS)
+
+
+class BeeState(Obstacle):
+    kind = 'bee'
+    BOB_AMPLITUDE = 20  # Pixels above and below the flight line
+    BOB_SPEED = 40      # Pixels per second up or down
+    WING_RATE = 25      # Wing flap phase, radians per second
+    RADIUS = 15
+
+    def __init__(self, x, y, spawn_time=0, speed=None):
+        super().__init__(x, y, GameSettings.BEE_SPEED if speed is None else speed, spawn_time)
+        self.width = GameSettings.BEE_WIDTH + 20
+        self.height = GameSettings.BEE_HEIGHT + 25
+        self.x_extent = (self.width / 2 - self.RADIUS, self.width / 2 + self.RADIUS)
+
+    def y_at(self, t):
+        # Triangle wave: up first, then between +/- BOB_AMPLITUDE
+        amplitude = self.BOB_AMPLITUDE
+        travelled = self.BOB_SPEED * (t - self.spawn_time) + amplitude
+        return self.start_y + amplitude - abs(travelled % (4 * amplitude) - 2 * amplitude)
+
+    def wing_angle_at(self, t):
+        return self.WING_RATE * (t - self.spawn_time)
+
+    def get_collision_circle(self, t):
+        return (self.x_at(t) + self.width / 2, self.y_at(t) + self.height / 2, self.RADIUS)
+
+
+# ============== ENDLESS MODE ==============
+# Spawns are a lazy pipeline of generators, so an endless session holds only
+# the next spawn, however long it runs
+ENDLESS_RAMP_TIME = 240   # Seconds for difficulty to get 63% of the way to its maximum
+ENDLESS_BREATHER = 2.0    # Seconds without spawns after a hit
+ENDLESS_MIN_ARRIVAL_GAP = 0.5  # Seconds between obstacles reaching the gymnast
+ENDLESS_MAX_LIVE = 8      # Obstacles on screen at once
+
+
+def endless_difficulty(t):
+    """0 at the start of a session, approaching 1 as it goes on"""
+    return 1 - math.exp(-t / ENDLESS_RAMP_TIME)
+
+
+def endless_spawns(rng, start=0.0):
+    """Endless (time, kind, speed) spawns after start: closer together,
+    faster and more often bees as the difficulty ramps up.
+
+    The gymnast walks in place in endless mode, so speeds are the closing
+    speeds she would see walking on a level.
+    """
+    walk = GameSettings.PLAYER_WALK_SPEED
+    slow, fast = GameSettings.BALL_SLOW_SPEED, GameSettings.BALL_FAST_SPEED
+    t = start
+    while True:
+        difficulty = endless_difficulty(t)
+        t += (4.0 - 2.8 * difficulty) * rng.uniform(0.7, 1.3)  # Mean gap from 4 s down to 1.2 s
+        if rng.random() < 0.3 + 0.2 * difficulty:
+            yield t, 'bee', GameSettings.BEE_SPEED + walk
+        else:
+            speed = slow + (fast - slow) * difficulty
+            yield t, 'ball', speed * rng.uniform(0.9, 1.1) + walk
+
+
+def fair_spacing(spawns, distance, min_gap=ENDLESS_MIN_ARRIVAL_GAP):
+    """Delay spawns so each reaches the gymnast, distance pixels from the
+    spawn point, at least min_gap seconds after the one before"""
+    last_arrival = float('-inf')
+    for t, kind, speed in spawns:
+        arrival = max(t + distance / speed, last_arrival + min_gap)
+        last_arrival = arrival
+        yield arrival - distance / speed, kind, speed
+
+
+# ============== SIMULATION ==============
+# Predicted obstacle events, ordered by time in Simulation.schedule
+NEAR, VERY_CLOSE, PASSED, CONTACT, DESPAWN = range(5)
+
+
+class Simulation:
+    """One attempt at a level, advanced by step(dt).
+
+    step() returns the events of that tick as (name, obj) tuples so a
+    renderer can mirror them: 'spawn' and 'despawn' carry a BallState or
+    BeeState, 'hit' the obstacle that hit the player, 'cleared' (endless
+    mode only) an obstacle that left the gymnast's lane without hitting
+    her, and 'complete' and 'game_over' end the attempt.
+
+    The gymnast walks at a constant speed and obstacles move in closed
+    form, so when an obstacle spawns the times it comes within super-jump
+    range, reaches the gymnast's lane (overlaps her along x), passes her
+    and leaves the screen are all known. They go into a heap; each tick
+    pops what is due and only obstacles in the lane are collision tested.
+    """
+    INVINCIBLE_TIME = 1.5
+    DANGER_RANGE = 200      # Pixels ahead of the player
+    VERY_CLOSE_RANGE = 100  # Very close requires super jump
+    DESPAWN_X = -50
+    CONTACT_MARGIN = 1      # Pixels of slack on predicted lane windows
+
+    def __init__(self, level_config, width, height, lives=GameSettings.INITIAL_LIVES, rng=None):
+        self.config = level_config
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random.Random()
+
+        self.beam_left = 20
+        self.beam_right = width - 20
+        self.beam_width = width - 40
+        self.beam_top = GameSettings.BEAM_Y_POSITION + GameSettings.BEAM_HEIGHT
+
+        # On a level the gymnast walks to the flag; in endless mode she walks
+        # in place a quarter of the way along and the obstacles come to her
+        self.endless = level_config.get('endless', False)
+        self.walk_speed = 0 if self.endless else GameSettings.PLAYER_WALK_SPEED
+        self.start_x = self.beam_left + (self.beam_width / 4 if self.endless else 20)
+
+        self.lives = lives
+        self.player = PlayerState(self.start_x, self.beam_top)
+        self.balls = []
+        self.bees = []
+        self.invincible_timer = 0
+        self.outcome = None  # 'complete' or 'game_over' once the attempt ends
+        self.time = 0
+        self.ticks = 0
+        self.profiler = None  # Optional profiler.FrameProfiler charged per phase
+
+        # Predicted obstacle events and what they tell us right now
+        self.schedule = []  # Heap of (time, seq, event, obstacle)
+        self._seq = itertools.count()
+        self.contacts = {}  # Obstacle in the gymnast's lane -> time it leaves
+        self.near = {'ball': set(), 'bee': set()}
+        self.very_close = set()
+
+        # Attempt statistics
+        self.hits = 0
+        self.jumps = 0
+        self.super_jumps = 0
+        self.cleared = 0  # Obstacles that got past the gymnast
+        self.hit_causes = Counter()  # 'ball:ground', 'bee:air', ... -> hits
+
+        self.reset_spawning()
+
+    @property
+    def is_invincible(self):
+        return self.invincible_timer > 0
+
+    def reset_spawning(self):
+        if self.endless:
+            # The difficulty ramp carries on from the current time
+            start = self.time + ENDLESS_BREATHER if self.ticks else 0.0
+            self.spawns = fair_spacing(endless_spawns(self.rng, start), self.width + 10 - self.start_x)
+            self.next_spawn = next(self.spawns)
+            return
+        self.balls_spawned = 0
+        self.bees_spawned = 0
+        self.ball_timer = self.config["ball_interval"] / 2
+        self.bee_timer = self.config["bee_interval"] / 2
+
+    def step(self, dt):
+        events = []
+        if self.outcome:
+            return events
+        tick_start = self.time
+        self.time += dt
+        self.ticks += 1
+        if self.invincible_timer > 0:
+            self.invincible_timer -= dt
+
+        prof = self.profiler
+
+        # Update player, remembering where she was for interpolation
+        player = self.player
+        player.snapshot()
+        player.x += self.walk_speed * dt
+        player.update(dt, self.beam_top)
+        if prof is not None:
+            prof.lap(PLAYER)
+
+        # Check finish line
+        if not self.endless and player.x >= self.beam_right - 50:
+            self.outcome = 'complete'
+            events.append(('complete', None))
+            return events
+
+        # Spawn obstacles
+        if self.endless:
+            self.spawn_endless(tick_start, events)
+        else:
+            config = self.config
+            self.ball_timer += dt
+            if self.ball_timer >= config["ball_interval"] and self.balls_spawned < config["ball_count"]:
+                events.append(('spawn', self.spawn_ball(config["ball_speed"], tick_start)))
+                self.ball_timer = 0
+                self.balls_spawned += 1
+
+            self.bee_timer += dt
+            if self.bee_timer >= config["bee_interval"] and self.bees_spawned < config["bee_count"]:
+                events.append(('spawn', self.spawn_bee(tick_start)))
+                self.bee_timer = 0
+                self.bees_spawned += 1
+        if prof is not None:
+            prof.lap(SPAWN)
+
+        # Apply the predicted events that are now due
+        schedule = self.schedule
+        while schedule and schedule[0][0] <= self.time:
+            _, _, event, obstacle = heapq.heappop(schedule)
+            self.apply_event(event, obstacle, events)
+        if prof is not None:
+            prof.lap(OBSTACLES)
+
+        if self.contacts:
+            self.check_collisions(tick_start, events)
+        if prof is not None:
+            prof.lap(COLLISION)
+        return events
+
+    def predict(self, obstacle):
+        """Schedule an obstacle's range, lane and despawn events"""
+        player = self.player
+        now = self.time
+        closing_speed = obstacle.speed + self.walk_speed
+        # Left edge of the obstacle minus the gymnast's x, shrinking linearly
+        gap = obstacle.x_at(now) - player.x
+
+        def when(target_gap):
+            return now + (gap - target_gap) / closing_speed
+
+        self.schedule_event(when(self.DANGER_RANGE), NEAR, obstacle)
+        self.schedule_event(when(self.VERY_CLOSE_RANGE), VERY_CLOSE, obstacle)
+        self.schedule_event(when(0), PASSED, obstacle)
+
+        # Lane: the obstacle's collision shape overlaps the gymnast's along x
+        s = GameSettings.SCALE
+        if obstacle.kind == 'ball':
+            body = (10*s, player.width - 10*s)  # get_collision_rect
+        else:
+            radius = GameSettings.PLAYER_RADIUS
+            body = (player.width / 2 - radius, player.width / 2 + radius)  # get_collision_circle
+        low, high = obstacle.x_extent
+        enter = when(body[1] - low + self.CONTACT_MARGIN)
+        leave = when(body[0] - high - self.CONTACT_MARGIN)
+        self.schedule_event(enter, CONTACT, (obstacle, leave))
+
+        despawn = obstacle.spawn_time + (obstacle.start_x - self.DESPAWN_X) / obstacle.speed
+        self.schedule_event(despawn, DESPAWN, obstacle)
+
+    def schedule_event(self, t, event, obstacle):
+        heapq.heappush(self.schedule, (t, next(self._seq), event, obstacle))
+
+    def apply_event(self, event, obstacle, events):
+        if event == NEAR:
+            self.near[obstacle.kind].add(obstacle)
+        elif event == VERY_CLOSE:
+            self.very_close.add(obstacle)
+        elif event == PASSED:
+            self.near[obstacle.kind].discard(obstacle)
+            self.very_close.discard(obstacle)
+        elif event == CONTACT:
+            obstacle, leave = obstacle
+            self.contacts[obstacle] = leave
+        elif event == DESPAWN:
+            (self.balls if obstacle.kind == 'ball' else self.bees).remove(obstacle)
+            events.append(('despawn', obstacle))
+
+    def check_collisions(self, tick_start, events):
+        """Swept tests over the whole tick for the obstacles in the gymnast's
+        lane, so fast obstacles can't tunnel through her between ticks"""
+        for obstacle, leave in list(self.contacts.items()):
+            if leave < tick_start:
+                # Out of the lane without a hit (a hit clears every obstacle)
+                del self.contacts[obstacle]
+                self.cleared += 1
+                if self.endless:
+                    events.append(('cleared', obstacle))
+        if self.is_invincible:
+            return
+
+        player = self.player
+        for obstacle in self.contacts:
+            circle_start = obstacle.get_collision_circle(tick_start)
+            circle_end = obstacle.get_collision_circle(self.time)
+            if obstacle.kind == 'ball':
+                hit = swept_circle_rect_overlap(circle_start, circle_end,
+                                                player.get_collision_rect(player.prev_x, player.prev_y),
+                                                player.get_collision_rect())
+            else:
+                hit = swept_circles_overlap(circle_start, circle_end,
+                                            player.get_collision_circle(player.prev_x, player.prev_y),
+                                            player.get_collision_circle())
+            if hit:
+                self.player_hit(obstacle, events)
+                return  # Obstacles were cleared (or the game is over)
+
+    def spawn_endless(self, spawn_time, events):
+        """Take the next spawn from the stream once it is due, while the live
+        obstacle count is under ENDLESS_MAX_LIVE (spawns wait otherwise)"""
+        due, kind, speed = self.next_spawn
+        if due > self.time or len(self.balls) + len(self.bees) >= ENDLESS_MAX_LIVE:
+            return
+        if kind == 'ball':
+            events.append(('spawn', self.spawn_ball(speed, spawn_time)))
+        else:
+            events.append(('spawn', self.spawn_bee(spawn_time, speed)))
+        self.next_spawn = next(self.spawns)
+
+    def spawn_ball(self, speed, spawn_time):
+        ball = BallState(self.width + 10, self.beam_top, speed, spawn_time)
+        self.balls.append(ball)
+        self.predict(ball)
+        return ball
+
+    def spawn_bee(self, spawn_time, speed=None):
+        min_y = self.beam_top + 50
+        max_y = self.height - 150
+        bee = BeeState(self.width + 10, self.rng.uniform(min_y, max_y), spawn_time, speed)
+        self.bees.append(bee)
+        self.predict(bee)
+        return bee
+
+    def player_hit(self, obstacle, events):
+        self.invincible_timer = self.INVINCIBLE_TIME
+        self.hits += 1
+        self.hit_causes[f"{obstacle.kind}:{'air' if self.player.is_jumping else 'ground'}"] += 1
+        self.lives -= 1
+        events.append(('hit', obstacle))
+
+        if self.lives <= 0:
+            self.outcome = 'game_over'
+            events.append(('game_over', None))
+        else:
+            self.reset_player_position(events)
+
+    def reset_player_position(self, events):
+        player = self.player
+        player.x = self.start_x
+        player.y = self.beam_top
+        player.velocity_y = 0
+        player.is_jumping = False
+        player.is_on_ground = True
+        player.snapshot()  # Don't interpolate the jump back to the start
+
+        # Reset spawning and remove obstacles
+        self.reset_spawning()
+        for obstacle in self.balls + self.bees:
+            events.append(('despawn', obstacle))
+        self.balls.clear()
+        self.bees.clear()
+        self.schedule.clear()
+        self.contacts.clear()
+        self.near['ball'].clear()
+        self.near['bee'].clear()
+        self.very_close.clear()
+
+    def needs_super_jump(self):
+        """Both a ball and a bee are close, or anything is very close;
+        kept up to date by the predicted range events"""
+        return bool((self.near['ball'] and self.near['bee']) or self.very_close)
+
+    def jump(self):
+        """A tap: jump (super jump when obstacles are close together)"""
+        if self.outcome:
+            return False
+        super_jump = self.needs_super_jump()
+        if not self.player.jump(super_jump=super_jump):
+            return False
+        self.jumps += 1
+        if super_jump:
+            self.super_jumps += 1
+        return True
+
+
+# ============== RECORDING & REPLAY ==============
+class Recording:
+    """Everything needed to replay one attempt: the level, the window size,
+    the attempt's RNG seed and the tick index of every jump tap.
+
+    Taps are kept as a compact array of tick numbers (4 bytes each, the only
+    thing that grows during an endless session) and stored delta-encoded, so
+    a whole attempt is a few hundred bytes of JSON. outcome and ticks are
+    filled in when the attempt ends and let a replay check that it
+    reproduced the run.
+    """
+    VERSION = 3  # Bump whenever the simulation's rules change
+
+    def __init__(self, level, seed, width, height, lives, taps=None, outcome=None, ticks=0):
+        self.level = level
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.lives = lives
+        self.taps = array('I', taps if taps is not None else ())
+        self.outcome = outcome
+        self.ticks = ticks
+        self.started_at = None  # Wall-clock Unix time a live attempt began; not saved
+
+    def tap(self, tick):
+        self.taps.append(tick)
+
+    def finish(self, sim):
+        self.outcome = sim.outcome
+        self.ticks = sim.ticks
+
+    def to_json(self):
+        deltas = [tick - previous for previous, tick in zip(itertools.chain((0,), self.taps), self.taps)]
+        return json.dumps({
+            'version': self.VERSION, 'tick': TICK,
+            'level': self.level, 'seed': self.seed,
+            'width': self.width, 'height': self.height, 'lives': self.lives,
+            'taps': deltas, 'outcome': self.outcome, 'ticks': self.ticks,
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get('version') != cls.VERSION or data.get('tick') != TICK:
+            raise ValueError("Recording was made by an incompatible version of the game")
+        taps = []
+        tick = 0
+        for delta in data['taps']:
+            tick += delta
+            taps.append(tick)
+        return cls(data['level'], data['seed'], data['width'], data['height'], data['lives'],
+                   taps=taps, outcome=data['outcome'], ticks=data['ticks'])
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_json(f.read())
+
+    def simulation(self):
+        """A fresh Simulation in the state this recording started from.
+
+        GameSettings must already be configured for self.height.
+        """
+        return Simulation(level_config(self.level), self.width, self.height,
+                          lives=self.lives, rng=random.Random(self.seed))
+
+
+class ReplayInput:
+    """Feeds a recording's taps back into a simulation at the same ticks"""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.pending = Counter(recording.taps)
+
+    def feed(self, sim):
+        """Call before each sim.step(); taps made at this tick are applied"""
+        for _ in range(self.pending.pop(sim.ticks, 0)):
+            sim.jump()
+
+    @property
+    def finished(self):
+        return not self.pending
+
+
+def replay(recording):
+    """Run a recording headless as fast as possible; returns the Simulation"""
+    GameSettings.configure(recording.height)
+    sim = recording.simulation()
+    replay_input = ReplayInput(recording)
+    # Recordings of abandoned attempts have no outcome; stop where they stopped
+    while not sim.outcome and (recording.outcome or sim.ticks < recording.ticks):
+        replay_input.feed(sim)
+        sim.step(TICK)
+    return sim
+
+
+# ============== HEADLESS RUNNER ==============
+def reflex_policy(sim):
+    """Tap whenever an obstacle is within reach ahead of the gymnast"""
+    player_x = sim.player.x
+    for obstacle in sim.balls + sim.bees:
+        if 0 < obstacle.x_at(sim.time) - player_x < 120 * GameSettings.SCALE:
+            return True
+    return False
+
+
+class Autopilot:
+    """A policy that times its jumps like a player who reacts late.
+
+    A jump's peak should come as an obstacle reaches the gymnast, but the
+    autopilot judges that from what it saw reaction_delay seconds ago, so
+    each jump comes that much later. It jumps once per ball, and once per
+    bee flying low enough to hit the gymnast standing; higher bees are
+    walked under.
+    """
+
+    def __init__(self, reaction_delay=0.25):
+        self.reaction_delay = reaction_delay
+        self.handled = set()  # Obstacles already jumped for
+
+    def __call__(self, sim):
+        s = GameSettings.SCALE
+        player = sim.player
+        peak_time = GameSettings.PLAYER_JUMP_FORCE / -GameSettings.GRAVITY
+        standing_top = sim.beam_top + player.height / 2 + GameSettings.PLAYER_RADIUS
+        live = sim.balls + sim.bees
+        self.handled.intersection_update(live)
+
+        for obstacle in live:
+            if obstacle in self.handled:
+                continue
+            if obstacle.kind == 'bee':
+                _, bee_y, radius = obstacle.get_collision_circle(sim.time)
+                if bee_y - radius - BeeState.BOB_AMPLITUDE >= standing_top:
+                    continue
+            # Seconds until the obstacle is level with the gymnast, as seen late
+            closing_speed = obstacle.speed + sim.walk_speed
+            seen = (obstacle.x_at(sim.time) - player.x) / closing_speed + self.reaction_delay
+            if -10 * s / closing_speed < seen - self.reaction_delay and seen <= peak_time:
+                self.handled.add(obstacle)
+                return True
+        return False
+
+
+POLICIES = {
+    'none': lambda sim: False,
+    'reflex': reflex_policy,
+    'autopilot': Autopilot(),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='main.py --simulate',
+                                     description='Run levels headless and report how they went.')
+    parser.add_argument('--simulate', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--level', type=int, default=1, choices=range(GameSettings.TOTAL_LEVELS + 1),
+                        help=f'level to play; {GameSettings.ENDLESS_LEVEL} is endless mode')
+    parser.add_argument('--seconds', type=float, default=60, help='simulated seconds to run (default 60)')
+    parser.add_argument('--dt', type=float, default=TICK, help='tick length in seconds (default 1/60)')
+    parser.add_argument('--width', type=int, default=720)
+    parser.add_argument('--height', type=int, default=1280)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='reflex',
+                        help='who taps to jump (default reflex)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--replay', metavar='PATH',
+                        help='replay a recorded attempt and check it ends the same way')
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return run_replay(args.replay)
+
+    GameSettings.configure(args.height)
+    config = level_config(args.level)
+    policy = POLICIES[args.policy]
+    rng = random.Random(args.seed)
+
+    total_ticks = int(args.seconds / args.dt)
+    outcomes = {'complete': 0, 'game_over': 0}
+    attempts = 0
+    hits = 0
+    ticks = 0
+
+    started = time.perf_counter()
+    while ticks < total_ticks:
+        sim = Simulation(config, args.width, args.height, rng=rng)
+        attempts += 1
+        while not sim.outcome and ticks < total_ticks:
+            if policy(sim):
+                sim.jump()
+            sim.step(args.dt)
+            ticks += 1
+        hits += sim.hits
+        if sim.outcome:
+            outcomes[sim.outcome] += 1
+    elapsed = time.perf_counter() - started
+
+    name = 'Endless' if args.level == GameSettings.ENDLESS_LEVEL else f'Level {args.level}'
+    print(f"{name}: {ticks} ticks ({ticks * args.dt:.0f} simulated s) in {elapsed:.2f} s "
+          f"= {ticks / elapsed:.0f} ticks/s")
+    print(f"Attempts: {attempts}  cleared: {outcomes['complete']}  game over: {outcomes['game_over']}  "
+          f"hits: {hits}")
+    return 0
+
+
+def run_replay(path):
+    recording = Recording.load(path)
+    started = time.perf_counter()
+    sim = replay(recording)
+    elapsed = time.perf_counter() - started
+
+    print(f"Replay of level {recording.level} (seed {recording.seed}): {sim.outcome or 'unfinished'} "
+          f"at tick {sim.ticks}, {sim.hits} hits, {sim.jumps} jumps "
+          f"in {elapsed:.3f} s ({sim.ticks * TICK / max(elapsed, 1e-9):.0f}x real time)")
+    if (sim.outcome, sim.ticks) != (recording.outcome, recording.ticks):
+        print(f"MISMATCH: recorded {recording.outcome or 'unfinished'} at tick {recording.ticks}")
+        return 1
+    return 0
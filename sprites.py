@@ -0,0 +1,260 @@
+"""
+Sprite atlas layout and cache files for Balance Beam Adventure.
+
+Kept free of Kivy so the atlas pixels can be converted, written and read on
+a worker thread, and inspected by offline tools.
+
+Each sprite is a box around its drawing origin (in base-design units, like
+the drawing code) and a number of animation frames. layout() places every
+frame of every sprite for a GameSettings.SCALE in one texture; the pixels
+rendered there are cached as a PNG named by everything they depend on.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import zlib
+
+try:
+    import numpy
+except ImportError:  # Optional; the bytearray code path is used instead
+    numpy = None
+
+# Animation frames baked per sprite. The walk cycle repeats every 4 pi of
+# leg angle (the ponytail swings at 1.5x the legs); flip and cartwheel
+# frames step the ponytail, the body itself is rotated when drawn.
+WALK_FRAMES = 32
+WALK_PERIOD = 4 * math.pi
+SPIN_FRAMES = 24
+SPIN_PERIOD = 360
+WING_FRAMES = 8
+WING_PERIOD = math.pi  # Wings flap with abs(sin(wing_angle))
+
+# name: (frames, animation period, (left, bottom, right, top) around the drawing origin)
+SPRITES = {
+    'side': (WALK_FRAMES, WALK_PERIOD, (-30, -2, 14, 77)),
+    'front': (1, None, (-33, -2, 33, 78)),
+    'floor_standing': (1, None, (-28, -2, 28, 82)),
+    'flipping': (SPIN_FRAMES, SPIN_PERIOD, (-17, 3, 17, 70)),
+    'cartwheel': (SPIN_FRAMES, SPIN_PERIOD, (-28, -10, 28, 71)),
+    'ball': (1, None, (-27, -27, 27, 27)),
+    'bee': (WING_FRAMES, WING_PERIOD, (-25, -12, 25, 22)),
+    'medal': (1, None, (-17, -19, 17, 17)),
+}
+PALETTE_CELL = 4  # Pixels per solid color texel block, so filtering never mixes colors
+PADDING = 1       # Empty pixels between frames
+MAX_SIZE = 2048   # Texture size every GLES2 device supports
+
+
+def frame_index(phase, period, frames):
+    """The baked frame nearest to an animation phase that repeats every period"""
+    return round(phase * frames / period) % frames
+
+
+class Sprite:
+    """Where a sprite's frames are in the atlas and how they sit around the
+    drawing origin, in pixels"""
+
+    def __init__(self, left, bottom, width, height):
+        self.left = left
+        self.bottom = bottom
+        self.width = width
+        self.height = height
+        self.frames = []  # (x, y) of each frame's bottom-left corner
+
+
+class AtlasLayout:
+    def __init__(self, scale, palette_size):
+        self.scale = scale
+        self.palette_size = palette_size
+        self.sprites = {}
+        for name, (frames, _, (left, bottom, right, top)) in SPRITES.items():
+            left, bottom = math.floor(left * scale), math.floor(bottom * scale)
+            sprite = Sprite(left, bottom, math.ceil(right * scale) - left, math.ceil(top * scale) - bottom)
+            sprite.frames = [None] * frames
+            self.sprites[name] = sprite
+        palette = Sprite(0, 0, PALETTE_CELL, PALETTE_CELL)
+        palette.frames = [None] * palette_size
+        self.sprites['palette'] = palette
+        self.width = self.height = 0
+
+    def pack(self):
+        """Place every frame on shelves in the narrowest power-of-two width
+        that keeps the atlas no taller than wide; False if none fits"""
+        cells = sorted(((sprite.height, sprite.width, name, i)
+                        for name, sprite in self.sprites.items()
+                        for i in range(len(sprite.frames))), reverse=True)
+        width = 256
+        while width <= MAX_SIZE:
+            placed = self._shelve(cells, width)
+            if placed is not None:
+                for (_, _, name, i), position in zip(cells, placed):
+                    self.sprites[name].frames[i] = position
+                return True
+            width *= 2
+        return False
+
+    def _shelve(self, cells, width):
+        x = y = shelf_height = 0
+        placed = []
+        for height, cell_width, _, _ in cells:
+            if x + cell_width > width:
+                x, y = 0, y + shelf_height + PADDING
+                shelf_height = 0
+            if cell_width > width or y + height > width:
+                return None
+            placed.append((x, y))
+            x += cell_width + PADDING
+            shelf_height = max(shelf_height, height)
+        self.width = width
+        self.height = y + shelf_height
+        return placed
+
+
+def layout(scale, palette_size):
+    """The atlas layout at a scale, or None if it doesn't fit in MAX_SIZE"""
+    atlas_layout = AtlasLayout(scale, palette_size)
+    return atlas_layout if atlas_layout.pack() else None
+
+
+# ============== PIXELS ==============
+def unpremultiply(pixels):
+    """RGBA bytes rendered with alpha blending into a transparent target hold
+    color times alpha; divide it back out so they draw with normal blending"""
+    if numpy is not None:
+        rgba = numpy.frombuffer(pixels, dtype=numpy.uint8).reshape(-1, 4).astype(numpy.uint32)
+        alpha = rgba[:, 3:]
+        partial = (alpha[:, 0] > 0) & (alpha[:, 0] < 255)
+        rgba[partial, :3] = numpy.minimum((rgba[partial, :3] * 255 + alpha[partial] // 2) // alpha[partial], 255)
+        return rgba.astype(numpy.uint8).tobytes()
+
+    pixels = bytearray(pixels)
+    for i in range(3, len(pixels), 4):
+        alpha = pixels[i]
+        if 0 < alpha < 255:
+            for j in range(i - 3, i):
+                pixels[j] = min((pixels[j] * 255 + alpha // 2) // alpha, 255)
+    return bytes(pixels)
+
+
+def _png_chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data +
+            struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def png_bytes(width, height, pixels):
+    """Encode bottom-up RGBA rows (as OpenGL reads them) as a PNG"""
+    stride = width * 4
+    raw = b''.join(b'\x00' + pixels[y * stride:(y + 1) * stride] for y in reversed(range(height)))
+    return (b'\x89PNG\r\n\x1a\n' +
+            _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +
+            _png_chunk(b'IDAT', zlib.compress(raw, 6)) +
+            _png_chunk(b'IEND', b''))
+
+
+def read_png(data):
+    """(width, height, bottom-up RGBA rows) of a PNG written by png_bytes;
+    raises ValueError for anything else"""
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError('not a PNG')
+    pos = 8
+    header = None
+    compressed = []
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if len(body) != length:
+            raise ValueError('truncated PNG')
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            compressed.append(body)
+        elif kind == b'IEND':
+            break
+        pos += 12 + length
+    if header is None or header[2:] != (8, 6, 0, 0, 0):
+        raise ValueError('unsupported PNG format')
+    width, height = header[:2]
+    try:
+        raw = zlib.decompress(b''.join(compressed))
+    except zlib.error as e:
+        raise ValueError(f'damaged PNG: {e}')
+    stride = width * 4 + 1
+    if len(raw) != stride * height or any(raw[y * stride] for y in range(height)):
+        raise ValueError('unsupported PNG rows')
+    rows = [raw[y * stride + 1:(y + 1) * stride] for y in reversed(range(height))]
+    return width, height, b''.join(rows)
+
+
+# ============== DISK CACHE ==============
+# Bump when the drawing code changes in a way the app version doesn't capture
+CACHE_VERSION = 1
+
+
+def atlas_key(scale, app_version, palette_size):
+    """Hash of everything the baked atlas depends on"""
+    params = (CACHE_VERSION, app_version, round(scale, 4), palette_size, SPRITES, PALETTE_CELL,
+              PADDING, MAX_SIZE)
+    return hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:16]
+
+
+class AtlasCache:
+    """Baked atlases stored as PNG files, named by their atlas key.
+
+    Files are written to a temporary name and renamed into place, so a crash
+    never leaves a truncated atlas behind under a real name.
+    """
+    PREFIX = 'atlas-'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, atlas_layout, app_version):
+        key = atlas_key(atlas_layout.scale, app_version, atlas_layout.palette_size)
+        return os.path.join(self.directory, f'{self.PREFIX}{key}.png')
+
+    def load(self, path, atlas_layout):
+        """The cached pixels for the layout, or None if missing or unusable"""
+        try:
+            with open(path, 'rb') as f:
+                width, height, pixels = read_png(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring damaged sprite atlas {path}: {e}")
+            return None
+        if (width, height) != (atlas_layout.width, atlas_layout.height):
+            return None
+        return pixels
+
+    def save(self, path, atlas_layout, pixels):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=self.PREFIX, suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(png_bytes(atlas_layout.width, atlas_layout.height, pixels))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def evict(self, keep_path):
+        """Delete atlases for other scales or versions and leftover temp files"""
+        keep = os.path.basename(keep_path)
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(self.PREFIX) and name != keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
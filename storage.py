@@ -0,0 +1,295 @@
+"""
+Save data persistence for Balance Beam Adventure.
+
+Kept free of Kivy so saves can be written on a worker thread and inspected
+by offline tools.
+
+SaveStore reads and writes the same JSON layout as Kivy's JsonStore, so
+existing balance_beam_save.json files carry over. put() only changes memory;
+flush() hands a snapshot to a writer thread, which coalesces whatever
+piled up since its last write into one atomic file replace.
+
+HistoryStore keeps every attempt in SQLite. Attempts are batched in memory
+and inserted on a writer thread, one transaction per flush. Without the
+sqlite3 module (python-for-android only builds it with its recipe) there is
+no play history, but saves still work.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import closing
+
+try:
+    import sqlite3
+except ImportError:  # Optional; HistoryStore records nothing without it
+    sqlite3 = None
+
+BACKUP_SUFFIX = '.bak'
+
+
+class SaveStore:
+    """Write-behind key/value store with JsonStore's exists/get/put API.
+
+    Each write goes to a temporary file that is fsynced and renamed over the
+    save file, after moving the previous good version to a .bak file. A
+    truncated or unreadable save file falls back to that backup, or to an
+    empty store, instead of failing to start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.dirty = False
+        self._cond = threading.Condition()
+        self._pending = None  # Latest snapshot the writer hasn't picked up
+        self._writing = False
+        self._worker = None
+        self._main_ok = False  # Whether the file at path is worth backing up
+        self.data = self._load()
+
+    def _load(self):
+        for path in (self.path, self.path + BACKUP_SUFFIX):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"Ignoring damaged save file {path}: {e}")
+                continue
+            if not isinstance(data, dict):
+                print(f"Ignoring damaged save file {path}: not a JSON object")
+                continue
+            if path == self.path:
+                self._main_ok = True
+            else:
+                self.dirty = True  # Restore the save file from the backup on the next flush
+            return data
+        return {}
+
+    # ============== JSONSTORE API ==============
+    def exists(self, key):
+        return key in self.data
+
+    def get(self, key):
+        return self.data[key]
+
+    def put(self, key, **values):
+        """Replace key's values in memory; flush() persists them"""
+        if self.data.get(key) != values:
+            self.data[key] = values
+            self.dirty = True
+
+    # ============== WRITING ==============
+    def flush(self):
+        """Queue the current data for writing, if anything changed"""
+        if not self.dirty:
+            return
+        snapshot = json.dumps(self.data)
+        self.dirty = False
+        with self._cond:
+            self._pending = snapshot
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name='save-writer', daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until every flushed snapshot is on disk; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def close(self, timeout=2.0):
+        """Flush and wait, for app shutdown"""
+        self.flush()
+        return self.wait(timeout)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None)
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(snapshot)
+            except OSError as e:
+                print(f"Could not save game data: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, snapshot):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.save-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            if self._main_ok:
+                try:
+                    os.replace(self.path, self.path + BACKUP_SUFFIX)
+                except FileNotFoundError:
+                    pass
+            os.replace(temp_path, self.path)
+            self._main_ok = True
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+# ============== PLAY HISTORY ==============
+class HistoryStore:
+    """Every attempt, per child profile, in an indexed SQLite table.
+
+    record() only appends to an in-memory batch; flush() inserts the batch
+    on a writer thread in a single transaction. Rows are appended in rowid
+    order and each index insert is logarithmic, so writes stay cheap as the
+    history grows. Queries open their own connection, so they can run on
+    any thread; they see attempts once their flush has completed.
+
+    Without sqlite3 the store is a no-op: nothing is recorded and queries
+    return no attempts.
+    """
+    SCHEMA_VERSION = 1
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY,
+            profile TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            started_at REAL NOT NULL,    -- Unix time
+            duration REAL NOT NULL,      -- Simulated seconds
+            hits INTEGER NOT NULL,
+            jumps INTEGER NOT NULL,
+            super_jumps INTEGER NOT NULL,
+            outcome TEXT NOT NULL,       -- 'complete', 'game_over' or 'quit'
+            seed INTEGER
+        )""",
+        # Best time: the first row of (profile, level, 'complete') by duration
+        """CREATE INDEX IF NOT EXISTS attempts_best
+            ON attempts (profile, level, outcome, duration)""",
+        # Recent attempts: the last rows of (profile, level) by start time
+        """CREATE INDEX IF NOT EXISTS attempts_recent
+            ON attempts (profile, level, started_at)""",
+    )
+    COLUMNS = ('level', 'started_at', 'duration', 'hits', 'jumps', 'super_jumps', 'outcome', 'seed')
+
+    def __init__(self, path, profile='default'):
+        self.path = path
+        self.profile = profile
+        self.enabled = sqlite3 is not None
+        self.batch = []
+        self._cond = threading.Condition()
+        self._pending = []  # Flushed rows the writer hasn't picked up
+        self._writing = False
+        self._worker = None
+        self._conn = None  # The writer thread's connection
+        if not self.enabled:
+            print("Play history disabled: the sqlite3 module is not available")
+
+    def record(self, level, duration, hits, jumps, super_jumps, outcome, seed=None, started_at=None):
+        """Batch an attempt; started_at is the wall-clock Unix time it began
+        (by default, duration seconds ago)"""
+        if not self.enabled:
+            return
+        if started_at is None:
+            started_at = time.time() - duration
+        self.batch.append((self.profile, level, started_at, duration, hits, jumps, super_jumps,
+                           outcome, seed))
+
+    def flush(self):
+        """Insert the batched attempts on the writer thread"""
+        if not self.batch:
+            return
+        rows, self.batch = self.batch, []
+        with self._cond:
+            self._pending.extend(rows)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name='history-writer', daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until every flushed batch is committed; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self, timeout=2.0):
+        """Flush and wait, for app shutdown"""
+        self.flush()
+        return self.wait(timeout)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                rows, self._pending = self._pending, []
+                self._writing = True
+            try:
+                self._insert(rows)
+            except sqlite3.Error as e:
+                print(f"Could not save play history: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _insert(self, rows):
+        if self._conn is None:
+            self._conn = self._connect()
+        with self._conn:
+            self._conn.executemany(
+                'INSERT INTO attempts (profile, level, started_at, duration, hits, jumps,'
+                ' super_jumps, outcome, seed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA journal_mode=WAL')  # Readers don't block the writer
+        conn.execute('PRAGMA synchronous=NORMAL')
+        if conn.execute('PRAGMA user_version').fetchone()[0] != self.SCHEMA_VERSION:
+            with conn:
+                for statement in self.SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+        return conn
+
+    # ============== QUERIES ==============
+    def _query(self, sql, params):
+        if not self.enabled:
+            return []
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def best_time(self, level):
+        """Shortest completed attempt at level in seconds, or None"""
+        rows = self._query(
+            "SELECT MIN(duration) FROM attempts"
+            " WHERE profile = ? AND level = ? AND outcome = 'complete'",
+            (self.profile, level))
+        return rows[0][0] if rows else None
+
+    def recent(self, level, limit=10):
+        """The latest attempts at level, newest first, as dicts"""
+        rows = self._query(
+            f"SELECT {', '.join(self.COLUMNS)} FROM attempts"
+            " WHERE profile = ? AND level = ? ORDER BY started_at DESC LIMIT ?",
+            (self.profile, level, limit))
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def level_stats(self, level):
+        """Attempt and outcome counts at level"""
+        rows = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(outcome = 'complete'), 0), COALESCE(SUM(hits), 0)"
+            " FROM attempts WHERE profile = ? AND level = ?",
+            (self.profile, level))
+        attempts, completed, hits = rows[0] if rows else (0, 0, 0)
+        return {'attempts': attempts, 'completed': completed, 'hits': hits}
+
+    def profiles(self):
+        return [row[0] for row in self._query('SELECT DISTINCT profile FROM attempts', ())]
@@ -0,0 +1,172 @@
+"""
+Difficulty sweep for Balance Beam Adventure.
+
+Plays thousands of seeded headless attempts with the Autopilot over a grid
+of level parameters and reaction delays, on every CPU core, and reports each
+combination's clear rate and what the gymnast was hit by.
+
+    python sweep.py --level 3 --reaction-delay 0.1 0.2 0.3 --runs 500
+    python sweep.py --ball-speed 140 200 280 --ball-interval 2 3 4 --output sweep.csv
+
+Speeds are in pixels per second on the 700-pixel-high base design, as in
+GameSettings.configure, and are scaled to --height like the game does.
+Parameters not given come from --level. Every combination plays the same
+seeds (--seed, --seed + 1, ...), so results are reproducible and
+differences between combinations are not down to luck.
+
+Results are printed and, with --output, written as CSV, or JSON for a .json
+path.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from simulation import Autopilot, GameSettings, LEVEL_CONFIGS, Simulation, TICK
+
+# Level parameters that can be swept: (config key, type, scaled with the screen)
+PARAMETERS = {
+    'ball_speed': (float, True),
+    'ball_interval': (float, False),
+    'bee_interval': (float, False),
+    'ball_count': (int, False),
+    'bee_count': (int, False),
+}
+HIT_CAUSES = ('ball:ground', 'ball:air', 'bee:ground', 'bee:air')
+CHUNK_SIZE = 50  # Attempts per pool task
+
+
+def init_worker(height):
+    GameSettings.configure(height)
+
+
+def play_chunk(task):
+    """Play one attempt per seed with one combination; returns summed stats"""
+    index, params, reaction_delay, seeds, width, height, max_seconds = task
+    s = GameSettings.SCALE
+    config = dict(LEVEL_CONFIGS[0])
+    for name, value in params.items():
+        _, scaled = PARAMETERS[name]
+        config[name] = int(value * s) if scaled else value
+
+    max_ticks = int(max_seconds / TICK)
+    totals = Counter()
+    causes = Counter()
+    for seed in seeds:
+        sim = Simulation(config, width, height, rng=random.Random(seed))
+        policy = Autopilot(reaction_delay)
+        while not sim.outcome and sim.ticks < max_ticks:
+            if policy(sim):
+                sim.jump()
+            sim.step(TICK)
+        totals[sim.outcome or 'timeout'] += 1
+        totals['hits'] += sim.hits
+        totals['jumps'] += sim.jumps
+        totals['super_jumps'] += sim.super_jumps
+        totals['seconds'] += sim.time
+        causes.update(sim.hit_causes)
+    return index, totals, causes
+
+
+def grid(args):
+    """Every combination of the swept values, as (params, reaction_delay)"""
+    GameSettings.configure(700)  # Level defaults in base-design pixels
+    base = LEVEL_CONFIGS[args.level - 1]
+    axes = {name: getattr(args, name) or [base[name]] for name in PARAMETERS}
+    for values in itertools.product(*axes.values(), args.reaction_delay):
+        *params, reaction_delay = values
+        yield dict(zip(axes, params)), reaction_delay
+
+
+def run(args):
+    combinations = list(grid(args))
+    seeds = list(range(args.seed, args.seed + args.runs))
+    tasks = [(index, params, reaction_delay, seeds[start:start + CHUNK_SIZE],
+              args.width, args.height, args.max_seconds)
+             for index, (params, reaction_delay) in enumerate(combinations)
+             for start in range(0, len(seeds), CHUNK_SIZE)]
+
+    totals = [Counter() for _ in combinations]
+    causes = [Counter() for _ in combinations]
+    with Pool(args.jobs, initializer=init_worker, initargs=(args.height,)) as pool:
+        for index, chunk_totals, chunk_causes in pool.imap_unordered(play_chunk, tasks):
+            totals[index].update(chunk_totals)
+            causes[index].update(chunk_causes)
+
+    rows = []
+    for (params, reaction_delay), total, cause in zip(combinations, totals, causes):
+        runs = args.runs
+        row = dict(params, reaction_delay=reaction_delay, runs=runs,
+                   cleared=total['complete'], game_over=total['game_over'], timeout=total['timeout'],
+                   clear_rate=total['complete'] / runs,
+                   mean_hits=total['hits'] / runs,
+                   mean_jumps=total['jumps'] / runs,
+                   mean_super_jumps=total['super_jumps'] / runs,
+                   mean_seconds=total['seconds'] / runs)
+        for name in HIT_CAUSES:
+            row['hits_' + name.replace(':', '_')] = cause[name]
+        rows.append(row)
+    return rows
+
+
+def write(rows, path):
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows):
+    swept = [name for name in PARAMETERS if len({row[name] for row in rows}) > 1]
+    columns = swept + ['reaction_delay', 'clear_rate', 'mean_hits'] + \
+        ['hits_' + name.replace(':', '_') for name in HIT_CAUSES]
+    print('  '.join(f'{name:>16}' for name in columns))
+    for row in rows:
+        print('  '.join(f'{row[name]:>16.3g}' if isinstance(row[name], float) else f'{row[name]:>16}'
+                        for name in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep level parameters with the autopilot.')
+    parser.add_argument('--level', type=int, default=1, choices=range(1, GameSettings.TOTAL_LEVELS + 1),
+                        help='level whose parameters are the defaults (default 1)')
+    for name, (kind, scaled) in PARAMETERS.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=kind, nargs='+',
+                            help='values to sweep' + (' (base-design pixels/s)' if scaled else ''))
+    parser.add_argument('--reaction-delay', type=float, nargs='+', default=[0.25],
+                        help='autopilot reaction delays in seconds (default 0.25)')
+    parser.add_argument('--runs', type=int, default=1000, help='attempts per combination (default 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first attempt (default 0)')
+    parser.add_argument('--max-seconds', type=float, default=600,
+                        help='simulated seconds before an attempt counts as a timeout (default 600)')
+    parser.add_argument('--width', type=int, default=720)
+    parser.add_argument('--height', type=int, default=1280)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='worker processes (default: one per CPU core)')
+    parser.add_argument('--output', help='write results here, CSV or .json')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = run(args)
+    elapsed = time.perf_counter() - started
+
+    print_table(rows)
+    print(f"\n{len(rows)} combinations x {args.runs} attempts in {elapsed:.1f} s on {args.jobs} processes")
+    if args.output:
+        write(rows, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
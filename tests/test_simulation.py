@@ -0,0 +1,53 @@
+"""
+Tests for the headless game rules in simulation.py.
+
+    python -m unittest discover tests
+"""
+
+import random
+import unittest
+from collections import Counter
+
+from simulation import Autopilot, GameSettings, Simulation, TICK, level_config
+
+
+def play_endless(seed, reaction_delay, max_ticks=20000):
+    """One endless attempt with the Autopilot; returns (sim, events)"""
+    sim = Simulation(level_config(GameSettings.ENDLESS_LEVEL), 720, 1280, rng=random.Random(seed))
+    policy = Autopilot(reaction_delay)
+    events = []
+    while not sim.outcome and sim.ticks < max_ticks:
+        if policy(sim):
+            sim.jump()
+        events.extend(sim.step(TICK))
+    return sim, events
+
+
+class EndlessScoringTest(unittest.TestCase):
+    # A late autopilot lands on obstacles after their left edge has passed
+    # the gymnast; these seeds used to score such an obstacle, then get hit
+    SEEDS = (12, 28, 32)
+    REACTION_DELAY = 0.3
+
+    def setUp(self):
+        GameSettings.configure(1280)
+
+    def test_hit_obstacles_earn_no_points(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                sim, events = play_endless(seed, self.REACTION_DELAY)
+                hit = [obstacle for name, obstacle in events if name == 'hit']
+                cleared = {obstacle for name, obstacle in events if name == 'cleared'}
+                self.assertTrue(hit)
+                self.assertFalse(cleared.intersection(hit))
+
+    def test_each_obstacle_scores_once(self):
+        sim, events = play_endless(self.SEEDS[0], self.REACTION_DELAY)
+        cleared = Counter(obstacle for name, obstacle in events if name == 'cleared')
+        self.assertTrue(cleared)
+        self.assertEqual(set(cleared.values()), {1})
+        self.assertEqual(sim.cleared, len(cleared))
+
+
+if __name__ == '__main__':
+    unittest.main()